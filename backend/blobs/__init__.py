@@ -0,0 +1 @@
+# Blobs app
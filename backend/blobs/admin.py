@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import Blob
+
+@admin.register(Blob)
+class BlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'content_type', 'size', 'backend', 'created_at')
+    list_filter = ('backend', 'content_type', 'created_at')
+    search_fields = ('sha256',)
+    readonly_fields = ('sha256', 'content_type', 'size', 'backend', 'created_at')
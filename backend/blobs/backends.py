@@ -0,0 +1,97 @@
+import io
+import os
+import tempfile
+from pathlib import Path
+from django.conf import settings
+
+
+class BaseBlobBackend:
+    """
+    Interface minimale d'un backend de blobs
+    Les clés sont des empreintes SHA-256 : écrire deux fois la même clé
+    est donc sans effet.
+    """
+
+    name = None
+
+    def save(self, key, data):
+        raise NotImplementedError
+
+    def read(self, key):
+        raise NotImplementedError
+
+    def open(self, key):
+        """Retourner un fichier binaire (seekable) sur le contenu"""
+        return io.BytesIO(self.read(key))
+
+    def exists(self, key):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+
+class FileSystemBlobBackend(BaseBlobBackend):
+    """Stocke chaque blob dans un fichier, réparti en sous-dossiers ab/cd/"""
+
+    name = 'filesystem'
+
+    def __init__(self, root=None):
+        self.root = Path(root or settings.BLOB_STORAGE_ROOT)
+
+    def path(self, key):
+        return self.root / key[:2] / key[2:4] / key
+
+    def save(self, key, data):
+        path = self.path(key)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Écriture atomique : fichier temporaire puis renommage
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def read(self, key):
+        with open(self.path(key), 'rb') as f:
+            return f.read()
+
+    def open(self, key):
+        return open(self.path(key), 'rb')
+
+    def exists(self, key):
+        return self.path(key).exists()
+
+    def delete(self, key):
+        try:
+            self.path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+class DatabaseBlobBackend(BaseBlobBackend):
+    """Stocke les octets dans la table BlobData (bytea sous Postgres)"""
+
+    name = 'database'
+
+    def save(self, key, data):
+        from .models import BlobData
+        BlobData.objects.get_or_create(sha256=key, defaults={'data': data})
+
+    def read(self, key):
+        from .models import BlobData
+        return bytes(BlobData.objects.values_list('data', flat=True).get(sha256=key))
+
+    def exists(self, key):
+        from .models import BlobData
+        return BlobData.objects.filter(sha256=key).exists()
+
+    def delete(self, key):
+        from .models import BlobData
+        BlobData.objects.filter(sha256=key).delete()
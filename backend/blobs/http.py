@@ -0,0 +1,100 @@
+import re
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from .storage import open_blob
+
+CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range(header, size):
+    """
+    Interpréter un en-tête Range à intervalle unique
+    Retourne (début, fin inclusive), None si l'en-tête est ignoré,
+    ou lève ValueError si l'intervalle est insatisfiable.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if start == '' and end == '':
+        return None
+    if start == '':
+        # Suffixe : les N derniers octets
+        length = int(end)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _iter_range(f, start, length):
+    try:
+        f.seek(start)
+        while length > 0:
+            chunk = f.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        f.close()
+
+
+def blob_response(request, blob, cache_control=None, filename=None):
+    """
+    Servir les octets d'un blob en streaming
+    - ETag fort dérivé du SHA-256, Last-Modified, réponses 304
+    - Range à intervalle unique (206 / 416), respect de If-Range
+    """
+    etag = quote_etag(blob.sha256)
+    last_modified = int(blob.created_at.timestamp())
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _content_response(request, blob, etag, filename)
+
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    if cache_control:
+        patch_cache_control(response, **cache_control)
+    return response
+
+
+def _content_response(request, blob, etag, filename):
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, blob.size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{blob.size}'
+            return response
+        if byte_range is not None:
+            start, end = byte_range
+            length = end - start + 1
+            response = StreamingHttpResponse(
+                _iter_range(open_blob(blob), start, length),
+                status=206,
+                content_type=blob.content_type,
+            )
+            response['Content-Length'] = length
+            response['Content-Range'] = f'bytes {start}-{end}/{blob.size}'
+            return response
+
+    response = FileResponse(
+        open_blob(blob),
+        content_type=blob.content_type,
+        as_attachment=filename is not None,
+        filename=filename or '',
+    )
+    response['Content-Length'] = blob.size
+    return response
@@ -0,0 +1,87 @@
+from io import BytesIO
+from PIL import Image as PILImage, ImageOps, UnidentifiedImageError
+from .models import BlobVariant
+from .storage import read_bytes, store_bytes
+
+# Variantes produites pour chaque image envoyée
+# La spécification fait partie de la clé de cache : la modifier régénère la variante.
+VARIANTS = {
+    'thumbnail': {'size': (400, 300), 'format': 'WEBP', 'quality': 75},
+    'card': {'size': (800, 600), 'format': 'WEBP', 'quality': 80},
+    'full': {'size': (1920, 1920), 'format': 'JPEG', 'quality': 85},
+}
+
+
+def variant_spec(name):
+    """Spécification textuelle d'une variante (ex: thumbnail:400x300:webp:q75)"""
+    variant = VARIANTS[name]
+    width, height = variant['size']
+    return f"{name}:{width}x{height}:{variant['format'].lower()}:q{variant['quality']}"
+
+
+def decode_image(data):
+    """Décoder une image avec Pillow, ou None si le format n'est pas supporté (SVG...)"""
+    try:
+        image = PILImage.open(BytesIO(data))
+        image.load()
+    except (UnidentifiedImageError, PILImage.DecompressionBombError, OSError, ValueError):
+        return None
+    # Appliquer l'orientation EXIF pour obtenir les dimensions affichées
+    return ImageOps.exif_transpose(image)
+
+
+def render_variant(image, name):
+    """Redimensionner l'image décodée et l'encoder au format de la variante"""
+    variant = VARIANTS[name]
+    resized = image.copy()
+    resized.thumbnail(variant['size'], PILImage.LANCZOS)
+
+    if variant['format'] == 'JPEG' and resized.mode not in ('RGB', 'L'):
+        resized = resized.convert('RGB')
+    elif resized.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        resized = resized.convert('RGBA')
+
+    output = BytesIO()
+    resized.save(output, format=variant['format'], quality=variant['quality'])
+    return output.getvalue(), resized.size
+
+
+def process_image(blob, data=None, names=None):
+    """
+    Décoder une image une seule fois et produire ses variantes manquantes
+    Retourne (largeur, hauteur), ou (None, None) si l'image n'est pas décodable.
+    """
+    if data is None:
+        data = read_bytes(blob)
+    image = decode_image(data)
+    if image is None:
+        return None, None
+
+    existing = set(BlobVariant.objects.filter(source=blob).values_list('spec', flat=True))
+    for name in names or VARIANTS:
+        spec = variant_spec(name)
+        if spec in existing:
+            continue
+        content, (width, height) = render_variant(image, name)
+        variant_blob = store_bytes(content, f"image/{VARIANTS[name]['format'].lower()}")
+        BlobVariant.objects.get_or_create(
+            source=blob,
+            spec=spec,
+            defaults={'blob': variant_blob, 'width': width, 'height': height},
+        )
+    return image.size
+
+
+def get_variant(blob, name):
+    """
+    Retourner le blob de la variante demandée
+    La variante est générée à la demande si elle n'existe pas encore ;
+    l'original est retourné si l'image ne peut pas être redimensionnée.
+    """
+    spec = variant_spec(name)
+    variants = BlobVariant.objects.select_related('blob').filter(source=blob, spec=spec)
+    variant = variants.first()
+    if variant is None:
+        process_image(blob, names=[name])
+        variant = variants.first()
+    return variant.blob if variant else blob
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from blobs.imaging import process_image
+from blobs.models import Blob, BlobVariant
+
+
+class Command(BaseCommand):
+    help = "Générer les variantes redimensionnées manquantes des images existantes"
+
+    def handle(self, *args, **options):
+        variant_ids = BlobVariant.objects.values('blob_id')
+        sources = (
+            Blob.objects.filter(content_type__startswith='image/')
+            .exclude(pk__in=variant_ids)
+        )
+        processed = skipped = 0
+        for blob in sources.iterator(chunk_size=100):
+            width, height = process_image(blob)
+            if width is None:
+                skipped += 1
+            else:
+                processed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"{processed} image(s) traitée(s), {skipped} ignorée(s) (format non supporté)"
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlobVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('spec', models.CharField(max_length=100)),
+                ('width', models.IntegerField()),
+                ('height', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='blobs.blob')),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='blobs.blob')),
+            ],
+            options={
+                'unique_together': {('source', 'spec')},
+            },
+        ),
+    ]
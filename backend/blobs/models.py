@@ -0,0 +1,51 @@
+from django.db import models
+
+class Blob(models.Model):
+    """
+    Contenu binaire adressé par son empreinte SHA-256
+    - Les octets sont stockés une seule fois (déduplication)
+    - La ligne ne contient que les métadonnées, jamais le contenu
+    """
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField(default=0, help_text="Taille en bytes")
+    # Backend qui détient les octets (voir BLOB_BACKENDS)
+    backend = models.CharField(max_length=50)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.content_type}, {self.size} bytes)"
+
+
+class BlobVariant(models.Model):
+    """
+    Version redimensionnée d'une image (miniature, carte, plein écran)
+    Mise en cache par empreinte de la source + spécification de la variante.
+    """
+
+    source = models.ForeignKey(Blob, on_delete=models.CASCADE, related_name='variants')
+    spec = models.CharField(max_length=100)
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, related_name='+')
+    width = models.IntegerField()
+    height = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('source', 'spec')
+
+    def __str__(self):
+        return f"{self.source_id[:12]} {self.spec}"
+
+
+class BlobData(models.Model):
+    """Octets d'un blob pour le backend base de données (bytea sous Postgres)"""
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return self.sha256
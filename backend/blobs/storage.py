@@ -0,0 +1,77 @@
+import base64
+import binascii
+import hashlib
+from django.conf import settings
+from django.db import IntegrityError
+from django.utils.module_loading import import_string
+
+_backends = {}
+
+
+def get_backend(name=None):
+    """Retourner l'instance (partagée) du backend demandé, ou celui par défaut"""
+    name = name or settings.BLOB_DEFAULT_BACKEND
+    if name not in _backends:
+        try:
+            backend_path = settings.BLOB_BACKENDS[name]
+        except KeyError:
+            raise ValueError(f"Backend de blobs inconnu: {name}")
+        _backends[name] = import_string(backend_path)()
+    return _backends[name]
+
+
+def decode_data_url(value):
+    """
+    Décoder un data URL (data:image/jpeg;base64,...)
+    Retourne (mime_type, octets) ou lève ValueError
+    """
+    if not value.startswith('data:'):
+        raise ValueError("Le contenu doit être un data URL")
+    header, data = value.split(',', 1)
+    mime_type = header.split(':')[1].split(';')[0]
+    try:
+        content = base64.b64decode(data)
+    except (binascii.Error, ValueError):
+        raise ValueError("Le base64 est invalide")
+    return mime_type, content
+
+
+def store_bytes(data, content_type, backend=None, blob_model=None):
+    """
+    Enregistrer des octets et retourner le Blob correspondant
+    Si le même contenu existe déjà, le Blob existant est réutilisé.
+    `blob_model` permet aux migrations de passer le modèle historique.
+    """
+    if blob_model is None:
+        from .models import Blob as blob_model
+
+    sha256 = hashlib.sha256(data).hexdigest()
+    blob = blob_model.objects.filter(pk=sha256).first()
+    if blob is not None:
+        return blob
+
+    backend = get_backend(backend)
+    backend.save(sha256, data)
+    try:
+        blob, _ = blob_model.objects.get_or_create(
+            sha256=sha256,
+            defaults={
+                'content_type': content_type,
+                'size': len(data),
+                'backend': backend.name,
+            },
+        )
+    except IntegrityError:
+        # Insertion concurrente du même contenu
+        blob = blob_model.objects.get(pk=sha256)
+    return blob
+
+
+def read_bytes(blob):
+    """Lire le contenu d'un blob depuis le backend qui le détient"""
+    return get_backend(blob.backend).read(blob.sha256)
+
+
+def open_blob(blob):
+    """Ouvrir le contenu d'un blob en lecture (fichier binaire)"""
+    return get_backend(blob.backend).open(blob.sha256)
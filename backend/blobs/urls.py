@@ -0,0 +1,6 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('<str:sha256>/', views.blob_content, name='blob-content'),
+]
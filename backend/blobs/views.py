@@ -0,0 +1,17 @@
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+from .http import blob_response
+from .models import Blob
+
+@require_safe
+def blob_content(request, sha256):
+    """
+    Retourner les octets d'un blob
+    L'URL contient l'empreinte du contenu : la réponse ne change jamais.
+    """
+    blob = get_object_or_404(Blob, pk=sha256)
+    return blob_response(
+        request,
+        blob,
+        cache_control={'public': True, 'max_age': 60 * 60 * 24 * 365, 'immutable': True},
+    )
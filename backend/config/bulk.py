@@ -0,0 +1,25 @@
+"""
+Opérations en masse
+
+Dans un bloc bulk_operation(Model), les récepteurs de signaux par instance
+de ce modèle (compteurs, fils de discussion, événements...) ne font rien :
+le code en masse fait la même maintenance une seule fois pour tout le lot.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_bulk_models = ContextVar('bulk_models', default=frozenset())
+
+
+@contextmanager
+def bulk_operation(*models):
+    token = _bulk_models.set(_bulk_models.get() | frozenset(models))
+    try:
+        yield
+    finally:
+        _bulk_models.reset(token)
+
+
+def in_bulk_operation(model):
+    """Vrai si les signaux par instance de ce modèle doivent être ignorés"""
+    return model in _bulk_models.get()
@@ -0,0 +1,281 @@
+"""
+Couche de cache à deux niveaux
+
+- L1 : LRU borné avec TTL, local au processus (partagé entre threads)
+- L2 : cache partagé entre workers (fichiers, base de données, Redis...)
+
+Utilitaires :
+- namespaced_key() : clés préfixées par domaine (hotels:list:...)
+- get_version() / bump_version() : jetons d'invalidation, lus directement dans L2
+- get_or_compute() : recalcul unique (single-flight) en cas d'absence
+- cache_stats() : compteurs de hits / misses pour l'exploitation
+"""
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MISSING = object()
+
+# Stockage L1 et compteurs, partagés par tous les threads du processus
+_l1_stores = {}
+_stats = {}
+_stores_lock = threading.Lock()
+
+
+class LRUCache:
+    """Dictionnaire LRU borné avec expiration, sûr entre threads"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        with self._lock:
+            item = self._data.get(key, MISSING)
+            if item is MISSING:
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, MISSING) is not MISSING
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CacheStats:
+    """Compteurs d'un cache à deux niveaux"""
+
+    FIELDS = ('l1_hits', 'l2_hits', 'misses', 'sets', 'deletes', 'computes', 'waits')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name, delta=1):
+        with self._lock:
+            self.counters[name] += delta
+
+    def reset(self):
+        with self._lock:
+            self.counters = dict.fromkeys(self.FIELDS, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters)
+
+
+class TieredCache(BaseCache):
+    """
+    Backend de cache Django : L1 local devant un L2 partagé
+
+    OPTIONS :
+    - L2_ALIAS : alias du cache partagé dans CACHES (obligatoire)
+    - L1_MAX_ENTRIES : nombre maximum d'entrées en L1 (défaut 1000)
+    - L1_TIMEOUT : durée de vie maximale en L1, en secondes (défaut 5)
+      borne le décalage entre workers, car L1 n'est pas invalidé à distance
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = options['L2_ALIAS']
+        self.l1_timeout = options.get('L1_TIMEOUT', 5)
+        name = location or self.l2_alias
+        with _stores_lock:
+            if name not in _l1_stores:
+                _l1_stores[name] = LRUCache(options.get('L1_MAX_ENTRIES', 1000))
+                _stats[name] = CacheStats()
+        self.l1 = _l1_stores[name]
+        self.stats = _stats[name]
+
+    @property
+    def l2(self):
+        return caches[self.l2_alias]
+
+    def _l1_timeout(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return self.l1_timeout
+        return max(0, min(timeout - time.time(), self.l1_timeout))
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_and_validate_key(key, version=version)
+        value = self.l1.get(l1_key)
+        if value is not MISSING:
+            self.stats.incr('l1_hits')
+            return value
+        value = self.l2.get(key, MISSING, version=version)
+        if value is MISSING:
+            self.stats.incr('misses')
+            return default
+        self.stats.incr('l2_hits')
+        self.l1.set(l1_key, value, self.l1_timeout)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        l1_key = self.make_and_validate_key(key, version=version)
+        self.l2.set(key, value, timeout, version=version)
+        self.l1.set(l1_key, value, self._l1_timeout(timeout))
+        self.stats.incr('sets')
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        # add() doit rester atomique : seul L2 fait foi
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            l1_key = self.make_and_validate_key(key, version=version)
+            self.l1.set(l1_key, value, self._l1_timeout(timeout))
+            self.stats.incr('sets')
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.l2.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.l1.delete(self.make_and_validate_key(key, version=version))
+        self.stats.incr('deletes')
+        return self.l2.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        if self.l1.get(self.make_and_validate_key(key, version=version)) is not MISSING:
+            return True
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        value = self.l2.incr(key, delta, version=version)
+        self.l1.set(self.make_and_validate_key(key, version=version), value, self.l1_timeout)
+        return value
+
+    def clear(self):
+        self.l1.clear()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+
+def namespaced_key(namespace, *parts):
+    """Construire une clé de cache préfixée par son domaine (ex: hotels:list:42)"""
+    return ':'.join(str(part) for part in (namespace, *parts))
+
+
+def shared_cache():
+    """Cache partagé (L2) derrière le cache par défaut, ou le cache par défaut lui-même"""
+    return getattr(cache, 'l2', cache)
+
+
+def get_version(namespace):
+    """
+    Version courante d'un domaine (jeton d'invalidation)
+    Lue dans L2 pour que tous les workers voient immédiatement le changement.
+    Jeton aléatoire : jamais une ancienne version, même après une éviction.
+    """
+    shared = shared_cache()
+    key = namespaced_key(namespace, 'version')
+    version = shared.get(key)
+    if version is None:
+        shared.add(key, uuid.uuid4().hex, None)
+        version = shared.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """
+    Invalider toutes les entrées d'un domaine
+    set() d'un nouveau jeton plutôt qu'incr() : incr() lit puis réécrit sur
+    FileBasedCache ou DatabaseCache, deux invalidations simultanées pouvaient
+    aboutir à la même version. Deux jetons aléatoires diffèrent toujours de
+    la version remplacée, quel que soit celui qui l'emporte.
+    """
+    shared_cache().set(namespaced_key(namespace, 'version'), uuid.uuid4().hex, None)
+
+
+_compute_locks = weakref.WeakValueDictionary()
+_compute_locks_lock = threading.Lock()
+
+
+def _local_lock(key):
+    with _compute_locks_lock:
+        lock = _compute_locks.get(key)
+        if lock is None:
+            lock = _compute_locks[key] = threading.Lock()
+        return lock
+
+
+def get_or_compute(key, compute, timeout=DEFAULT_TIMEOUT, lock_timeout=10):
+    """
+    Lire une valeur en cache ou la calculer une seule fois
+    - Un seul thread par processus recalcule (verrou local)
+    - Un seul processus recalcule (verrou add() dans le cache partagé),
+      les autres attendent la valeur jusqu'à lock_timeout secondes
+    """
+    value = cache.get(key, MISSING)
+    if value is not MISSING:
+        return value
+
+    stats = getattr(cache, 'stats', None)
+    with _local_lock(key):
+        value = cache.get(key, MISSING)
+        if value is not MISSING:
+            return value
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, lock_timeout):
+            try:
+                value = compute()
+                cache.set(key, value, timeout)
+            finally:
+                cache.delete(lock_key)
+            if stats:
+                stats.incr('computes')
+            return value
+
+        # Un autre processus recalcule : attendre son résultat
+        if stats:
+            stats.incr('waits')
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            value = cache.get(key, MISSING)
+            if value is not MISSING:
+                return value
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+
+
+def cache_stats():
+    """Compteurs de chaque cache à deux niveaux de ce processus"""
+    return {
+        name: dict(stats.snapshot(), l1_entries=len(_l1_stores[name]), l1_evictions=_l1_stores[name].evictions)
+        for name, stats in _stats.items()
+    }
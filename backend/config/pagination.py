@@ -0,0 +1,229 @@
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination par curseur (keyset) sur (-created_at, id)
+    - Le curseur contient les valeurs de tous les champs du tri de la
+      dernière ligne transmise (ex: created_at et id), pas de position
+    - Page suivante : WHERE (created_at, id) après ce tuple, dans l'ordre
+      du tri ; servie par l'index du tri, sans COUNT(*) ni OFFSET, même
+      quand beaucoup de lignes partagent le même created_at
+    - Insertions concurrentes : ni ligne sautée, ni ligne répétée
+    Tri de la vue (OrderingFilter) respecté, complété par la clé primaire
+    pour que le tuple soit unique.
+    """
+    ordering = ('-created_at', 'id')
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Curseur invalide'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = None
+    max_page_size = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.fields = self.get_fields(request, queryset, view)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        # Page précédente : même parcours, dans l'ordre inverse
+        directions = [(name, descending != self.reverse) for name, descending in self.fields]
+        queryset = self.load_fields(queryset).order_by(
+            *(self.order_expression(name, descending) for name, descending in directions)
+        )
+        if self.position is not None:
+            queryset = queryset.filter(self.after(directions, self.position))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size) if self.max_page_size else size
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_fields(self, request, queryset, view):
+        """[(champ, décroissant)] du tri, terminé par la clé primaire"""
+        ordering = self.ordering
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view) or ordering
+                break
+        pk_name = self.model._meta.pk.name
+        fields = []
+        for name in ([ordering] if isinstance(ordering, str) else ordering):
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            fields.append((pk_name if name == 'pk' else name, descending))
+        if pk_name not in (name for name, _ in fields):
+            fields.append((pk_name, fields[-1][1] if fields else False))
+        return fields
+
+    def load_fields(self, queryset):
+        """Champs du tri chargés même après only() / defer() : le curseur les lit sans requête"""
+        names, defer = queryset.query.deferred_loading
+        ordering = {name for name, _ in self.fields}
+        if defer and names & ordering:
+            return queryset.defer(None).defer(*(names - ordering))
+        if not defer and names and not ordering <= names:
+            return queryset.only(*names, *ordering)
+        return queryset
+
+    def model_field(self, name):
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise NotFound(self.invalid_cursor_message)
+
+    def order_expression(self, name, descending):
+        if not self.model_field(name).null:
+            return f"-{name}" if descending else name
+        # NULL après les valeurs dans l'ordre du tri (avant en parcours inverse), quel que soit le SGBD
+        nulls = {'nulls_first': True} if self.reverse else {'nulls_last': True}
+        return F(name).desc(**nulls) if descending else F(name).asc(**nulls)
+
+    def after(self, directions, position):
+        """
+        Lignes strictement après le tuple position, développé champ par champ :
+        (a < x) OR (a = x AND b > y) — forme valable quand les sens diffèrent
+        """
+        condition, equal = Q(), Q()
+        for (name, descending), value in zip(directions, position):
+            nullable = self.model_field(name).null
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if self.reverse and nullable else None
+                same = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if nullable and not self.reverse:
+                    after |= Q(**{f'{name}__isnull': True})
+                same = Q(**{name: value})
+            if after is not None:
+                condition |= equal & after
+            equal &= same
+        return condition
+
+    def position_of(self, row):
+        values = []
+        for name, _ in self.fields:
+            field = self.model_field(name)
+            values.append(None if getattr(row, field.attname) is None else field.value_to_string(row))
+        return values
+
+    def decode_cursor(self, request):
+        """(valeurs du tuple, page précédente) ; self.cursor garde les valeurs encodées"""
+        self.cursor = None
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            raw, reverse = payload['p'], bool(payload.get('r'))
+            if not isinstance(raw, list) or len(raw) != len(self.fields):
+                raise ValueError
+            position = [
+                None if value is None else self.model_field(name).to_python(value)
+                for (name, _), value in zip(self.fields, raw)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        self.cursor = raw
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': position}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        # Page vide (page précédente au début) : repartir du curseur reçu
+        position = self.position_of(self.page[-1]) if self.page else self.cursor
+        return self.encode_cursor(position, False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position_of(self.page[0]) if self.page else self.cursor
+        return self.encode_cursor(position, True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class DefaultPagination(PageNumberPagination):
+    """
+    Pagination par numéro de page, avec mode curseur optionnel
+    Le mode curseur est activé par ?pagination=cursor (la première page)
+    puis par le paramètre ?cursor= des liens next/previous.
+    """
+    mode_query_param = 'pagination'
+    cursor_pagination_class = KeysetPagination
+
+    def __init__(self):
+        self.cursor_paginator = None
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            # Mêmes réglages de taille de page que le mode par numéro
+            self.cursor_paginator = self.cursor_pagination_class()
+            self.cursor_paginator.page_size = self.page_size
+            self.cursor_paginator.page_size_query_param = self.page_size_query_param
+            self.cursor_paginator.max_page_size = self.max_page_size
+            page = self.cursor_paginator.paginate_queryset(queryset, request, view)
+            self.display_page_controls = self.cursor_paginator.display_page_controls
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -29,6 +29,9 @@ INSTALLED_APPS = [
     'emails',
     'forms',
     'entries',
+    'blobs',
+    'images',
+    'realtime',
 ]
 
 MIDDLEWARE = [
@@ -84,6 +87,32 @@ DATABASES = {
     }
 }
 
+# Hachage des mots de passe : scrypt (défaut), argon2 (argon2-cffi) ou pbkdf2
+# Les hachages existants restent vérifiables et sont convertis à la connexion
+PASSWORD_HASHER_CLASSES = {
+    'scrypt': 'users.hashers.TunableScryptPasswordHasher',
+    'argon2': 'users.hashers.TunableArgon2PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='scrypt')
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_CLASSES[PASSWORD_HASHER],
+    *(path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER),
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+PASSWORD_SCRYPT_WORK_FACTOR = config('PASSWORD_SCRYPT_WORK_FACTOR', default=2 ** 14, cast=int)
+PASSWORD_SCRYPT_BLOCK_SIZE = config('PASSWORD_SCRYPT_BLOCK_SIZE', default=8, cast=int)
+PASSWORD_SCRYPT_PARALLELISM = config('PASSWORD_SCRYPT_PARALLELISM', default=1, cast=int)
+PASSWORD_ARGON2_TIME_COST = config('PASSWORD_ARGON2_TIME_COST', default=2, cast=int)
+PASSWORD_ARGON2_MEMORY_COST = config('PASSWORD_ARGON2_MEMORY_COST', default=19456, cast=int)
+PASSWORD_ARGON2_PARALLELISM = config('PASSWORD_ARGON2_PARALLELISM', default=1, cast=int)
+
+# Tentatives de connexion / inscription (seau à jetons, 'N/s|min|hour|day')
+LOGIN_RATE_IP = config('LOGIN_RATE_IP', default='30/min')
+LOGIN_RATE_EMAIL = config('LOGIN_RATE_EMAIL', default='5/min')
+# Emails de réinitialisation du mot de passe par adresse
+PASSWORD_RESET_RATE_EMAIL = config('PASSWORD_RESET_RATE_EMAIL', default='3/hour')
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -103,21 +132,129 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Stockage des blobs (images, etc.) adressés par SHA-256
+BLOB_BACKENDS = {
+    'filesystem': 'blobs.backends.FileSystemBlobBackend',
+    'database': 'blobs.backends.DatabaseBlobBackend',
+}
+BLOB_DEFAULT_BACKEND = config('BLOB_BACKEND', default='filesystem')
+BLOB_STORAGE_ROOT = config('BLOB_STORAGE_ROOT', default=str(MEDIA_ROOT / 'blobs'))
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache à deux niveaux : L1 local au processus devant un L2 partagé entre workers
+# CACHE_BACKEND : filesystem (local, tests), database, redis (production), locmem
+SHARED_CACHE_BACKENDS = {
+    'filesystem': 'django.core.cache.backends.filebased.FileBasedCache',
+    'database': 'django.core.cache.backends.db.DatabaseCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='filesystem')
+CACHE_LOCATION = config('CACHE_LOCATION', default={
+    'filesystem': str(BASE_DIR / '.cache'),
+    'database': 'cache_table',
+}.get(CACHE_BACKEND, ''))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.TieredCache',
+        'KEY_PREFIX': 'red',
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'L2_ALIAS': 'shared',
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1000, cast=int),
+            'L1_TIMEOUT': config('CACHE_L1_TIMEOUT', default=5, cast=int),
+        },
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': CACHE_LOCATION,
+        'TIMEOUT': 300,
+    },
+}
+
+# Flux SSE /api/events/ : seulement derrière un serveur ASGI
+# (ex. gunicorn config.asgi -k uvicorn.workers.UvicornWorker), sinon le frontend reste en polling
+REALTIME_ENABLED = config('REALTIME_ENABLED', default=False, cast=bool)
+# Événements temps réel (SSE) : local (un seul processus) ou redis (pub/sub entre workers)
+REALTIME_BACKENDS = {
+    'local': 'realtime.backends.LocalBackend',
+    'redis': 'realtime.backends.RedisBackend',
+}
+REALTIME = {
+    'BACKEND': REALTIME_BACKENDS[config('REALTIME_BACKEND', default='local')],
+    'LOCATION': config('REALTIME_LOCATION', default=''),
+    'OPTIONS': {
+        'MAX_QUEUE': config('REALTIME_MAX_QUEUE', default=100, cast=int),
+    },
+}
+
+# Rétention des traces de suppression de messages (synchronisation incrémentale)
+MESSAGE_TOMBSTONE_RETENTION_DAYS = config('MESSAGE_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+# Marge du jeton de synchronisation : au moins la durée de la plus longue transaction d'écriture
+MESSAGE_SYNC_SAFETY_LAG_SECONDS = config('MESSAGE_SYNC_SAFETY_LAG_SECONDS', default=5, cast=int)
+
+# Envoi des emails : console en local, SMTP en production
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='RED PRODUCT <noreply@redproduct.local>')
+# File d'attente (python manage.py send_queued_emails) : lots, essais, délai croissant en secondes
+EMAIL_QUEUE_BATCH_SIZE = config('EMAIL_QUEUE_BATCH_SIZE', default=50, cast=int)
+EMAIL_QUEUE_MAX_ATTEMPTS = config('EMAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_QUEUE_BACKOFF_BASE = config('EMAIL_QUEUE_BACKOFF_BASE', default=60, cast=int)
+EMAIL_QUEUE_BACKOFF_MAX = config('EMAIL_QUEUE_BACKOFF_MAX', default=3600, cast=int)
+EMAIL_QUEUE_POLL_INTERVAL = config('EMAIL_QUEUE_POLL_INTERVAL', default=5, cast=float)
+# Envois groupés depuis un modèle : destinataires par requête, lignes par INSERT, requêtes par utilisateur, modèles compilés gardés par processus
+EMAIL_BULK_LIMIT = config('EMAIL_BULK_LIMIT', default=5000, cast=int)
+EMAIL_BULK_BATCH_SIZE = config('EMAIL_BULK_BATCH_SIZE', default=1000, cast=int)
+EMAIL_BULK_RATE_USER = config('EMAIL_BULK_RATE_USER', default='10/hour')
+EMAIL_TEMPLATE_CACHE_SIZE = config('EMAIL_TEMPLATE_CACHE_SIZE', default=100, cast=int)
+# Validateurs compilés des formulaires gardés par processus
+FORM_VALIDATOR_CACHE_SIZE = config('FORM_VALIDATOR_CACHE_SIZE', default=500, cast=int)
+# Longueur maximale de la contrainte pattern d'un champ
+FORM_PATTERN_MAX_LENGTH = config('FORM_PATTERN_MAX_LENGTH', default=200, cast=int)
+# Insertion en masse d'entrées : lignes par requête, lignes par INSERT
+ENTRY_BULK_LIMIT = config('ENTRY_BULK_LIMIT', default=10000, cast=int)
+ENTRY_BULK_BATCH_SIZE = config('ENTRY_BULK_BATCH_SIZE', default=1000, cast=int)
+# Export des entrées en flux : lignes lues par aller-retour avec la base
+ENTRY_EXPORT_CHUNK_SIZE = config('ENTRY_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+# Nouveau champ indexé : réindexation immédiate jusqu'à ce nombre d'entrées, sinon reindex_entry_fields
+ENTRY_INDEX_INLINE_LIMIT = config('ENTRY_INDEX_INLINE_LIMIT', default=10000, cast=int)
+# Reconstruction des statistiques de formulaire : réductions NumPy (si installé) à partir de ce nombre de valeurs
+FORM_STATS_NUMPY_THRESHOLD = config('FORM_STATS_NUMPY_THRESHOLD', default=1000, cast=int)
+# Durée de validité des URL signées des images (image_url, chargeables par <img src>)
+IMAGE_URL_MAX_AGE = config('IMAGE_URL_MAX_AGE', default=86400, cast=int)
+# Adresse du frontend, pour les liens envoyés par email
+FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:5173')
+
 AUTH_USER_MODEL = 'users.CustomUser'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.DefaultPagination',
     'PAGE_SIZE': 50,
+    # Proxys de confiance devant l'application (1 sur Render) : 0 = REMOTE_ADDR,
+    # X-Forwarded-For n'est alors jamais lu (limitation des connexions par IP)
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
+# Réutilisation d'un refresh token tolérée juste après sa rotation (requêtes simultanées de plusieurs onglets)
+REFRESH_REUSE_GRACE_SECONDS = config('REFRESH_REUSE_GRACE_SECONDS', default=10, cast=int)
+# Écriture par lots des jetons révoqués dans la table RevokedToken (hors du rafraîchissement)
+REVOKED_TOKEN_FLUSH_SIZE = config('REVOKED_TOKEN_FLUSH_SIZE', default=100, cast=int)
+REVOKED_TOKEN_FLUSH_SECONDS = config('REVOKED_TOKEN_FLUSH_SECONDS', default=5, cast=int)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -125,6 +262,12 @@ SIMPLE_JWT = {
     'SIGNING_KEY': SECRET_KEY,
 }
 
+# Utilisateur reconstruit depuis les claims du jeton, sans requête par appel
+AUTH_STATELESS_USER = config('AUTH_STATELESS_USER', default=True, cast=bool)
+# Cache local des utilisateurs (par processus, invalidé à l'enregistrement)
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=60, cast=int)
+USER_CACHE_MAX_ENTRIES = config('USER_CACHE_MAX_ENTRIES', default=10000, cast=int)
+
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
     default='http://localhost:5173,http://localhost:3000,https://red-product-jeemacode.vercel.app',
@@ -0,0 +1,95 @@
+import threading
+import time
+from unittest import mock
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+from .cache import LRUCache, TieredCache, bump_version, get_or_compute, get_version
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'config.cache.TieredCache',
+        'LOCATION': 'tests',
+        'OPTIONS': {'L2_ALIAS': 'shared', 'L1_MAX_ENTRIES': 3, 'L1_TIMEOUT': 5},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests-shared',
+    },
+}
+
+
+class LRUCacheTestCase(SimpleTestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual(lru.get('a'), 1)
+        self.assertIsNone(lru.get('b', None))
+        self.assertEqual(lru.evictions, 1)
+
+    def test_entries_expire(self):
+        lru = LRUCache()
+        lru.set('a', 1, timeout=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get('a', None))
+
+
+@override_settings(CACHES=TEST_CACHES)
+class TieredCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        cache.stats.reset()
+
+    def test_reads_go_through_l1_then_l2(self):
+        self.assertIsInstance(caches['default'], TieredCache)
+        caches['shared'].set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        stats = cache.stats.snapshot()
+        self.assertEqual((stats['l2_hits'], stats['l1_hits']), (1, 1))
+        self.assertIsNone(cache.get('absent'))
+        self.assertEqual(cache.stats.snapshot()['misses'], 1)
+
+    def test_writes_reach_shared_layer(self):
+        cache.set('key', 'value')
+        self.assertEqual(caches['shared'].get('key'), 'value')
+        cache.delete('key')
+        self.assertIsNone(caches['shared'].get('key'))
+        self.assertIsNone(cache.get('key'))
+
+    def test_versions_are_read_from_shared_layer(self):
+        version = get_version('tests')
+        bump_version('tests')
+        self.assertNotEqual(get_version('tests'), version)
+
+    def test_bumps_never_reuse_a_version(self):
+        # Jeton neuf à chaque invalidation, sans lecture préalable (pas d'incr() non atomique)
+        shared = caches['shared']
+        versions = [get_version('tests')]
+        with mock.patch.object(type(shared), 'incr', side_effect=AssertionError('incr')):
+            for _ in range(2):
+                bump_version('tests')
+                versions.append(get_version('tests'))
+        self.assertEqual(len(set(versions)), 3)
+
+    def test_get_or_compute_runs_once_under_concurrency(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 42
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_compute('answer', compute, 60)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(len(calls), 1)
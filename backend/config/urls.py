@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from . import views
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -12,6 +13,10 @@ urlpatterns = [
     path('api/emails/', include('emails.urls')),
     path('api/forms/', include('forms.urls')),
     path('api/entries/', include('entries.urls')),
+    path('api/blobs/', include('blobs.urls')),
+    path('api/events/', include('realtime.urls')),
+    path('api/', include('images.urls')),
+    path('api/ops/cache/', views.cache_stats, name='cache-stats'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,14 @@
+import os
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .cache import cache_stats as get_cache_stats
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """Compteurs du cache (hits / misses) du worker qui répond"""
+    return Response({
+        'pid': os.getpid(),
+        'caches': get_cache_stats(),
+    })
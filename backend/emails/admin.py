@@ -1,9 +1,25 @@
 from django.contrib import admin
-from .models import Email
+from django.utils import timezone
+from .models import Email, EmailTemplate
 
 @admin.register(Email)
 class EmailAdmin(admin.ModelAdmin):
-    list_display = ('recipient', 'subject', 'is_sent', 'created_at')
-    list_filter = ('is_sent', 'created_at')
+    list_display = ('recipient', 'subject', 'template', 'status', 'attempts', 'latency_ms', 'created_at')
+    list_filter = ('status', 'is_sent', 'template', 'created_at')
     search_fields = ('recipient', 'subject', 'body')
-    readonly_fields = ('created_at', 'sent_at')
+    readonly_fields = ('created_at', 'sent_at', 'attempts', 'last_error', 'latency_ms')
+    actions = ('requeue',)
+
+    @admin.action(description="Remettre en file d'attente")
+    def requeue(self, request, queryset):
+        count = queryset.exclude(status=Email.STATUS_SENT).update(
+            status=Email.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"{count} email(s) remis en file d'attente")
+
+
+@admin.register(EmailTemplate)
+class EmailTemplateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'subject', 'updated_at')
+    search_fields = ('name', 'subject')
+    readonly_fields = ('created_at', 'updated_at')
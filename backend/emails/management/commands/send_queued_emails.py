@@ -0,0 +1,54 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from emails.queue import send_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Envoyer les emails en file d'attente par lots, sur une connexion SMTP par lot. "
+        "Sans --loop, s'arrête quand plus aucun email n'est dû (tâche planifiée) ; "
+        "plusieurs workers peuvent tourner en parallèle."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=settings.EMAIL_QUEUE_BATCH_SIZE,
+            help="Nombre d'emails réservés et envoyés par lot",
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="Continuer à surveiller la file (worker permanent)",
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_QUEUE_POLL_INTERVAL,
+            help="Attente en secondes quand la file est vide (avec --loop)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        totals = {'sent': 0, 'retried': 0, 'failed': 0}
+        try:
+            while True:
+                result = send_batch(batch_size)
+                for name in totals:
+                    totals[name] += getattr(result, name)
+                if result.total:
+                    self.stdout.write(
+                        f"Lot : {result.sent} envoyé(s), {result.retried} à réessayer, {result.failed} en échec"
+                    )
+                # Lot incomplet : la file est vide (ou les emails restants ne sont pas dus)
+                if result.total < batch_size:
+                    if not options['loop']:
+                        break
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['sent']} email(s) envoyé(s), {totals['retried']} à réessayer, {totals['failed']} en échec"
+        ))
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:42
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def set_existing_status(apps, schema_editor):
+    """
+    Emails antérieurs à la file d'attente : ne pas les envoyer au déploiement
+    Les non envoyés passent en échec, à remettre en file depuis l'admin si besoin.
+    """
+    Email = apps.get_model('emails', 'Email')
+    Email.objects.filter(is_sent=True).update(status='sent')
+    Email.objects.filter(is_sent=False).update(status='failed', last_error="Créé avant la file d'attente")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='email',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='last_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='latency_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='next_attempt_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='email',
+            name='status',
+            field=models.CharField(choices=[('pending', 'En attente'), ('sent', 'Envoyé'), ('failed', 'Échec')], default='pending', max_length=10),
+        ),
+        migrations.RunPython(set_existing_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='email',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['next_attempt_at'], name='email_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+PASSWORD_RESET_BODY = """Bonjour{% if first_name %} {{ first_name }}{% endif %},
+
+Pour choisir un nouveau mot de passe, ouvrez le lien suivant :
+{{ reset_url }}
+
+Si vous n'êtes pas à l'origine de cette demande, ignorez cet email.
+"""
+
+
+def create_templates(apps, schema_editor):
+    EmailTemplate = apps.get_model('emails', 'EmailTemplate')
+    EmailTemplate.objects.get_or_create(
+        name='password-reset',
+        defaults={'subject': "Réinitialisation de votre mot de passe", 'body': PASSWORD_RESET_BODY},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('emails', '0003_email_template'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_templates, migrations.RunPython.noop),
+    ]
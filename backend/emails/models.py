@@ -1,15 +1,67 @@
 from django.db import models
+from django.utils import timezone
+
+class EmailTemplate(models.Model):
+    """
+    Modèle d'email (syntaxe des templates Django, texte brut)
+    Compilé une fois par processus (emails.templating), le corps de chaque
+    email est rendu à l'envoi à partir de son contexte.
+    """
+    name = models.SlugField(max_length=100, unique=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
 
 class Email(models.Model):
+    """
+    Email sortant, envoyé par la file d'attente (emails.queue)
+    - Les vues se contentent d'enregistrer l'email (statut pending)
+    - Avec un modèle : seul le contexte du destinataire est stocké,
+      le corps est rendu à l'envoi
+    - send_queued_emails envoie par lots et réessaie avec un délai croissant
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'En attente'),
+        (STATUS_SENT, 'Envoyé'),
+        (STATUS_FAILED, 'Échec'),
+    )
+
     recipient = models.EmailField()
     subject = models.CharField(max_length=255)
-    body = models.TextField()
+    body = models.TextField(blank=True)
+    template = models.ForeignKey(EmailTemplate, on_delete=models.PROTECT, null=True, blank=True, related_name='emails')
+    context = models.JSONField(default=dict, blank=True)
     is_sent = models.BooleanField(default=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    # Durée du dernier envoi SMTP, en millisecondes
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     sent_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # File d'attente : seulement les emails à envoyer, par échéance
+            models.Index(
+                fields=['next_attempt_at'],
+                condition=models.Q(status='pending'),
+                name='email_queue_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Email to {self.recipient}: {self.subject}"
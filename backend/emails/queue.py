@@ -0,0 +1,155 @@
+"""
+File d'attente des emails sortants
+
+- enqueue() : enregistrer l'email, sans contacter le serveur SMTP
+  (seule opération faite pendant une requête HTTP)
+- enqueue_template() / enqueue_many() : même chose à partir d'un modèle,
+  seul le contexte de chaque destinataire est stocké, un seul INSERT
+  (bulk_create) pour N destinataires
+- send_batch() : réserver un lot d'emails dus avec SELECT ... FOR UPDATE
+  SKIP LOCKED (plusieurs workers se partagent la file sans envoyer deux fois)
+  et les envoyer sur une seule connexion SMTP
+- Échec : nouvel essai après EMAIL_QUEUE_BACKOFF_BASE * 2^(essais - 1)
+  secondes, borné par EMAIL_QUEUE_BACKOFF_MAX ; abandon (failed) après
+  EMAIL_QUEUE_MAX_ATTEMPTS essais
+
+Les lignes restent verrouillées pendant l'envoi du lot : si le worker
+s'arrête, la transaction est annulée et les emails redeviennent disponibles.
+"""
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+from hotels.models import DashboardCounters
+from realtime.hub import publish
+from .models import Email, EmailTemplate
+from .templating import render_email, render_subject
+
+logger = logging.getLogger(__name__)
+
+UPDATED_FIELDS = ('is_sent', 'status', 'attempts', 'next_attempt_at', 'last_error', 'latency_ms', 'sent_at')
+
+
+@dataclass
+class BatchResult:
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+    @property
+    def total(self):
+        return self.sent + self.retried + self.failed
+
+
+def enqueue(recipient, subject, body):
+    """Mettre un email en file d'attente"""
+    return Email.objects.create(recipient=recipient, subject=subject, body=body)
+
+
+def enqueue_template(name, recipient, context):
+    """Mettre en file un email rendu à partir du modèle `name`"""
+    template = EmailTemplate.objects.get(name=name)
+    return Email.objects.create(
+        recipient=recipient,
+        subject=render_subject(template, context),
+        template=template,
+        context=context,
+    )
+
+
+def enqueue_many(template, recipients):
+    """
+    Envoyer un modèle à plusieurs destinataires
+    recipients : [{'email': ..., 'context': {...}}, ...]
+    Le sujet est rendu tout de suite (affiché dans les listes), le corps à l'envoi.
+    """
+    with transaction.atomic():
+        emails = Email.objects.bulk_create(
+            [
+                Email(
+                    recipient=recipient['email'],
+                    subject=render_subject(template, recipient.get('context', {})),
+                    template=template,
+                    context=recipient.get('context', {}),
+                )
+                for recipient in recipients
+            ],
+            batch_size=settings.EMAIL_BULK_BATCH_SIZE,
+        )
+        # bulk_create ne déclenche pas les signaux des compteurs
+        DashboardCounters.increment(total_emails=len(emails))
+    publish('dashboard.changed', {'model': Email._meta.label_lower})
+    return emails
+
+
+def backoff_delay(attempts):
+    """Délai avant le prochain essai, après `attempts` échecs"""
+    delay = settings.EMAIL_QUEUE_BACKOFF_BASE * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_QUEUE_BACKOFF_MAX))
+
+
+def due_emails(now=None):
+    return Email.objects.filter(
+        status=Email.STATUS_PENDING,
+        next_attempt_at__lte=now or timezone.now(),
+    ).order_by('next_attempt_at', 'id')
+
+
+def deliver(email, connection, result):
+    """Envoyer un email sur une connexion ouverte et noter le résultat"""
+    email.attempts += 1
+    started = time.perf_counter()
+    try:
+        # Ne fait rien si la connexion est déjà ouverte, la rouvre après une erreur
+        connection.open()
+        message = EmailMessage(
+            email.subject, render_email(email), settings.DEFAULT_FROM_EMAIL, [email.recipient], connection=connection
+        )
+        if not connection.send_messages([message]):
+            raise RuntimeError("Aucun destinataire accepté")
+    except Exception as exc:
+        email.latency_ms = int((time.perf_counter() - started) * 1000)
+        email.last_error = f"{type(exc).__name__}: {exc}"[:1000]
+        connection.close()
+        if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+            email.status = Email.STATUS_FAILED
+            result.failed += 1
+            logger.warning(f"Email {email.id} abandonné après {email.attempts} essais : {email.last_error}")
+        else:
+            email.next_attempt_at = timezone.now() + backoff_delay(email.attempts)
+            result.retried += 1
+        return
+    
+    email.latency_ms = int((time.perf_counter() - started) * 1000)
+    email.status = Email.STATUS_SENT
+    email.is_sent = True
+    email.sent_at = timezone.now()
+    email.last_error = ''
+    result.sent += 1
+
+
+def send_batch(batch_size=None, connection=None):
+    """Envoyer un lot d'emails dus, retourne un BatchResult"""
+    result = BatchResult()
+    with transaction.atomic():
+        emails = list(
+            due_emails()
+            .select_related('template')
+            # Verrouiller les emails seulement, pas leurs modèles
+            .select_for_update(skip_locked=True, of=('self',))[:batch_size or settings.EMAIL_QUEUE_BATCH_SIZE]
+        )
+        if not emails:
+            return result
+        
+        connection = connection or get_connection()
+        try:
+            for email in emails:
+                deliver(email, connection, result)
+        finally:
+            connection.close()
+        Email.objects.bulk_update(emails, UPDATED_FIELDS)
+    return result
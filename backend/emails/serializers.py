@@ -1,8 +1,53 @@
+from django.conf import settings
+from django.template import TemplateSyntaxError
 from rest_framework import serializers
-from .models import Email
+from .models import Email, EmailTemplate
+from .templating import engine
 
 class EmailSerializer(serializers.ModelSerializer):
+    template = serializers.SlugRelatedField(slug_field='name', read_only=True)
+
     class Meta:
         model = Email
-        fields = ('id', 'recipient', 'subject', 'body', 'is_sent', 'created_at', 'sent_at')
-        read_only_fields = ('id', 'created_at', 'sent_at')
+        fields = (
+            'id', 'recipient', 'subject', 'body', 'template', 'context', 'is_sent', 'status', 'attempts',
+            'next_attempt_at', 'last_error', 'latency_ms', 'created_at', 'sent_at'
+        )
+        read_only_fields = (
+            'id', 'template', 'context', 'is_sent', 'status', 'attempts', 'next_attempt_at', 'last_error',
+            'latency_ms', 'created_at', 'sent_at'
+        )
+        extra_kwargs = {'body': {'allow_blank': False}}
+
+
+class EmailTemplateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = EmailTemplate
+        fields = ('id', 'name', 'subject', 'body', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'created_at', 'updated_at')
+
+    def _compile(self, value):
+        try:
+            engine.from_string(value)
+        except TemplateSyntaxError as exc:
+            raise serializers.ValidationError(f"Modèle invalide : {exc}")
+        return value
+
+    def validate_subject(self, value):
+        return self._compile(value)
+
+    def validate_body(self, value):
+        return self._compile(value)
+
+
+class RecipientSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    context = serializers.DictField(required=False, default=dict)
+
+
+class BulkEmailSerializer(serializers.Serializer):
+    """Un modèle envoyé à plusieurs destinataires, chacun avec son contexte"""
+    template = serializers.SlugRelatedField(slug_field='name', queryset=EmailTemplate.objects.all())
+    recipients = serializers.ListField(
+        child=RecipientSerializer(), allow_empty=False, max_length=settings.EMAIL_BULK_LIMIT
+    )
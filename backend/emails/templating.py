@@ -0,0 +1,45 @@
+"""
+Rendu des emails à partir des modèles (EmailTemplate)
+
+- Chaque modèle est compilé une fois par processus et gardé dans un LRU
+  borné, clé (id, updated_at) : une modification du modèle est prise en
+  compte sans invalidation explicite
+- Texte brut : pas d'échappement HTML
+"""
+from django.conf import settings
+from django.template import Context, Engine
+from config.cache import MISSING, LRUCache
+
+engine = Engine(autoescape=False)
+_compiled = LRUCache(settings.EMAIL_TEMPLATE_CACHE_SIZE)
+
+
+def compile_template(template):
+    """(sujet, corps) compilés d'un modèle"""
+    key = (template.pk, template.updated_at)
+    compiled = _compiled.get(key)
+    if compiled is MISSING:
+        compiled = (engine.from_string(template.subject), engine.from_string(template.body))
+        _compiled.set(key, compiled)
+    return compiled
+
+
+def render_subject(template, context):
+    subject = compile_template(template)[0].render(Context(context))
+    # Un sujet tient sur une ligne (en-tête SMTP)
+    return ' '.join(subject.split())
+
+
+def render_body(template, context):
+    return compile_template(template)[1].render(Context(context))
+
+
+def render_email(email):
+    """Corps d'un email, rendu à la demande s'il vient d'un modèle"""
+    if email.template_id is None:
+        return email.body
+    return render_body(email.template, email.context)
+
+
+def clear_compiled():
+    _compiled.clear()
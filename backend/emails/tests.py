@@ -0,0 +1,177 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from hotels.models import DashboardCounters
+from users.throttling import LoginIPThrottle, PasswordResetEmailThrottle
+from .throttling import EmailBulkThrottle
+from .models import Email, EmailTemplate
+from .queue import backoff_delay, enqueue, send_batch
+from .templating import clear_compiled, engine, render_email, render_subject
+
+User = get_user_model()
+
+
+@override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=3, EMAIL_QUEUE_BACKOFF_BASE=60, EMAIL_QUEUE_BACKOFF_MAX=3600)
+class EmailQueueTestCase(TestCase):
+    def setUp(self):
+        LoginIPThrottle().get_bucket('127.0.0.1').reset()
+        PasswordResetEmailThrottle().get_bucket('test@example.com').reset()
+
+    def test_forgot_password_only_enqueues(self):
+        User.objects.create_user(username='test@example.com', email='test@example.com', password='testpass123')
+        response = APIClient().post('/api/auth/forgot-password/', {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        email = Email.objects.get(recipient='test@example.com')
+        self.assertEqual(email.status, Email.STATUS_PENDING)
+        self.assertIn('/reset-password/', render_email(email))
+
+    def test_batch_uses_one_connection(self):
+        for i in range(3):
+            enqueue(f'user{i}@example.com', 'Sujet', 'Corps')
+        with mock.patch('emails.queue.get_connection', wraps=mail.get_connection) as get_connection:
+            result = send_batch(batch_size=10)
+        get_connection.assert_called_once()
+        self.assertEqual(result.sent, 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertFalse(Email.objects.exclude(status=Email.STATUS_SENT).exists())
+        self.assertTrue(all(email.is_sent and email.latency_ms is not None for email in Email.objects.all()))
+        self.assertEqual(send_batch().total, 0)
+
+    def test_failure_is_retried_with_backoff(self):
+        email = enqueue('test@example.com', 'Sujet', 'Corps')
+        connection = mail.get_connection()
+        with mock.patch.object(connection, 'send_messages', side_effect=OSError('Connexion refusée')):
+            self.assertEqual(send_batch(connection=connection).retried, 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, Email.STATUS_PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertIn('Connexion refusée', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        # Pas encore dû
+        self.assertEqual(send_batch().total, 0)
+
+        Email.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+        self.assertEqual(send_batch().sent, 1)
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts, email.last_error), (Email.STATUS_SENT, 2, ''))
+
+    def test_gives_up_after_max_attempts(self):
+        email = enqueue('test@example.com', 'Sujet', 'Corps')
+        Email.objects.filter(pk=email.pk).update(attempts=2)
+        connection = mail.get_connection()
+        with mock.patch.object(connection, 'send_messages', side_effect=OSError('Boîte pleine')):
+            self.assertEqual(send_batch(connection=connection).failed, 1)
+        email.refresh_from_db()
+        self.assertEqual(email.status, Email.STATUS_FAILED)
+
+    def test_backoff_delay(self):
+        self.assertEqual(backoff_delay(1).total_seconds(), 60)
+        self.assertEqual(backoff_delay(3).total_seconds(), 240)
+        self.assertEqual(backoff_delay(10).total_seconds(), 3600)
+
+
+class EmailTemplateTestCase(TestCase):
+    def setUp(self):
+        LoginIPThrottle().get_bucket('127.0.0.1').reset()
+        PasswordResetEmailThrottle().get_bucket('admin@example.com').reset()
+        self.user = User.objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='testpass123', is_staff=True
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        EmailBulkThrottle().get_bucket(str(self.user.pk)).reset()
+        self.template = EmailTemplate.objects.create(
+            name='ticket-update', subject='Ticket {{ ticket }} mis à jour', body='Bonjour {{ name }}, statut : {{ status }}'
+        )
+
+    def test_bulk_fan_out_single_insert(self):
+        recipients = [
+            {'email': f'user{i}@example.com', 'context': {'name': f'User {i}', 'ticket': i, 'status': 'résolu'}}
+            for i in range(20)
+        ]
+        counters = DashboardCounters.load()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/emails/bulk/', {'template': 'ticket-update', 'recipients': recipients}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 20)
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "emails_email"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(DashboardCounters.load().total_emails, counters.total_emails + 20)
+
+        email = Email.objects.get(recipient='user3@example.com')
+        self.assertEqual(email.subject, 'Ticket 3 mis à jour')
+        self.assertEqual(email.body, '')
+
+        # Corps rendu à l'envoi
+        send_batch(batch_size=100)
+        message = next(m for m in mail.outbox if m.to == ['user3@example.com'])
+        self.assertEqual(message.body, 'Bonjour User 3, statut : résolu')
+
+    @override_settings(EMAIL_BULK_RATE_USER='1/hour')
+    def test_bulk_is_throttled_per_user(self):
+        payload = {'template': 'ticket-update', 'recipients': [{'email': 'user@example.com'}]}
+        self.assertEqual(self.client.post('/api/emails/bulk/', payload, format='json').status_code, status.HTTP_201_CREATED)
+        response = self.client.post('/api/emails/bulk/', payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(Email.objects.count(), 1)
+
+    def test_templates_compiled_once(self):
+        clear_compiled()
+        with mock.patch.object(engine, 'from_string', wraps=engine.from_string) as from_string:
+            for i in range(5):
+                render_subject(self.template, {'ticket': i})
+        self.assertEqual(from_string.call_count, 2)
+
+        # Une modification du modèle est recompilée
+        self.template.subject = 'Ticket {{ ticket }} clos'
+        self.template.save()
+        self.assertEqual(render_subject(self.template, {'ticket': 1}), 'Ticket 1 clos')
+
+    def test_invalid_template_rejected(self):
+        response = self.client.post('/api/emails/templates/', {'name': 'casse', 'subject': 'x', 'body': '{% if %}'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_password_reset_uses_template(self):
+        response = APIClient().post('/api/auth/forgot-password/', {'email': 'admin@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        email = Email.objects.get(recipient='admin@example.com')
+        self.assertEqual(email.template.name, 'password-reset')
+        self.assertIn('/reset-password/', render_email(email))
+
+
+class EmailPermissionsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username='user@example.com', email='user@example.com', password='testpass123')
+        )
+        EmailTemplate.objects.create(name='annonce', subject='Annonce', body='Bonjour')
+
+    def test_only_admins_send_or_read_emails(self):
+        response = self.client.post('/api/emails/', {'recipient': 'cible@example.com', 'subject': 'Spam', 'body': 'Spam'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post('/api/emails/bulk/', {'template': 'annonce', 'recipients': [{'email': 'cible@example.com'}]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get('/api/emails/').status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Email.objects.exists())
+
+    def test_app_admins_manage_emails(self):
+        admin = User.objects.create_user(
+            username='gerant@example.com', email='gerant@example.com', password='testpass123', is_admin=True
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.post('/api/emails/', {'recipient': 'cible@example.com', 'subject': 'Info', 'body': 'Info'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.client.get('/api/emails/').status_code, status.HTTP_200_OK)
+
+    def test_templates_are_read_only_for_users(self):
+        self.assertEqual(self.client.get('/api/emails/templates/').status_code, status.HTTP_200_OK)
+        response = self.client.post('/api/emails/templates/', {'name': 'spam', 'subject': 'x', 'body': 'y'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
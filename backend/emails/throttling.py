@@ -0,0 +1,10 @@
+from users.throttling import TokenBucketThrottle
+
+
+class EmailBulkThrottle(TokenBucketThrottle):
+    """Envois groupés par utilisateur (chaque requête peut viser EMAIL_BULK_LIMIT destinataires)"""
+    scope = 'email-bulk'
+    rate_setting = 'EMAIL_BULK_RATE_USER'
+
+    def get_ident_key(self, request):
+        return str(request.user.pk) if request.user and request.user.is_authenticated else None
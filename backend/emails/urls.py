@@ -3,6 +3,8 @@ from rest_framework.routers import DefaultRouter
 from . import views
 
 router = DefaultRouter()
+# Avant la route vide, dont le détail capturerait 'templates/'
+router.register(r'templates', views.EmailTemplateViewSet, basename='email-template')
 router.register(r'', views.EmailViewSet, basename='email')
 
 urlpatterns = [
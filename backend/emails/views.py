@@ -1,9 +1,54 @@
-from rest_framework import viewsets
+from django.db.models import ProtectedError
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from .models import Email
-from .serializers import EmailSerializer
+from rest_framework.response import Response
+from users.permissions import IsAppAdmin
+from .models import Email, EmailTemplate
+from .queue import enqueue_many
+from .serializers import BulkEmailSerializer, EmailSerializer, EmailTemplateSerializer
+from .throttling import EmailBulkThrottle
 
 class EmailViewSet(viewsets.ModelViewSet):
-    queryset = Email.objects.all()
+    """
+    File des emails, réservée aux administrateurs (is_admin ou is_staff) :
+    les emails créés sont réellement envoyés (send_queued_emails) et les
+    corps contiennent des liens de réinitialisation de mot de passe
+    """
+    queryset = Email.objects.select_related('template')
     serializer_class = EmailSerializer
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAppAdmin]
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAppAdmin], throttle_classes=[EmailBulkThrottle])
+    def bulk(self, request):
+        """
+        Envoyer un modèle à plusieurs destinataires (un seul INSERT) :
+        {"template": "nom", "recipients": [{"email": "...", "context": {...}}, ...]}
+        Administrateurs seulement, EMAIL_BULK_RATE_USER requêtes par utilisateur
+        """
+        serializer = BulkEmailSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        emails = enqueue_many(serializer.validated_data['template'], serializer.validated_data['recipients'])
+        ids = [email.pk for email in emails]
+        return Response({'ids': ids, 'count': len(ids)}, status=status.HTTP_201_CREATED)
+
+
+class EmailTemplateViewSet(viewsets.ModelViewSet):
+    queryset = EmailTemplate.objects.all()
+    serializer_class = EmailTemplateSerializer
+
+    def get_permissions(self):
+        # Lecture pour tous, écriture réservée aux administrateurs
+        if self.action in ('list', 'retrieve'):
+            return [IsAuthenticated()]
+        return [IsAppAdmin()]
+
+    def destroy(self, request, *args, **kwargs):
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except ProtectedError:
+            return Response(
+                {'error': "Ce modèle est utilisé par des emails et ne peut pas être supprimé"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
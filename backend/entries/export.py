@@ -0,0 +1,98 @@
+"""
+Export des entrées d'un formulaire en flux (CSV ou NDJSON)
+
+- Lecture par curseur côté serveur (.iterator(chunk_size=ENTRY_EXPORT_CHUNK_SIZE)) :
+  mémoire constante quel que soit le nombre d'entrées, pas de COUNT(*) ni d'OFFSET
+- Le premier morceau (en-tête) part avant la première lecture en base
+- CSV : une colonne par champ de Form.fields, après id et created_at
+  (formulaire sans définition : data en JSON dans une seule colonne)
+- NDJSON : une ligne {"id", "created_at", "data"} par entrée
+"""
+import csv
+import io
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Entry
+
+# Préfixe des cellules interprétées comme formules par les tableurs
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def entry_rows(form):
+    return (
+        Entry.objects.filter(form=form)
+        .order_by('id')
+        .values_list('id', 'created_at', 'data')
+        .iterator(chunk_size=settings.ENTRY_EXPORT_CHUNK_SIZE)
+    )
+
+
+def export_columns(form):
+    """Noms des champs exportés en colonnes (vide : data en JSON)"""
+    return [field['name'] for field in form.fields if isinstance(field, dict) and 'name' in field]
+
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        value = ';'.join(str(item) for item in value)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif not isinstance(value, str):
+        return value
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_stream(form):
+    columns = export_columns(form)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(['id', 'created_at', *(columns or ['data'])])
+    yield flush()
+    
+    rows = 0
+    for entry_id, created_at, data in entry_rows(form):
+        if columns:
+            data = data if isinstance(data, dict) else {}
+            values = [csv_cell(data.get(name)) for name in columns]
+        else:
+            values = [json.dumps(data, ensure_ascii=False)]
+        writer.writerow([entry_id, created_at.isoformat(), *values])
+        rows += 1
+        # Regrouper les lignes : moins de morceaux, mémoire bornée
+        if rows % settings.ENTRY_EXPORT_CHUNK_SIZE == 0:
+            yield flush()
+    yield flush()
+
+
+def ndjson_stream(form):
+    lines = []
+    for entry_id, created_at, data in entry_rows(form):
+        lines.append(json.dumps(
+            {'id': entry_id, 'created_at': created_at, 'data': data},
+            cls=DjangoJSONEncoder, ensure_ascii=False,
+        ))
+        if len(lines) == settings.ENTRY_EXPORT_CHUNK_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv; charset=utf-8', csv_stream),
+    'ndjson': ('application/x-ndjson; charset=utf-8', ndjson_stream),
+}
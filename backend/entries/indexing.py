@@ -0,0 +1,136 @@
+"""
+Index des réponses des champs marqués "indexed" dans Form.fields
+
+Table annexe EntryFieldValue (entry, form, field, value), index (form, field, value) :
+?form=<id>&data__<champ>=<valeur> devient une recherche indexée au lieu
+d'un parcours de entries_entry (data->>'champ').
+
+- Écritures : les signaux (entries.signals) et l'insertion en masse
+  (entries.ingest) indexent les champs marqués dans la définition
+- Nouveau champ marqué : réindexé tout de suite si le formulaire compte
+  au plus ENTRY_INDEX_INLINE_LIMIT entrées, sinon par
+  python manage.py reindex_entry_fields --form <id>
+- Form.indexed_fields liste les champs dont la table est complète : les
+  autres sont filtrés directement sur data, sans index
+"""
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import TextField
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from forms.models import Form
+from .models import Entry, EntryFieldValue
+
+logger = logging.getLogger(__name__)
+
+
+def indexed_field_names(form):
+    """Champs marqués "indexed" dans la définition du formulaire"""
+    return [
+        field['name'] for field in form.fields
+        if isinstance(field, dict) and field.get('indexed') and isinstance(field.get('name'), str)
+    ]
+
+
+def normalize(value):
+    """Valeur indexée en texte (None : non indexable)"""
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value)[:EntryFieldValue.MAX_VALUE_LENGTH]
+    return value or None
+
+
+def field_values(entry_id, form_id, data, fields):
+    if not isinstance(data, dict):
+        return
+    for name in fields:
+        value = data.get(name)
+        for item in value if isinstance(value, list) else (value,):
+            item = normalize(item)
+            if item is not None:
+                yield EntryFieldValue(entry_id=entry_id, form_id=form_id, field=name, value=item)
+
+
+def index_entries(entries):
+    """Indexer des entrées nouvelles (form déjà chargé sur chaque entrée)"""
+    fields = {}
+    rows = []
+    for entry in entries:
+        if entry.form_id not in fields:
+            fields[entry.form_id] = indexed_field_names(entry.form)
+        rows.extend(field_values(entry.pk, entry.form_id, entry.data, fields[entry.form_id]))
+    if rows:
+        EntryFieldValue.objects.bulk_create(rows, batch_size=settings.ENTRY_BULK_BATCH_SIZE)
+
+
+def reindex_entry(entry):
+    EntryFieldValue.objects.filter(entry_id=entry.pk).delete()
+    index_entries([entry])
+
+
+def reindex_form(form, fields=None):
+    """
+    Reconstruire l'index des champs `fields` (défaut : tous les champs marqués)
+    et retirer ceux qui ne sont plus marqués
+    """
+    wanted = indexed_field_names(form)
+    fields = wanted if fields is None else [name for name in fields if name in wanted]
+    with transaction.atomic():
+        EntryFieldValue.objects.filter(form=form).exclude(field__in=wanted).delete()
+        EntryFieldValue.objects.filter(form=form, field__in=fields).delete()
+        rows = []
+        entries = Entry.objects.filter(form=form).values_list('id', 'data').iterator(
+            chunk_size=settings.ENTRY_EXPORT_CHUNK_SIZE
+        )
+        for entry_id, data in entries:
+            rows.extend(field_values(entry_id, form.pk, data, fields))
+            if len(rows) >= settings.ENTRY_BULK_BATCH_SIZE:
+                EntryFieldValue.objects.bulk_create(rows)
+                rows = []
+        EntryFieldValue.objects.bulk_create(rows)
+        Form.objects.filter(pk=form.pk).update(indexed_fields=wanted)
+    form.indexed_fields = wanted
+
+
+def sync_form(form):
+    """Après une modification de la définition : suivre les champs marqués"""
+    wanted = indexed_field_names(form)
+    if set(wanted) == set(form.indexed_fields):
+        return
+    added = [name for name in wanted if name not in form.indexed_fields]
+    if not added:
+        reindex_form(form, fields=[])
+    elif Entry.objects.filter(form=form).count() <= settings.ENTRY_INDEX_INLINE_LIMIT:
+        reindex_form(form, fields=added)
+    else:
+        # Retirer tout de suite les champs démarqués, les nouveaux attendent la commande
+        complete = [name for name in form.indexed_fields if name in wanted]
+        EntryFieldValue.objects.filter(form=form).exclude(field__in=wanted).delete()
+        Form.objects.filter(pk=form.pk).update(indexed_fields=complete)
+        form.indexed_fields = complete
+        logger.warning(
+            f"Formulaire {form.pk} : champs {added} à indexer, "
+            f"lancer python manage.py reindex_entry_fields --form {form.pk}"
+        )
+
+
+def filter_by_data(queryset, form, filters):
+    """Appliquer les filtres {champ: valeur} d'un formulaire"""
+    for field, value in filters.items():
+        if field in form.indexed_fields:
+            queryset = queryset.filter(pk__in=EntryFieldValue.objects.filter(
+                form=form, field=field, value=normalize(value),
+            ).values('entry_id'))
+        else:
+            # Champ non indexé (ou index en cours de construction) : parcours de data
+            alias = f'data_{len(queryset.query.annotations)}'
+            # Cast : comparaison en texte (sinon la valeur est interprétée comme du JSON)
+            queryset = queryset.alias(
+                **{alias: Cast(KeyTextTransform(field, 'data'), TextField())}
+            ).filter(**{alias: value})
+    return queryset
@@ -0,0 +1,74 @@
+"""
+Insertion en masse d'entrées (POST /api/entries/bulk/)
+
+- Formulaires chargés en une requête, validateurs compilés (forms.validation)
+- Lignes valides insérées par bulk_create(batch_size=ENTRY_BULK_BATCH_SIZE)
+  dans une seule transaction
+- Champs indexés extraits dans la même transaction (entries.indexing)
+- Statut par ligne : created (avec id) ou invalid (avec erreurs)
+- atomic=True : aucune insertion si une ligne est invalide
+"""
+from django.conf import settings
+from django.db import transaction
+from forms.models import Form
+from forms.validation import get_validator
+from . import stats
+from .indexing import index_entries
+from .models import Entry
+from .parsers import InvalidLine
+
+
+def _form_id(row, default_form_id):
+    form_id = row.get('form', default_form_id)
+    if isinstance(form_id, bool) or not isinstance(form_id, int):
+        return None
+    return form_id
+
+
+def validate_rows(rows, default_form_id=None):
+    """Retourne (entrées à créer avec leur index, statuts des lignes rejetées)"""
+    form_ids = {
+        _form_id(row, default_form_id) for row in rows
+        if isinstance(row, dict)
+    }
+    forms = Form.objects.order_by().in_bulk(form_ids - {None})
+    validators = {}
+
+    entries, rejected = [], []
+    for index, row in enumerate(rows):
+        if isinstance(row, InvalidLine):
+            rejected.append({'index': index, 'status': 'invalid', 'errors': {'non_field_errors': [row.error]}})
+            continue
+        if not isinstance(row, dict) or 'data' not in row:
+            rejected.append({'index': index, 'status': 'invalid', 'errors': {'data': ["Ce champ est obligatoire"]}})
+            continue
+        form = forms.get(_form_id(row, default_form_id))
+        if form is None:
+            rejected.append({'index': index, 'status': 'invalid', 'errors': {'form': ["Formulaire introuvable"]}})
+            continue
+
+        if form.pk not in validators:
+            validators[form.pk] = get_validator(form)
+        errors = validators[form.pk].validate(row['data'])
+        if errors:
+            rejected.append({'index': index, 'status': 'invalid', 'errors': errors})
+        else:
+            entries.append((index, Entry(form=form, data=row['data'])))
+    return entries, rejected
+
+
+def ingest(rows, default_form_id=None, atomic=False):
+    """Valider puis insérer les lignes, retourne les statuts triés par index"""
+    entries, rejected = validate_rows(rows, default_form_id)
+    if atomic and rejected:
+        return rejected, 0
+
+    created = []
+    if entries:
+        with transaction.atomic():
+            Entry.objects.bulk_create([entry for _, entry in entries], batch_size=settings.ENTRY_BULK_BATCH_SIZE)
+            # bulk_create ne déclenche pas les signaux
+            index_entries([entry for _, entry in entries])
+            stats.record_entries([entry for _, entry in entries])
+        created = [{'index': index, 'status': 'created', 'id': entry.pk} for index, entry in entries]
+    return sorted(created + rejected, key=lambda result: result['index']), len(created)
@@ -0,0 +1,64 @@
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from entries.export import EXPORT_FORMATS
+from entries.models import Entry
+from forms.models import Form
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesurer l'export en flux des entrées d'un formulaire : délai avant le premier "
+        "morceau et avant les premières lignes, débit et mémoire maximale. "
+        "Les données de test sont créées dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        form = Form.objects.create(title='Campagne', fields=[
+            {'name': 'nom', 'type': 'text'},
+            {'name': 'email', 'type': 'email'},
+            {'name': 'age', 'type': 'integer'},
+            {'name': 'options', 'type': 'multiselect', 'options': ['wifi', 'parking']},
+        ])
+        Entry.objects.bulk_create(
+            [
+                Entry(form=form, data={'nom': f'Client {i}', 'email': f'client{i}@bench.sn', 'age': i % 90, 'options': ['wifi']})
+                for i in range(options['entries'])
+            ],
+            batch_size=5000,
+        )
+
+        self.stdout.write(f"{options['entries']} entrées")
+        self.stdout.write(
+            f"{'format':<8}{'1er morceau ms':>16}{'1res lignes ms':>16}{'lignes/s':>12}{'Mo':>8}{'mémoire max Mo':>16}"
+        )
+        for name, (_, stream) in EXPORT_FORMATS.items():
+            tracemalloc.start()
+            start = time.perf_counter()
+            chunks = stream(form)
+            first = None
+            size = 0
+            first_rows = None
+            for chunk in chunks:
+                if first is None:
+                    first = time.perf_counter() - start
+                elif first_rows is None:
+                    first_rows = time.perf_counter() - start
+                size += len(chunk.encode())
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            first_rows = first_rows or first
+            self.stdout.write(
+                f"{name:<8}{first * 1000:>16.1f}{first_rows * 1000:>16.1f}"
+                f"{options['entries'] / elapsed:>12.0f}{size / 1e6:>8.1f}{peak / 1e6:>16.1f}"
+            )
@@ -0,0 +1,76 @@
+import json
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from entries.views import EntryViewSet
+from forms.models import Form
+
+FIELDS = [
+    {'name': 'nom', 'type': 'text', 'required': True, 'max_length': 100},
+    {'name': 'email', 'type': 'email', 'required': True},
+    {'name': 'age', 'type': 'integer', 'min': 0},
+    {'name': 'chambre', 'type': 'select', 'options': ['simple', 'double', 'suite']},
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Comparer les entrées créées par seconde : POST /api/entries/ ligne par ligne "
+        "contre POST /api/entries/bulk/ (JSON et NDJSON). "
+        "Les données de test sont créées dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--entries', type=int, default=5000)
+        parser.add_argument('--batch', type=int, default=1000, help="Entrées par requête bulk")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        user = get_user_model().objects.create_user(username='bench-entries', email='bench-entries@bench.sn', password='x')
+        form = Form.objects.create(title='Campagne', fields=FIELDS)
+        rows = [
+            {'form': form.pk, 'data': {'nom': f'Client {i}', 'email': f'client{i}@bench.sn', 'age': 20 + i % 50, 'chambre': 'double'}}
+            for i in range(options['entries'])
+        ]
+        batches = [rows[i:i + options['batch']] for i in range(0, len(rows), options['batch'])]
+        factory = APIRequestFactory()
+
+        def call(view, request):
+            force_authenticate(request, user=user)
+            response = view(request)
+            if response.status_code != 201:
+                raise ValueError(f"Réponse {response.status_code} : {response.data}")
+
+        single = EntryViewSet.as_view({'post': 'create'})
+        # Comme le routeur : options de l'action (parser_classes)
+        bulk = EntryViewSet.as_view({'post': 'bulk'}, **EntryViewSet.bulk.kwargs)
+        scenarios = (
+            ('une entrée par requête', lambda: [
+                call(single, factory.post('/api/entries/', row, format='json')) for row in rows
+            ]),
+            ('bulk JSON', lambda: [
+                call(bulk, factory.post('/api/entries/bulk/', batch, format='json')) for batch in batches
+            ]),
+            ('bulk NDJSON', lambda: [
+                call(bulk, factory.post(
+                    '/api/entries/bulk/',
+                    '\n'.join(json.dumps(row) for row in batch),
+                    content_type='application/x-ndjson',
+                ))
+                for batch in batches
+            ]),
+        )
+
+        self.stdout.write(f"{len(rows)} entrées, lots de {options['batch']}")
+        self.stdout.write(f"{'chemin':<26}{'secondes':>10}{'entrées/s':>12}")
+        for label, scenario in scenarios:
+            start = time.perf_counter()
+            scenario()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{label:<26}{elapsed:>10.2f}{len(rows) / elapsed:>12.0f}")
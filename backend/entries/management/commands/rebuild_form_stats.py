@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from entries import stats
+from forms.models import Form
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculer les statistiques des réponses (FormStats) à partir des entrées, "
+        "pour un formulaire ou pour tous. Nécessaire quand un formulaire est marqué "
+        "« stale » après une modification de sa définition."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--form', type=int, help="Identifiant du formulaire (défaut : tous)")
+        parser.add_argument('--stale', action='store_true', help="Seulement les formulaires marqués stale")
+        parser.add_argument('--no-numpy', action='store_true', help="Réductions en Python pur même si NumPy est installé")
+
+    def handle(self, *args, **options):
+        forms = Form.objects.all()
+        if options['form'] is not None:
+            forms = forms.filter(pk=options['form'])
+            if not forms.exists():
+                raise CommandError(f"Formulaire {options['form']} introuvable")
+        if options['stale']:
+            forms = forms.filter(stats__stale=True)
+        
+        use_numpy = not options['no_numpy']
+        if use_numpy and stats.numpy is None:
+            self.stdout.write("NumPy non installé : réductions en Python pur")
+        for form in forms.iterator():
+            started = time.perf_counter()
+            form_stats = stats.rebuild(form, use_numpy=use_numpy)
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(f"Formulaire {form.pk} : {form_stats.entry_count} entrée(s) en {elapsed:.1f} ms")
+        self.stdout.write(self.style.SUCCESS("Statistiques reconstruites"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from entries.indexing import indexed_field_names, reindex_form
+from forms.models import Form
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruire l'index des champs marqués « indexed » (EntryFieldValue), "
+        "pour un formulaire ou pour tous. Nécessaire après avoir marqué un champ "
+        "d'un formulaire de plus de ENTRY_INDEX_INLINE_LIMIT entrées."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--form', type=int, help="Identifiant du formulaire (défaut : tous)")
+
+    def handle(self, *args, **options):
+        forms = Form.objects.all()
+        if options['form'] is not None:
+            forms = forms.filter(pk=options['form'])
+            if not forms.exists():
+                raise CommandError(f"Formulaire {options['form']} introuvable")
+        
+        for form in forms.iterator():
+            if not indexed_field_names(form) and not form.indexed_fields:
+                continue
+            reindex_form(form)
+            self.stdout.write(f"Formulaire {form.pk} : {', '.join(form.indexed_fields) or 'aucun champ'} indexé(s)")
+        self.stdout.write(self.style.SUCCESS("Réindexation terminée"))
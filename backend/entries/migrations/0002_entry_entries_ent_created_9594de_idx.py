@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0001_initial'),
+        ('forms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['-created_at', 'id'], name='entries_ent_created_9594de_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0002_entry_entries_ent_created_9594de_idx'),
+        ('forms', '0002_form_indexed_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EntryFieldValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=100)),
+                ('value', models.CharField(max_length=255)),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='field_values', to='entries.entry')),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='forms.form')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['form', 'field', 'value'], name='entries_ent_form_id_aa95dc_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('entries', '0003_entryfieldvalue'),
+        ('forms', '0002_form_indexed_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FormStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('fields', models.JSONField(blank=True, default=list)),
+                ('stale', models.BooleanField(default=False)),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('form', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='forms.form')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FormDailyCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='forms.form')),
+            ],
+            options={
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('form', 'day'), name='unique_form_daily_count')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FormFieldStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(max_length=100)),
+                ('answered', models.PositiveIntegerField(default=0)),
+                ('choices', models.JSONField(blank=True, default=dict)),
+                ('numeric_count', models.PositiveIntegerField(default=0)),
+                ('numeric_sum', models.FloatField(default=0)),
+                ('minimum', models.FloatField(blank=True, null=True)),
+                ('maximum', models.FloatField(blank=True, null=True)),
+                ('form', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='forms.form')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('form', 'field'), name='unique_form_field_stats')],
+            },
+        ),
+    ]
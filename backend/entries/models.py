@@ -9,6 +9,87 @@ class Entry(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Pagination par curseur (keyset)
+            models.Index(fields=['-created_at', 'id']),
+        ]
 
     def __str__(self):
         return f"Entry for {self.form.title}"
+
+
+class EntryFieldValue(models.Model):
+    """
+    Valeur extraite d'un champ indexé d'une entrée (voir entries.indexing)
+    Une ligne par valeur (plusieurs pour un multiselect), en texte normalisé.
+    """
+    MAX_VALUE_LENGTH = 255
+
+    entry = models.ForeignKey(Entry, on_delete=models.CASCADE, related_name='field_values')
+    # Dénormalisé pour l'index ; couvert par (form, field, value)
+    form = models.ForeignKey(Form, on_delete=models.CASCADE, related_name='+', db_index=False)
+    field = models.CharField(max_length=100)
+    value = models.CharField(max_length=MAX_VALUE_LENGTH)
+
+    class Meta:
+        indexes = [
+            # ?form=…&data__<champ>=<valeur>
+            models.Index(fields=['form', 'field', 'value']),
+        ]
+
+    def __str__(self):
+        return f"{self.field}={self.value}"
+
+
+class FormStats(models.Model):
+    """
+    Statistiques d'un formulaire, tenues à jour à chaque entrée créée ou
+    supprimée (entries.stats) et reconstruites par rebuild_form_stats
+    """
+    form = models.OneToOneField(Form, on_delete=models.CASCADE, related_name='stats')
+    entry_count = models.PositiveIntegerField(default=0)
+    # Champs agrégés ([nom, nature]) lors de la dernière reconstruction
+    fields = models.JSONField(default=list, blank=True)
+    # Définition modifiée depuis : les nouveaux champs sont incomplets
+    stale = models.BooleanField(default=False)
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Stats for {self.form_id}"
+
+
+class FormFieldStats(models.Model):
+    """Agrégats d'un champ : réponses, choix (select) ou min / max / somme (nombres)"""
+    form = models.ForeignKey(Form, on_delete=models.CASCADE, related_name='+', db_index=False)
+    field = models.CharField(max_length=100)
+    answered = models.PositiveIntegerField(default=0)
+    choices = models.JSONField(default=dict, blank=True)
+    numeric_count = models.PositiveIntegerField(default=0)
+    numeric_sum = models.FloatField(default=0)
+    minimum = models.FloatField(null=True, blank=True)
+    maximum = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['form', 'field'], name='unique_form_field_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.form_id}:{self.field}"
+
+
+class FormDailyCount(models.Model):
+    """Nombre d'entrées d'un formulaire par jour de création"""
+    form = models.ForeignKey(Form, on_delete=models.CASCADE, related_name='+', db_index=False)
+    day = models.DateField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['day']
+        constraints = [
+            models.UniqueConstraint(fields=['form', 'day'], name='unique_form_daily_count'),
+        ]
+
+    def __str__(self):
+        return f"{self.form_id}:{self.day}={self.count}"
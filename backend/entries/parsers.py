@@ -0,0 +1,36 @@
+import json
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class InvalidLine:
+    """Ligne NDJSON illisible, signalée dans le statut de sa ligne"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+class NDJSONParser(BaseParser):
+    """
+    JSON délimité par des retours à la ligne (un objet par ligne)
+    Une ligne illisible ne fait pas échouer les autres : elle devient un
+    InvalidLine. Les lignes vides sont ignorées.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        rows = []
+        try:
+            for line in stream:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    rows.append(json.loads(line.decode(encoding)))
+                except ValueError as exc:
+                    rows.append(InvalidLine(f"JSON invalide : {exc}"))
+        except UnicodeDecodeError as exc:
+            raise ParseError(f"Encodage invalide : {exc}")
+        return rows
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from forms.validation import get_validator
 from .models import Entry
 
 class EntrySerializer(serializers.ModelSerializer):
@@ -6,3 +7,12 @@ class EntrySerializer(serializers.ModelSerializer):
         model = Entry
         fields = ('id', 'form', 'data', 'created_at', 'updated_at')
         read_only_fields = ('id', 'created_at', 'updated_at')
+
+    def validate(self, attrs):
+        """Vérifier les données avec le validateur compilé du formulaire"""
+        form = attrs.get('form') or self.instance.form
+        data = attrs.get('data', self.instance.data if self.instance else None)
+        errors = get_validator(form).validate(data)
+        if errors:
+            raise serializers.ValidationError({'data': errors})
+        return attrs
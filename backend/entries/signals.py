@@ -0,0 +1,61 @@
+from contextvars import ContextVar
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from config.bulk import in_bulk_operation
+from forms.models import Form
+from . import stats
+from .indexing import indexed_field_names, index_entries, reindex_entry, sync_form
+from .models import Entry
+
+# Formulaires en cours de suppression : leurs entrées partent en cascade
+# avec les statistiques, inutile (et impossible) de les décompter
+_deleting_forms = ContextVar('deleting_forms', default=frozenset())
+
+
+@receiver(post_save, sender=Entry)
+def index_entry(sender, instance, created, **kwargs):
+    if in_bulk_operation(sender) or not indexed_field_names(instance.form):
+        return
+    if created:
+        index_entries([instance])
+    else:
+        reindex_entry(instance)
+
+
+@receiver(pre_save, sender=Entry)
+def remember_entry_data(sender, instance, **kwargs):
+    # Anciennes réponses, retirées des statistiques après la modification
+    if instance.pk and not in_bulk_operation(sender):
+        instance._stats_old_data = Entry.objects.filter(pk=instance.pk).values_list('data', flat=True).first()
+
+
+@receiver(post_save, sender=Entry)
+def count_entry(sender, instance, created, **kwargs):
+    if in_bulk_operation(sender):
+        return
+    if created:
+        stats.record_entries([instance])
+    elif getattr(instance, '_stats_old_data', None) != instance.data:
+        stats.record_change(instance, instance._stats_old_data)
+
+
+@receiver(post_delete, sender=Entry)
+def uncount_entry(sender, instance, **kwargs):
+    if not in_bulk_operation(sender) and instance.form_id not in _deleting_forms.get():
+        stats.record_entries([instance], sign=-1)
+
+
+@receiver(pre_delete, sender=Form)
+def mark_form_deleting(sender, instance, **kwargs):
+    _deleting_forms.set(_deleting_forms.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Form)
+def unmark_form_deleting(sender, instance, **kwargs):
+    _deleting_forms.set(_deleting_forms.get() - {instance.pk})
+
+
+@receiver(post_save, sender=Form)
+def sync_indexed_fields(sender, instance, **kwargs):
+    sync_form(instance)
+    stats.sync_form(instance)
@@ -0,0 +1,282 @@
+"""
+Statistiques des réponses d'un formulaire, calculées au fil de l'eau
+
+- Par champ (nature déduite du type dans Form.fields) :
+  - choice (select, multiselect, boolean) : nombre de réponses par choix
+  - numeric (number, integer) : nombre, somme, min, max (moyenne = somme / nombre)
+  - text (autres types) : nombre de réponses
+- Par jour : nombre d'entrées créées
+
+Chaque création ou suppression d'entrée (signaux, insertion en masse)
+applique un delta sous verrou de la ligne FormStats du formulaire : la
+lecture (GET /api/forms/{id}/stats/) ne parcourt jamais les entrées.
+Seule la suppression d'une valeur égale au min ou au max relit ce champ
+dans les entrées du formulaire.
+
+rebuild() recalcule tout à partir des entrées (commande rebuild_form_stats),
+avec NumPy pour les réductions numériques s'il est installé. Comme pour
+les compteurs du dashboard, une reconstruction pendant des écritures peut
+laisser un léger écart, corrigé par la reconstruction suivante.
+"""
+import math
+from collections import Counter, defaultdict
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.fields.json import KeyTextTransform
+from django.utils import timezone
+from .indexing import normalize
+from .models import Entry, FormDailyCount, FormFieldStats, FormStats
+
+try:
+    import numpy
+except ImportError:  # optionnel : réductions en Python pur
+    numpy = None
+
+CHOICE_TYPES = {'select', 'multiselect', 'boolean'}
+NUMERIC_TYPES = {'number', 'integer'}
+
+
+def stats_fields(form):
+    """[(nom, nature)] des champs de la définition"""
+    fields = []
+    for definition in form.fields:
+        if not isinstance(definition, dict) or not isinstance(definition.get('name'), str):
+            continue
+        field_type = definition.get('type', 'text')
+        if field_type in CHOICE_TYPES:
+            kind = 'choice'
+        elif field_type in NUMERIC_TYPES:
+            kind = 'numeric'
+        else:
+            kind = 'text'
+        fields.append((definition['name'], kind))
+    return fields
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+class FieldDelta:
+    """Variation des agrégats d'un champ"""
+
+    __slots__ = ('answered', 'choices', 'numbers', 'removed')
+
+    def __init__(self):
+        self.answered = 0
+        self.choices = Counter()
+        # Valeurs numériques ajoutées / retirées
+        self.numbers = []
+        self.removed = []
+
+
+class StatsDelta:
+    """Variation des statistiques d'un formulaire pour un lot d'entrées"""
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.entries = 0
+        self.days = Counter()
+        self.by_field = defaultdict(FieldDelta)
+
+    def add(self, created_at, data, sign=1):
+        self.entries += sign
+        self.days[timezone.localdate(created_at)] += sign
+        if not isinstance(data, dict):
+            return
+        for name, kind in self.fields:
+            value = data.get(name)
+            if value is None or value == '' or value == []:
+                continue
+            delta = self.by_field[name]
+            delta.answered += sign
+            if kind == 'choice':
+                for item in value if isinstance(value, list) else (value,):
+                    item = normalize(item)
+                    if item is not None:
+                        delta.choices[item] += sign
+            elif kind == 'numeric' and is_number(value):
+                (delta.numbers if sign > 0 else delta.removed).append(float(value))
+
+
+def reduce_numbers(values, use_numpy=True):
+    """(nombre, somme, min, max) d'une liste de valeurs"""
+    if not values:
+        return 0, 0.0, None, None
+    if use_numpy and numpy is not None and len(values) >= settings.FORM_STATS_NUMPY_THRESHOLD:
+        array = numpy.fromiter(values, dtype=numpy.float64, count=len(values))
+        return len(values), float(array.sum()), float(array.min()), float(array.max())
+    return len(values), math.fsum(values), min(values), max(values)
+
+
+def parse_number(text):
+    try:
+        value = float(text)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def numeric_bounds(form, field):
+    """Relire le min et le max d'un champ dans les entrées du formulaire"""
+    # KeyTextTransform plutôt que data__<champ> : un nom peut contenir "__"
+    texts = Entry.objects.filter(form=form).annotate(value=KeyTextTransform(field, 'data')).values_list(
+        'value', flat=True
+    )
+    values = [
+        value
+        for value in map(parse_number, texts.iterator(chunk_size=settings.ENTRY_EXPORT_CHUNK_SIZE))
+        if value is not None
+    ]
+    return (min(values), max(values)) if values else (None, None)
+
+
+def apply_field_delta(row, delta, form):
+    row.answered = max(0, row.answered + delta.answered)
+    if delta.choices:
+        choices = Counter(row.choices)
+        choices.update(delta.choices)
+        row.choices = {choice: count for choice, count in choices.items() if count > 0}
+
+    added_count, added_sum, added_min, added_max = reduce_numbers(delta.numbers)
+    removed_count, removed_sum, _, _ = reduce_numbers(delta.removed)
+    row.numeric_count = max(0, row.numeric_count + added_count - removed_count)
+    row.numeric_sum += added_sum - removed_sum
+    if row.numeric_count == 0:
+        row.numeric_sum, row.minimum, row.maximum = 0.0, None, None
+    elif any(value in (row.minimum, row.maximum) for value in delta.removed):
+        # Une borne a été retirée : la relire (les ajouts sont déjà enregistrés)
+        row.minimum, row.maximum = numeric_bounds(form, row.field)
+    elif added_count:
+        row.minimum = added_min if row.minimum is None else min(row.minimum, added_min)
+        row.maximum = added_max if row.maximum is None else max(row.maximum, added_max)
+
+
+def apply(form, delta):
+    """Enregistrer un delta (verrou de la ligne FormStats du formulaire)"""
+    if not delta.entries and not delta.by_field:
+        return
+    with transaction.atomic():
+        stats, _ = FormStats.objects.select_for_update().get_or_create(
+            form=form, defaults={'fields': [list(field) for field in delta.fields]}
+        )
+        stats.entry_count = max(0, stats.entry_count + delta.entries)
+        stats.save(update_fields=['entry_count', 'updated_at'])
+
+        for day, count in delta.days.items():
+            if not count:
+                continue
+            if not FormDailyCount.objects.filter(form=form, day=day).update(count=F('count') + count) and count > 0:
+                FormDailyCount.objects.create(form=form, day=day, count=count)
+        if any(count < 0 for count in delta.days.values()):
+            FormDailyCount.objects.filter(form=form, count__lte=0).delete()
+
+        rows = {row.field: row for row in FormFieldStats.objects.filter(form=form, field__in=list(delta.by_field))}
+        missing = [FormFieldStats(form=form, field=name) for name in delta.by_field if name not in rows]
+        for row in FormFieldStats.objects.bulk_create(missing):
+            rows[row.field] = row
+        for name, field_delta in delta.by_field.items():
+            apply_field_delta(rows[name], field_delta, form)
+        FormFieldStats.objects.bulk_update(
+            rows.values(), ['answered', 'choices', 'numeric_count', 'numeric_sum', 'minimum', 'maximum']
+        )
+
+
+def record_entries(entries, sign=1):
+    """Appliquer la création (sign=1) ou la suppression (sign=-1) d'entrées"""
+    deltas = {}
+    for entry in entries:
+        if entry.form_id not in deltas:
+            deltas[entry.form_id] = (entry.form, StatsDelta(stats_fields(entry.form)))
+        deltas[entry.form_id][1].add(entry.created_at, entry.data, sign)
+    for form, delta in deltas.values():
+        apply(form, delta)
+
+
+def record_change(entry, old_data):
+    """Entrée modifiée : retirer l'ancienne réponse, ajouter la nouvelle"""
+    delta = StatsDelta(stats_fields(entry.form))
+    delta.add(entry.created_at, old_data, -1)
+    delta.add(entry.created_at, entry.data, 1)
+    apply(entry.form, delta)
+
+
+def rebuild(form, use_numpy=True):
+    """Recalculer toutes les statistiques d'un formulaire à partir de ses entrées"""
+    fields = stats_fields(form)
+    delta = StatsDelta(fields)
+    with transaction.atomic():
+        stats, _ = FormStats.objects.select_for_update().get_or_create(form=form)
+        entries = Entry.objects.filter(form=form).values_list('created_at', 'data').iterator(
+            chunk_size=settings.ENTRY_EXPORT_CHUNK_SIZE
+        )
+        for created_at, data in entries:
+            delta.add(created_at, data)
+
+        FormDailyCount.objects.filter(form=form).delete()
+        FormDailyCount.objects.bulk_create(
+            [FormDailyCount(form=form, day=day, count=count) for day, count in sorted(delta.days.items())],
+            batch_size=settings.ENTRY_BULK_BATCH_SIZE,
+        )
+        FormFieldStats.objects.filter(form=form).delete()
+        rows = []
+        for name, field_delta in delta.by_field.items():
+            count, total, minimum, maximum = reduce_numbers(field_delta.numbers, use_numpy)
+            rows.append(FormFieldStats(
+                form=form, field=name, answered=field_delta.answered, choices=dict(field_delta.choices),
+                numeric_count=count, numeric_sum=total, minimum=minimum, maximum=maximum,
+            ))
+        FormFieldStats.objects.bulk_create(rows)
+
+        stats.entry_count = delta.entries
+        stats.fields = [list(field) for field in fields]
+        stats.stale = False
+        stats.rebuilt_at = timezone.now()
+        stats.save()
+    return stats
+
+
+def sync_form(form):
+    """Après une modification de la définition : reconstruire si les champs agrégés changent"""
+    fields = [list(field) for field in stats_fields(form)]
+    stats = FormStats.objects.filter(form=form).first()
+    if stats is None or stats.fields == fields:
+        return
+    if stats.entry_count <= settings.ENTRY_INDEX_INLINE_LIMIT:
+        rebuild(form)
+    else:
+        FormStats.objects.filter(pk=stats.pk).update(stale=True)
+
+
+def form_stats(form, days=None):
+    """Statistiques lues dans les tables d'agrégats (aucun parcours des entrées)"""
+    stats = FormStats.objects.filter(form=form).first()
+    kinds = dict(stats_fields(form))
+    rows = {row.field: row for row in FormFieldStats.objects.filter(form=form)}
+    daily = FormDailyCount.objects.filter(form=form).order_by('-day')
+    if days:
+        daily = daily[:days]
+
+    fields = {}
+    for name, kind in kinds.items():
+        row = rows.get(name) or FormFieldStats(field=name)
+        data = {'type': kind, 'answered': row.answered}
+        if kind == 'choice':
+            data['choices'] = dict(sorted(row.choices.items(), key=lambda item: -item[1]))
+        elif kind == 'numeric':
+            data.update({
+                'count': row.numeric_count,
+                'min': row.minimum,
+                'max': row.maximum,
+                'mean': row.numeric_sum / row.numeric_count if row.numeric_count else None,
+            })
+        fields[name] = data
+    return {
+        'form': form.pk,
+        'entries': stats.entry_count if stats else 0,
+        'stale': stats.stale if stats else False,
+        'rebuilt_at': stats.rebuilt_at if stats else None,
+        'fields': fields,
+        'per_day': [{'day': row.day, 'count': row.count} for row in reversed(list(daily))],
+    }
@@ -0,0 +1,245 @@
+import io
+import json
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from forms.models import Form
+from .models import Entry, EntryFieldValue, FormStats
+
+User = get_user_model()
+
+
+class EntryBulkIngestTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123'))
+        self.form = Form.objects.create(title='Campagne', fields=[
+            {'name': 'email', 'type': 'email', 'required': True},
+            {'name': 'age', 'type': 'integer', 'min': 18},
+        ])
+
+    def test_json_array_with_per_row_status(self):
+        rows = [
+            {'form': self.form.pk, 'data': {'email': 'a@example.com', 'age': 30}},
+            {'form': self.form.pk, 'data': {'email': 'pas-un-email'}},
+            {'form': 999999, 'data': {}},
+            {'form': self.form.pk, 'data': {'email': 'b@example.com'}},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post('/api/entries/bulk/', rows, format='json')
+        # Formulaires (in_bulk) puis un seul INSERT d'entrées
+        statements = [query['sql'].split()[0] for query in queries if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(statements[:2], ['SELECT', 'INSERT'])
+        self.assertEqual(sum('"entries_entry"' in query['sql'] for query in queries), 1)
+        # Statistiques (entries.stats) : un delta par formulaire, pas par ligne
+        self.assertLessEqual(len(statements) - 2, 8)
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual((response.data['created'], response.data['rejected']), (2, 2))
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'invalid', 'invalid', 'created'])
+        self.assertIn('email', response.data['results'][1]['errors'])
+        self.assertIn('form', response.data['results'][2]['errors'])
+        self.assertEqual(Entry.objects.get(pk=response.data['results'][0]['id']).data['age'], 30)
+
+    def test_ndjson_with_default_form(self):
+        body = '\n'.join([
+            json.dumps({'data': {'email': 'a@example.com'}}),
+            '{pas du json',
+            '',
+            json.dumps({'data': {'email': 'b@example.com'}}),
+        ])
+        response = self.client.post(
+            f'/api/entries/bulk/?form={self.form.pk}', body, content_type='application/x-ndjson'
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([row['status'] for row in response.data['results']], ['created', 'invalid', 'created'])
+        self.assertEqual(Entry.objects.filter(form=self.form).count(), 2)
+
+    def test_atomic(self):
+        rows = [
+            {'form': self.form.pk, 'data': {'email': 'a@example.com'}},
+            {'form': self.form.pk, 'data': {'age': 10}},
+        ]
+        response = self.client.post('/api/entries/bulk/?atomic=1', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Entry.objects.exists())
+
+        response = self.client.post('/api/entries/bulk/?atomic=1', rows[:1], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class EntryFieldIndexTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123'))
+        self.form = Form.objects.create(title='Support', fields=[
+            {'name': 'email', 'type': 'email', 'indexed': True},
+            {'name': 'options', 'type': 'multiselect', 'options': ['wifi', 'parking'], 'indexed': True},
+            {'name': 'ville', 'type': 'text'},
+        ])
+
+    def list(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/entries/', {'form': self.form.pk, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        return sorted(entry['data'].get('email', '') for entry in results), queries
+
+    def test_filter_uses_side_table(self):
+        self.form.refresh_from_db()
+        self.assertEqual(self.form.indexed_fields, ['email', 'options'])
+        Entry.objects.create(form=self.form, data={'email': 'a@example.com', 'options': ['wifi'], 'ville': 'Dakar'})
+        self.client.post('/api/entries/bulk/', [
+            {'form': self.form.pk, 'data': {'email': 'b@example.com', 'options': ['wifi', 'parking'], 'ville': 'Thiès'}},
+        ], format='json')
+
+        emails, queries = self.list(data__email='b@example.com')
+        self.assertEqual(emails, ['b@example.com'])
+        self.assertTrue(any('entries_entryfieldvalue' in query['sql'] for query in queries))
+        self.assertEqual(self.list(data__options='wifi')[0], ['a@example.com', 'b@example.com'])
+
+        # Champ non indexé : filtre direct sur data
+        emails, queries = self.list(data__ville='Dakar')
+        self.assertEqual(emails, ['a@example.com'])
+
+        # Modification d'une entrée : index mis à jour
+        entry = Entry.objects.get(data__email='a@example.com')
+        entry.data = {'email': 'c@example.com'}
+        entry.save()
+        self.assertEqual(self.list(data__email='a@example.com')[0], [])
+        self.assertEqual(self.list(data__email='c@example.com')[0], ['c@example.com'])
+
+    def test_marking_field_reindexes_existing_entries(self):
+        Entry.objects.create(form=self.form, data={'email': 'a@example.com', 'ville': 'Dakar'})
+        self.form.fields[2]['indexed'] = True
+        self.form.save()
+        self.form.refresh_from_db()
+        self.assertIn('ville', self.form.indexed_fields)
+        self.assertTrue(EntryFieldValue.objects.filter(field='ville', value='Dakar').exists())
+
+        self.form.fields[0]['indexed'] = False
+        self.form.save()
+        self.assertFalse(EntryFieldValue.objects.filter(form=self.form, field='email').exists())
+
+    @override_settings(ENTRY_INDEX_INLINE_LIMIT=0)
+    def test_large_form_waits_for_reindex_command(self):
+        Entry.objects.create(form=self.form, data={'email': 'a@example.com', 'ville': 'Dakar'})
+        self.form.fields[2]['indexed'] = True
+        with self.assertLogs('entries.indexing', 'WARNING'):
+            self.form.save()
+        self.form.refresh_from_db()
+        self.assertNotIn('ville', self.form.indexed_fields)
+        # Toujours correct, sans index, en attendant la commande
+        self.assertEqual(self.list(data__ville='Dakar')[0], ['a@example.com'])
+
+        call_command('reindex_entry_fields', form=self.form.pk, stdout=io.StringIO())
+        self.form.refresh_from_db()
+        self.assertIn('ville', self.form.indexed_fields)
+
+    def test_data_filter_requires_form(self):
+        response = self.client.get('/api/entries/', {'data__email': 'a@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class FormStatsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123'))
+        self.form = Form.objects.create(title='Satisfaction', fields=[
+            {'name': 'chambre', 'type': 'select', 'options': ['simple', 'double']},
+            {'name': 'services', 'type': 'multiselect', 'options': ['wifi', 'parking']},
+            {'name': 'note', 'type': 'integer'},
+            {'name': 'commentaire', 'type': 'text'},
+        ])
+
+    def stats(self, **params):
+        response = self.client.get(f'/api/forms/{self.form.pk}/stats/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_stats_follow_inserts_and_deletes(self):
+        first = Entry.objects.create(form=self.form, data={'chambre': 'simple', 'services': ['wifi'], 'note': 2})
+        self.client.post('/api/entries/bulk/', [
+            {'form': self.form.pk, 'data': {'chambre': 'double', 'services': ['wifi', 'parking'], 'note': 5}},
+            {'form': self.form.pk, 'data': {'chambre': 'simple', 'note': 4, 'commentaire': 'Bien'}},
+        ], format='json')
+
+        data = self.stats()
+        self.assertEqual(data['entries'], 3)
+        self.assertEqual(data['fields']['chambre']['choices'], {'simple': 2, 'double': 1})
+        self.assertEqual(data['fields']['services']['choices'], {'wifi': 2, 'parking': 1})
+        self.assertEqual(data['fields']['note'], {'type': 'numeric', 'answered': 3, 'count': 3, 'min': 2, 'max': 5, 'mean': 11 / 3})
+        self.assertEqual(data['fields']['commentaire'], {'type': 'text', 'answered': 1})
+        self.assertEqual(sum(day['count'] for day in data['per_day']), 3)
+
+        # Suppression du minimum : borne relue dans les entrées restantes
+        first.delete()
+        note = self.stats()['fields']['note']
+        self.assertEqual((note['count'], note['min'], note['max'], note['mean']), (2, 4, 5, 4.5))
+        self.assertEqual(self.stats()['fields']['chambre']['choices'], {'simple': 1, 'double': 1})
+
+        # Modification : ancienne réponse retirée
+        entry = Entry.objects.get(data__note=5)
+        entry.data = {'chambre': 'simple', 'note': 3}
+        entry.save()
+        data = self.stats()
+        self.assertEqual(data['fields']['chambre']['choices'], {'simple': 2})
+        self.assertEqual((data['fields']['note']['min'], data['fields']['note']['max']), (3, 4))
+
+    def test_stats_read_without_scanning_entries(self):
+        for note in range(20):
+            Entry.objects.create(form=self.form, data={'note': note})
+        with CaptureQueriesContext(connection) as queries:
+            self.stats(days=7)
+        self.assertFalse(any('entries_entry"' in query['sql'] for query in queries))
+        self.assertEqual(self.client.get(f'/api/forms/{self.form.pk}/stats/', {'days': 'x'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_rebuild_matches_incremental(self):
+        for index in range(10):
+            Entry.objects.create(form=self.form, data={'chambre': ['simple', 'double'][index % 2], 'note': index})
+        Entry.objects.filter(data__note__lt=3).delete()
+        incremental = self.stats()
+
+        call_command('rebuild_form_stats', form=self.form.pk, no_numpy=True, stdout=io.StringIO())
+        rebuilt = self.stats()
+        self.assertEqual(rebuilt['fields'], incremental['fields'])
+        self.assertEqual(rebuilt['per_day'], incremental['per_day'])
+        self.assertEqual(rebuilt['entries'], 7)
+        self.assertIsNotNone(rebuilt['rebuilt_at'])
+
+    @override_settings(ENTRY_INDEX_INLINE_LIMIT=0)
+    def test_definition_change_marks_large_form_stale(self):
+        Entry.objects.create(form=self.form, data={'note': 4})
+        self.form.fields.append({'name': 'ville', 'type': 'text'})
+        self.form.save()
+        self.assertTrue(FormStats.objects.get(form=self.form).stale)
+
+        call_command('rebuild_form_stats', stale=True, stdout=io.StringIO())
+        data = self.stats()
+        self.assertFalse(data['stale'])
+        self.assertEqual(data['fields']['ville'], {'type': 'text', 'answered': 0})
+
+    def test_deleting_form_with_entries(self):
+        Entry.objects.create(form=self.form, data={'chambre': 'simple', 'note': 4})
+        self.form.delete()
+        self.assertFalse(Entry.objects.exists())
+        self.assertFalse(FormStats.objects.exists())
+
+        # Entrées d'un autre formulaire toujours décomptées
+        other = Form.objects.create(title='Autre', fields=[{'name': 'note', 'type': 'integer'}])
+        entry = Entry.objects.create(form=other, data={'note': 1})
+        entry.delete()
+        self.assertEqual(FormStats.objects.get(form=other).entry_count, 0)
+
+    def test_bound_recomputed_for_field_name_with_double_underscore(self):
+        form = Form.objects.create(title='Notes', fields=[{'name': 'note__sur_20', 'type': 'number'}])
+        lowest = Entry.objects.create(form=form, data={'note__sur_20': 8})
+        Entry.objects.create(form=form, data={'note__sur_20': 12.5})
+        Entry.objects.create(form=form, data={'note__sur_20': 15})
+        lowest.delete()
+        response = self.client.get(f'/api/forms/{form.pk}/stats/')
+        note = response.data['fields']['note__sur_20']
+        self.assertEqual((note['count'], note['min'], note['max']), (2, 12.5, 15))
@@ -1,9 +1,81 @@
-from rest_framework import viewsets
+from django.conf import settings
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from forms.models import Form
+from .indexing import filter_by_data
+from .ingest import ingest
 from .models import Entry
+from .parsers import NDJSONParser
 from .serializers import EntrySerializer
 
 class EntryViewSet(viewsets.ModelViewSet):
     queryset = Entry.objects.all()
     serializer_class = EntrySerializer
     permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Filtres de la liste
+        - ?form=<id> : entrées d'un formulaire
+        - ?data__<champ>=<valeur> (avec form) : réponse exacte, via l'index
+          des champs marqués "indexed" (entries.indexing)
+        """
+        queryset = super().get_queryset()
+        if self.action != 'list':
+            return queryset
+        
+        params = self.request.query_params
+        form_id = params.get('form')
+        data_filters = {key[len('data__'):]: value for key, value in params.items() if key.startswith('data__')}
+        if form_id is None:
+            if data_filters:
+                raise ValidationError({'form': "Le paramètre form est requis pour filtrer sur data"})
+            return queryset
+        
+        try:
+            form = Form.objects.only('indexed_fields').get(pk=int(form_id))
+        except (ValueError, Form.DoesNotExist):
+            raise ValidationError({'form': "Formulaire introuvable"})
+        return filter_by_data(queryset.filter(form=form), form, data_filters)
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Créer plusieurs entrées en une requête
+        - Corps : tableau JSON ou NDJSON (application/x-ndjson) de {"form": id, "data": {...}}
+        - ?form=<id> : formulaire des lignes qui n'en précisent pas
+        - ?atomic=1 : tout ou rien
+        Réponse : statut de chaque ligne, 201 si tout est créé, 207 sinon
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            return Response({'error': "Un tableau JSON ou du NDJSON est attendu"}, status=status.HTTP_400_BAD_REQUEST)
+        if not rows:
+            return Response({'error': "Aucune entrée"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > settings.ENTRY_BULK_LIMIT:
+            return Response(
+                {'error': f"Au plus {settings.ENTRY_BULK_LIMIT} entrées par requête"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        
+        default_form_id = request.query_params.get('form')
+        if default_form_id is not None:
+            try:
+                default_form_id = int(default_form_id)
+            except ValueError:
+                return Response({'error': "Paramètre form invalide"}, status=status.HTTP_400_BAD_REQUEST)
+        atomic = request.query_params.get('atomic') in ('1', 'true')
+        
+        results, created = ingest(rows, default_form_id, atomic=atomic)
+        rejected = len(rows) - created
+        if not rejected:
+            response_status = status.HTTP_201_CREATED
+        elif atomic:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({'created': created, 'rejected': rejected, 'results': results}, status=response_status)
@@ -0,0 +1,49 @@
+import time
+from django.core.management.base import BaseCommand
+from forms.validation import compile_fields
+
+FIELD_TYPES = (
+    ({'type': 'text', 'max_length': 100}, 'Awa Ndiaye'),
+    ({'type': 'email', 'required': True}, 'awa@example.com'),
+    ({'type': 'integer', 'min': 0, 'max': 120}, 34),
+    ({'type': 'select', 'options': ['simple', 'double', 'suite']}, 'double'),
+    ({'type': 'date'}, '2026-10-17'),
+    ({'type': 'phone'}, '+221 77 000 00 00'),
+    ({'type': 'boolean'}, True),
+    ({'type': 'text', 'pattern': r'[A-Z]{2}-\d{4}'}, 'SN-2026'),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesurer le nombre d'entrées validées par seconde : validateur compilé une fois "
+        "(get_validator) contre définition relue à chaque entrée. Aucune écriture en base."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fields', type=int, default=20)
+        parser.add_argument('--entries', type=int, default=100000)
+
+    def handle(self, *args, **options):
+        fields, data = [], {}
+        for i in range(options['fields']):
+            definition, value = FIELD_TYPES[i % len(FIELD_TYPES)]
+            fields.append({'name': f'champ_{i}', **definition})
+            data[f'champ_{i}'] = value
+
+        validator = compile_fields(fields)
+        if validator.validate(data):
+            raise ValueError(f"Données de test invalides : {validator.validate(data)}")
+
+        count = options['entries']
+        self.stdout.write(f"{options['fields']} champs, {count} entrées")
+        self.stdout.write(f"{'validation':<26}{'µs/entrée':>12}{'entrées/s':>14}")
+        for label, validate in (
+            ('définition relue', lambda: compile_fields(fields).validate(data)),
+            ('validateur compilé', lambda: validator.validate(data)),
+        ):
+            start = time.perf_counter()
+            for _ in range(count):
+                validate()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{label:<26}{elapsed * 1e6 / count:>12.2f}{count / elapsed:>14.0f}")
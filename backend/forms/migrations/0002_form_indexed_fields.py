@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('forms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='form',
+            name='indexed_fields',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
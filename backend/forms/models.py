@@ -4,6 +4,9 @@ class Form(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True, null=True)
     fields = models.JSONField(default=list)
+    # Champs marqués "indexed" dont la table entries.EntryFieldValue est complète
+    # (tenu à jour par entries.indexing, jamais modifié par l'API)
+    indexed_fields = models.JSONField(default=list, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -1,8 +1,17 @@
 from rest_framework import serializers
 from .models import Form
+from .validation import InvalidFormDefinition, compile_fields
 
 class FormSerializer(serializers.ModelSerializer):
     class Meta:
         model = Form
-        fields = ('id', 'title', 'description', 'fields', 'is_active', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'created_at', 'updated_at')
+        fields = ('id', 'title', 'description', 'fields', 'indexed_fields', 'is_active', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'indexed_fields', 'created_at', 'updated_at')
+
+    def validate_fields(self, value):
+        """Refuser une définition de champs que le validateur ne sait pas compiler"""
+        try:
+            compile_fields(value)
+        except InvalidFormDefinition as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
@@ -0,0 +1,116 @@
+import csv
+import io
+import json
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from entries.models import Entry
+from . import validation
+from .models import Form
+from .validation import clear_validators, compile_fields
+
+User = get_user_model()
+
+FIELDS = [
+    {'name': 'nom', 'type': 'text', 'required': True, 'max_length': 20},
+    {'name': 'email', 'type': 'email', 'required': True},
+    {'name': 'age', 'type': 'integer', 'min': 18},
+    {'name': 'chambre', 'type': 'select', 'options': ['simple', {'value': 'double', 'label': 'Double'}]},
+    {'name': 'arrivee', 'type': 'date'},
+]
+
+
+class FormValidationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123'))
+        self.form = Form.objects.create(title='Réservation', fields=FIELDS)
+
+    def test_validator(self):
+        validator = compile_fields(FIELDS)
+        self.assertEqual(validator.validate({'nom': 'Awa', 'email': 'awa@example.com', 'chambre': 'double'}), {})
+        errors = validator.validate({
+            'nom': 'x' * 21, 'email': 'pas-un-email', 'age': 17, 'chambre': 'suite', 'arrivee': '17/10/2026', 'autre': 1,
+        })
+        self.assertEqual(set(errors), {'nom', 'email', 'age', 'chambre', 'arrivee', 'autre'})
+        self.assertEqual(validator.validate({'email': 'awa@example.com', 'age': True}), {
+            'nom': ["Ce champ est obligatoire"], 'age': ["Nombre entier attendu"],
+        })
+
+    def test_entry_rejected(self):
+        response = self.client.post('/api/entries/', {'form': self.form.pk, 'data': {'nom': 'Awa'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data['data'])
+
+        data = {'nom': 'Awa', 'email': 'awa@example.com', 'age': 30}
+        response = self.client.post('/api/entries/', {'form': self.form.pk, 'data': data}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_validator_compiled_once_per_version(self):
+        clear_validators()
+        data = {'nom': 'Awa', 'email': 'awa@example.com'}
+        with mock.patch.object(validation, 'compile_fields', wraps=validation.compile_fields) as compile_:
+            for _ in range(3):
+                self.client.post('/api/entries/', {'form': self.form.pk, 'data': data}, format='json')
+            self.assertEqual(compile_.call_count, 1)
+
+            # Nouvelle définition : recompilée
+            self.form.fields = FIELDS[:1]
+            self.form.save()
+            response = self.client.post('/api/entries/', {'form': self.form.pk, 'data': data}, format='json')
+            self.assertEqual(compile_.call_count, 2)
+        self.assertEqual(response.data['data'], {'email': ["Champ inconnu"]})
+
+    def test_invalid_definition_rejected(self):
+        for fields in ([{'type': 'text'}], [{'name': 'x', 'type': 'couleur'}], [{'name': 'x', 'type': 'select'}],
+                       [{'name': 'x', 'type': 'integer', 'min': 'dix'}]):
+            response = self.client.post('/api/forms/', {'title': 'Test', 'fields': fields}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, fields)
+
+    def test_catastrophic_patterns_rejected(self):
+        for pattern in (r'(a+)+$', r'(\w*)*@', r'((ab)*c)+', r'(?:x|y+)+', 'a' * 300):
+            with self.assertRaises(validation.InvalidFormDefinition, msg=pattern):
+                compile_fields([{'name': 'code', 'type': 'text', 'pattern': pattern}])
+        validator = compile_fields([{'name': 'code', 'type': 'text', 'pattern': r'[A-Z]{3}-\d+(-[a-z]{2})?'}])
+        self.assertEqual(validator.validate({'code': 'ABC-12-fr'}), {})
+
+    def test_legacy_invalid_definition_accepts_entries(self):
+        # Enregistrée avant la validation, sans passer par FormSerializer
+        legacy = Form.objects.create(title='Ancien', fields=[{'name': 'x', 'type': 'couleur'}])
+        with self.assertLogs('forms.validation', 'WARNING'):
+            response = self.client.post('/api/entries/', {'form': legacy.pk, 'data': {'x': 'rouge'}}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class FormExportTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123'))
+        self.form = Form.objects.create(title='Réservation', fields=[
+            {'name': 'nom', 'type': 'text'},
+            {'name': 'options', 'type': 'multiselect', 'options': ['wifi', 'parking']},
+        ])
+        Entry.objects.create(form=self.form, data={'nom': 'Awa, Ndiaye', 'options': ['wifi', 'parking']})
+        Entry.objects.create(form=self.form, data={'nom': '=SOMME(A1)'})
+
+    def test_csv_export(self):
+        response = self.client.get(f'/api/forms/{self.form.pk}/export/', {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0], ['id', 'created_at', 'nom', 'options'])
+        self.assertEqual(rows[1][2:], ['Awa, Ndiaye', 'wifi;parking'])
+        # Pas de formule interprétée par le tableur
+        self.assertEqual(rows[2][2:], ["'=SOMME(A1)", ''])
+
+    def test_ndjson_export(self):
+        response = self.client.get(f'/api/forms/{self.form.pk}/export/', {'format': 'ndjson'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['data'].get('nom') for line in lines], ['Awa, Ndiaye', '=SOMME(A1)'])
+
+    def test_unknown_format(self):
+        response = self.client.get(f'/api/forms/{self.form.pk}/export/', {'format': 'json'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,291 @@
+"""
+Validation des entrées d'un formulaire
+
+Form.fields décrit les champs attendus :
+    [{"name": "email", "type": "email", "required": true},
+     {"name": "age", "type": "integer", "min": 18, "max": 120},
+     {"name": "chambre", "type": "select", "options": ["simple", "double"]}]
+
+Types : text, textarea, email, url, phone, number, integer, boolean, date,
+datetime, select, multiselect.
+Contraintes : required, min / max (nombres), min_length / max_length et
+pattern (textes), options (select / multiselect, chaînes ou {"value": ...}).
+"indexed": true rend le champ filtrable par ?data__<nom>= (entries.indexing).
+
+compile_fields() transforme la définition en FormValidator une seule fois :
+types résolus, expressions régulières compilées, options en frozenset.
+get_validator() garde le résultat par processus, clé (form.id, updated_at) :
+une entrée est ensuite validée en O(nombre de champs), sans relire la définition.
+
+pattern est limité à FORM_PATTERN_MAX_LENGTH caractères et sans quantificateurs
+imbriqués ((a+)+, (\w*)*...), dont le temps d'exécution peut exploser (ReDoS).
+Une définition antérieure à ces règles qui ne compile pas garde le comportement
+historique (tout objet accepté) jusqu'à sa prochaine modification.
+"""
+import logging
+import re
+from datetime import date, datetime
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+from config.cache import MISSING, LRUCache
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+PHONE_RE = re.compile(r'\+?[0-9 .()-]{6,20}')
+# Expressions de validate_email, compilées directement (l'objet Django passe
+# par un proxy paresseux à chaque appel, plusieurs fois plus lent)
+EMAIL_USER_RE = re.compile(validate_email.user_regex.pattern, validate_email.user_regex.flags)
+EMAIL_DOMAIN_RE = re.compile(validate_email.domain_regex.pattern, validate_email.domain_regex.flags)
+validate_url = URLValidator()
+
+
+class InvalidFormDefinition(ValueError):
+    """Définition de champs (Form.fields) incorrecte"""
+
+
+def _is_text(value):
+    return isinstance(value, str)
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _check_email(value):
+    user, _, domain = value.rpartition('@')
+    if (
+        not user or len(value) > 320
+        or EMAIL_USER_RE.match(user) is None
+        or (EMAIL_DOMAIN_RE.match(domain) is None and domain not in validate_email.domain_allowlist)
+    ):
+        return "Adresse email invalide"
+
+
+def _django_check(validator, message):
+    def check(value):
+        try:
+            validator(value)
+        except ValidationError:
+            return message
+    return check
+
+
+def _parse_check(parse, message):
+    def check(value):
+        try:
+            parse(value)
+        except ValueError:
+            return message
+    return check
+
+
+# type : (test du type Python, message, vérification propre au type ou None)
+TYPES = {
+    'text': (_is_text, "Texte attendu", None),
+    'textarea': (_is_text, "Texte attendu", None),
+    'email': (_is_text, "Texte attendu", _check_email),
+    'url': (_is_text, "Texte attendu", _django_check(validate_url, "URL invalide")),
+    'phone': (_is_text, "Texte attendu", lambda value: None if PHONE_RE.fullmatch(value) else "Numéro de téléphone invalide"),
+    'number': (_is_number, "Nombre attendu", None),
+    'integer': (_is_integer, "Nombre entier attendu", None),
+    'boolean': (lambda value: isinstance(value, bool), "Booléen attendu", None),
+    'date': (_is_text, "Date attendue", _parse_check(date.fromisoformat, "Date invalide (AAAA-MM-JJ)")),
+    'datetime': (_is_text, "Date et heure attendues", _parse_check(datetime.fromisoformat, "Date et heure invalides (ISO 8601)")),
+    'select': (lambda value: isinstance(value, (str, int)) and not isinstance(value, bool), "Choix attendu", None),
+    'multiselect': (lambda value: isinstance(value, list), "Liste de choix attendue", None),
+}
+# Longueur de EntryFieldValue.field
+INDEXED_NAME_MAX_LENGTH = 100
+TEXT_TYPES = {'text', 'textarea', 'email', 'url', 'phone'}
+NUMBER_TYPES = {'number', 'integer'}
+
+
+def _bound(definition, key, is_valid):
+    value = definition.get(key)
+    if value is not None and not is_valid(value):
+        raise InvalidFormDefinition(f"'{key}' invalide : {value!r}")
+    return value
+
+
+REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT)
+
+
+def _contains_repeat(items):
+    """Vrai si l'expression analysée contient un quantificateur répétant plus d'une fois"""
+    for op, av in items:
+        if op in REPEATS:
+            if av[1] > 1 or _contains_repeat(av[2]):
+                return True
+        elif op is sre_parse.SUBPATTERN and _contains_repeat(av[-1]):
+            return True
+        elif op is sre_parse.BRANCH and any(_contains_repeat(branch) for branch in av[1]):
+            return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT) and _contains_repeat(av[1]):
+            return True
+    return False
+
+
+def _has_nested_repeat(items):
+    for op, av in items:
+        if op in REPEATS:
+            if av[1] > 1 and _contains_repeat(av[2]):
+                return True
+            if _has_nested_repeat(av[2]):
+                return True
+        elif op is sre_parse.SUBPATTERN and _has_nested_repeat(av[-1]):
+            return True
+        elif op is sre_parse.BRANCH and any(_has_nested_repeat(branch) for branch in av[1]):
+            return True
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT) and _has_nested_repeat(av[1]):
+            return True
+    return False
+
+
+def _compile_pattern(pattern):
+    if not isinstance(pattern, str):
+        raise InvalidFormDefinition("'pattern' doit être une chaîne")
+    if len(pattern) > settings.FORM_PATTERN_MAX_LENGTH:
+        raise InvalidFormDefinition(f"Expression régulière trop longue (au plus {settings.FORM_PATTERN_MAX_LENGTH} caractères)")
+    try:
+        compiled = re.compile(pattern)
+        parsed = sre_parse.parse(pattern)
+    except re.error as exc:
+        raise InvalidFormDefinition(f"Expression régulière invalide : {exc}")
+    if _has_nested_repeat(parsed):
+        raise InvalidFormDefinition("Expression régulière refusée : quantificateurs imbriqués")
+    return compiled
+
+
+def _compile_constraints(definition, field_type):
+    """Liste de fonctions value -> message d'erreur ou None"""
+    checks = []
+    if field_type in TEXT_TYPES:
+        min_length = _bound(definition, 'min_length', _is_integer)
+        max_length = _bound(definition, 'max_length', _is_integer)
+        if min_length is not None:
+            checks.append(lambda value: f"Au moins {min_length} caractères" if len(value) < min_length else None)
+        if max_length is not None:
+            checks.append(lambda value: f"Au plus {max_length} caractères" if len(value) > max_length else None)
+        if definition.get('pattern'):
+            pattern = _compile_pattern(definition['pattern'])
+            checks.append(lambda value: None if pattern.fullmatch(value) else "Format invalide")
+
+    if field_type in NUMBER_TYPES:
+        minimum, maximum = _bound(definition, 'min', _is_number), _bound(definition, 'max', _is_number)
+        if minimum is not None:
+            checks.append(lambda value: f"Valeur minimale : {minimum}" if value < minimum else None)
+        if maximum is not None:
+            checks.append(lambda value: f"Valeur maximale : {maximum}" if value > maximum else None)
+
+    if field_type in ('select', 'multiselect'):
+        options = definition.get('options')
+        if not isinstance(options, list) or not options:
+            raise InvalidFormDefinition("'options' doit être une liste non vide")
+        choices = frozenset(
+            option['value'] if isinstance(option, dict) else option
+            for option in options
+        )
+        if field_type == 'select':
+            checks.append(lambda value: None if value in choices else "Choix invalide")
+        else:
+            checks.append(lambda values: None if all(value in choices for value in values) else "Choix invalide")
+    return checks
+
+
+def _compile_field(definition):
+    if not isinstance(definition, dict) or not isinstance(definition.get('name'), str) or not definition['name']:
+        raise InvalidFormDefinition("Chaque champ doit être un objet avec un 'name'")
+    field_type = definition.get('type', 'text')
+    if field_type not in TYPES:
+        raise InvalidFormDefinition(f"Type de champ inconnu : {field_type}")
+
+    if definition.get('indexed') and len(definition['name']) > INDEXED_NAME_MAX_LENGTH:
+        raise InvalidFormDefinition(f"Nom de champ indexé trop long (au plus {INDEXED_NAME_MAX_LENGTH} caractères)")
+
+    is_type, type_message, type_check = TYPES[field_type]
+    checks = ([type_check] if type_check else []) + _compile_constraints(definition, field_type)
+    return definition['name'], bool(definition.get('required', False)), is_type, type_message, tuple(checks)
+
+
+class FormValidator:
+    """Validateur compilé d'un formulaire"""
+
+    __slots__ = ('fields', 'names')
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.names = frozenset(field[0] for field in fields)
+
+    def validate(self, data):
+        """Erreurs par champ ({} si les données sont valides)"""
+        if not isinstance(data, dict):
+            return {'non_field_errors': ["Un objet JSON est attendu"]}
+        # Définition vide : formulaire libre (comportement historique)
+        if not self.fields:
+            return {}
+
+        errors = {}
+        for name, required, is_type, type_message, checks in self.fields:
+            value = data.get(name, MISSING)
+            if value is MISSING or value is None or value == '':
+                if required:
+                    errors[name] = ["Ce champ est obligatoire"]
+                continue
+            if not is_type(value):
+                errors[name] = [type_message]
+                continue
+            for check in checks:
+                message = check(value)
+                if message:
+                    errors[name] = [message]
+                    break
+
+        unknown = data.keys() - self.names
+        for name in unknown:
+            errors[name] = ["Champ inconnu"]
+        return errors
+
+
+def compile_fields(fields):
+    """Compiler une définition de champs (lève InvalidFormDefinition)"""
+    if not isinstance(fields, list):
+        raise InvalidFormDefinition("'fields' doit être une liste")
+    compiled = tuple(_compile_field(definition) for definition in fields)
+    names = [field[0] for field in compiled]
+    if len(names) != len(set(names)):
+        raise InvalidFormDefinition("Noms de champs en double")
+    return FormValidator(compiled)
+
+
+_validators = LRUCache(settings.FORM_VALIDATOR_CACHE_SIZE)
+# Définition vide : seul un objet JSON est exigé
+PERMISSIVE_VALIDATOR = FormValidator(())
+
+
+def get_validator(form):
+    """Validateur d'un formulaire, compilé une fois par version du formulaire"""
+    key = (form.pk, form.updated_at)
+    validator = _validators.get(key)
+    if validator is MISSING:
+        try:
+            validator = compile_fields(form.fields)
+        except InvalidFormDefinition as exc:
+            # Définition enregistrée avant la validation (FormSerializer refuse
+            # désormais ces définitions) : ne pas bloquer les entrées
+            logger.warning("Formulaire %s : définition invalide (%s), entrées acceptées sans validation", form.pk, exc)
+            validator = PERMISSIVE_VALIDATOR
+        _validators.set(key, validator)
+    return validator
+
+
+def clear_validators():
+    _validators.clear()
@@ -1,5 +1,12 @@
-from rest_framework import viewsets
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from entries.export import EXPORT_FORMATS
+from entries.renderers import CSVRenderer, NDJSONRenderer
+from entries.stats import form_stats
 from .models import Form
 from .serializers import FormSerializer
 
@@ -7,3 +14,37 @@ class FormViewSet(viewsets.ModelViewSet):
     queryset = Form.objects.all()
     serializer_class = FormSerializer
     permission_classes = [IsAuthenticated]
+
+    @action(detail=True, methods=['get'], renderer_classes=[CSVRenderer, NDJSONRenderer, JSONRenderer])
+    def export(self, request, pk=None):
+        """
+        Exporter toutes les entrées du formulaire en flux : ?format=csv (défaut) ou ?format=ndjson
+        Une colonne CSV par champ de Form.fields
+        """
+        form = self.get_object()
+        export_format = request.query_params.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'error': "Format d'export inconnu (csv ou ndjson)"}, status=status.HTTP_400_BAD_REQUEST)
+        content_type, stream = EXPORT_FORMATS[export_format]
+        
+        response = StreamingHttpResponse(stream(form), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="form-{form.pk}-entries.{export_format}"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Statistiques des réponses, tenues à jour à chaque entrée (entries.stats)
+        - fields : réponses par choix, ou nombre / min / max / moyenne
+        - per_day : entrées par jour (?days=N : les N derniers jours ayant des entrées)
+        """
+        form = self.get_object()
+        days = request.query_params.get('days')
+        if days is not None:
+            try:
+                days = int(days)
+            except ValueError:
+                days = 0
+            if days <= 0:
+                return Response({'error': "days doit être un entier positif"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(form_stats(form, days))
@@ -1,12 +1,12 @@
 from django.contrib import admin
-from .models import Hotel
+from .models import DashboardCounters, Hotel
 
 @admin.register(Hotel)
 class HotelAdmin(admin.ModelAdmin):
     list_display = ('name', 'city', 'price_per_night', 'rating', 'is_active', 'created_at')
     list_filter = ('city', 'is_active', 'created_at')
     search_fields = ('name', 'city', 'address')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('image_blob', 'image_type', 'image_size', 'created_at', 'updated_at')
     fieldsets = (
         ('Informations générales', {
             'fields': ('name', 'description', 'city', 'address')
@@ -18,7 +18,10 @@ class HotelAdmin(admin.ModelAdmin):
             'fields': ('price_per_night', 'rooms_count', 'available_rooms')
         }),
         ('Évaluation', {
-            'fields': ('rating', 'image')
+            'fields': ('rating',)
+        }),
+        ('Image', {
+            'fields': ('image_blob', 'image_type', 'image_size')
         }),
         ('Statut', {
             'fields': ('is_active',)
@@ -28,3 +31,12 @@ class HotelAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(DashboardCounters)
+class DashboardCountersAdmin(admin.ModelAdmin):
+    list_display = ('total_hotels', 'total_users', 'total_tickets', 'total_messages', 'total_emails', 'updated_at')
+    readonly_fields = DashboardCounters.COUNTED_FIELDS + ('updated_at',)
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,28 @@
+import hashlib
+import json
+from config.cache import bump_version as bump_namespace_version
+from config.cache import get_version, namespaced_key
+
+NAMESPACE = 'hotels'
+LIST_TIMEOUT = 60 * 5  # 5 minutes
+
+
+def bump_version():
+    """Invalider tous les résultats de liste en cache"""
+    bump_namespace_version(NAMESPACE)
+
+
+def list_cache_key(request):
+    """
+    Clé de cache d'une page de liste
+    Dérivée des paramètres normalisés (filtres, recherche, tri, page...)
+    et de la version de la table, jamais de l'utilisateur.
+    """
+    params = sorted(
+        (key, sorted(values))
+        for key, values in request.query_params.lists()
+    )
+    # Les URL absolues (next, thumbnail_url) dépendent de l'hôte
+    payload = json.dumps([request.scheme, request.get_host(), params])
+    digest = hashlib.sha256(payload.encode()).hexdigest()
+    return namespaced_key(NAMESPACE, 'list', get_version(NAMESPACE), digest)
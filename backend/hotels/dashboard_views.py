@@ -1,53 +1,76 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
-from django.db.models import Count, Sum, F, Value
+from django.db.models import Q
 from django.utils import timezone
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import decorator_from_middleware_with_args
-from datetime import timedelta
-from .models import Hotel
-from users.models import CustomUser
-from tickets.models import Ticket
-from messaging.models import Message
-from emails.models import Email
+from config.cache import get_or_compute, get_version, namespaced_key
+from .cache import LIST_TIMEOUT, NAMESPACE
+from .models import DashboardCounters, Hotel
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])  # Garder l'authentification requise
-@cache_page(60 * 5)  # Cache 5 minutes
-def dashboard_stats(request):
-    """Retourne les statistiques du dashboard"""
-    
-    # Compter les hôtels
-    total_hotels = Hotel.objects.count()
-    
-    # Compter les utilisateurs
-    total_users = CustomUser.objects.count()
-    
-    # Récupérer les hôtels populaires (les plus chers ou les mieux notés)
-    popular_hotels = Hotel.objects.all().order_by('-rating', '-price_per_night')[:5]
+
+POPULAR_ORDERING = ('-rating', '-price_per_night', '-id')
+RECENT_ORDERING = ('-created_at', '-id')
+
+
+def hotel_highlights():
+    """
+    Hôtels populaires et récemment créés, en une seule requête
+    (deux sous-requêtes LIMIT, colonnes strictement nécessaires)
+    Mis en cache sous la version de la table des hôtels (invalidée à chaque écriture)
+    """
+    popular_ids = Hotel.objects.order_by(*POPULAR_ORDERING).values('id')[:5]
+    recent_ids = Hotel.objects.order_by(*RECENT_ORDERING).values('id')[:3]
+    rows = list(
+        Hotel.objects
+        .filter(Q(id__in=popular_ids) | Q(id__in=recent_ids))
+        .order_by()
+        .values('id', 'name', 'available_rooms', 'rating', 'price_per_night', 'created_at')
+    )
     
+    popular_hotels = sorted(
+        rows, key=lambda row: (-row['rating'], -row['price_per_night'], -row['id'])
+    )[:5]
     popular_hotels_data = [
         {
-            'id': hotel.id,
-            'name': hotel.name,
-            'reservations': int(hotel.available_rooms),  # Utiliser available_rooms comme proxy
+            'id': hotel['id'],
+            'name': hotel['name'],
+            'reservations': int(hotel['available_rooms']),  # Utiliser available_rooms comme proxy
         }
         for hotel in popular_hotels
     ]
     
-    # Calculer le revenu total à partir des prix des hôtels
-    total_revenue = Hotel.objects.aggregate(Sum('price_per_night'))['price_per_night__sum'] or 0
-    total_revenue = float(total_revenue) / 1000  # Convertir en K
+    recent_hotels = sorted(rows, key=lambda row: (row['created_at'], row['id']), reverse=True)[:3]
+    recent_hotels_data = [
+        {'name': hotel['name'], 'created_at': hotel['created_at'].isoformat()}
+        for hotel in recent_hotels
+    ]
+    return popular_hotels_data, recent_hotels_data
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])  # Garder l'authentification requise
+def dashboard_stats(request):
+    """
+    Retourne les statistiques du dashboard
+    Les totaux proviennent de DashboardCounters (une seule ligne, tenue à jour
+    par signaux) au lieu de COUNT(*) / SUM sur chaque table.
+    Au plus 2 requêtes : la ligne des compteurs et les hôtels mis en avant.
+    """
+    counters = DashboardCounters.load()
+    
+    key = namespaced_key(NAMESPACE, 'dashboard', get_version(NAMESPACE))
+    popular_hotels_data, recent_hotels = get_or_compute(key, hotel_highlights, LIST_TIMEOUT)
+    
+    # Revenu total à partir des prix des hôtels, converti en K
+    total_revenue = float(counters.total_price) / 1000
     
     # Activités récentes basées sur les hôtels créés récemment
-    recent_hotels = Hotel.objects.all().order_by('-created_at')[:3]
     recent_activities = [
         {
             'id': idx + 1,
             'type': 'hotel_created',
-            'description': f'Hôtel "{hotel.name}" créé',
-            'timestamp': hotel.created_at.isoformat(),
+            'description': f'Hôtel "{hotel["name"]}" créé',
+            'timestamp': hotel['created_at'],
         }
         for idx, hotel in enumerate(recent_hotels)
     ]
@@ -56,26 +79,19 @@ def dashboard_stats(request):
     recent_activities.append({
         'id': len(recent_activities) + 1,
         'type': 'user_activity',
-        'description': f'{total_users} utilisateurs inscrits',
+        'description': f'{counters.total_users} utilisateurs inscrits',
         'timestamp': timezone.now().isoformat(),
     })
     
-    # Calculer le nombre total de réservations (nombre de chambres disponibles)
-    total_reservations = Hotel.objects.aggregate(Sum('available_rooms'))['available_rooms__sum'] or 0
-    
-    # Compter les tickets, messages et emails
-    total_tickets = Ticket.objects.count()
-    total_messages = Message.objects.count()
-    total_emails = Email.objects.count()
-    
     return Response({
-        'totalHotels': total_hotels,
-        'totalUsers': total_users,
-        'totalReservations': int(total_reservations),
+        'totalHotels': counters.total_hotels,
+        'totalUsers': counters.total_users,
+        # Nombre total de réservations (nombre de chambres disponibles)
+        'totalReservations': int(counters.total_available_rooms),
         'totalRevenue': round(total_revenue, 1),
-        'totalTickets': total_tickets,
-        'totalMessages': total_messages,
-        'totalEmails': total_emails,
+        'totalTickets': counters.total_tickets,
+        'totalMessages': counters.total_messages,
+        'totalEmails': counters.total_emails,
         'recentActivities': recent_activities,
         'popularHotels': popular_hotels_data,
     })
@@ -0,0 +1,90 @@
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+from emails.models import Email
+from hotels.cache import bump_version
+from hotels.dashboard_views import dashboard_stats
+from hotels.models import DashboardCounters, Hotel
+from messaging.models import Message
+from tickets.models import Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesurer le temps et le nombre de requêtes de /api/hotels/dashboard/stats/ "
+        "(ancien calcul vs compteurs). "
+        "Les données de test sont créées dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        Hotel.objects.bulk_create(
+            [
+                Hotel(
+                    name=f'Hotel {i}', city='Dakar', address='Adresse',
+                    phone='+221 00 000 00 00', email=f'h{i}@bench.sn',
+                    price_per_night=50 + i % 500, rating=(i % 50) / 10, available_rooms=i % 30,
+                )
+                for i in range(options['hotels'])
+            ],
+            batch_size=5000,
+        )
+        # bulk_create ne déclenche pas les signaux : recalculer les compteurs
+        DashboardCounters.objects.all().delete()
+        DashboardCounters.load()
+
+        user = get_user_model().objects.order_by('pk').first()
+        factory = APIRequestFactory()
+
+        def endpoint(cold):
+            def call():
+                if cold:
+                    bump_version()
+                request = factory.get('/api/hotels/dashboard/stats/', HTTP_HOST=settings.ALLOWED_HOSTS[0])
+                force_authenticate(request, user=user)
+                return dashboard_stats(request)
+            return call
+
+        self.stdout.write(f"{options['hotels']} hôtels")
+        self.stdout.write(f"{'calcul':<28}{'requêtes':>10}{'ms/appel':>10}")
+        for label, call in (
+            ('ancien (COUNT/SUM/scans)', self.legacy_stats),
+            ('compteurs, cache froid', endpoint(cold=True)),
+            ('compteurs, cache chaud', endpoint(cold=False)),
+        ):
+            queries, ms = self.measure(call, options['repeat'])
+            self.stdout.write(f"{label:<28}{queries:>10}{ms:>10.2f}")
+
+    def legacy_stats(self):
+        """Calcul d'origine : une requête par total et lignes complètes"""
+        Hotel.objects.count()
+        get_user_model().objects.count()
+        list(Hotel.objects.order_by('-rating', '-price_per_night')[:5])
+        Hotel.objects.aggregate(Sum('price_per_night'))
+        list(Hotel.objects.order_by('-created_at')[:3])
+        Hotel.objects.aggregate(Sum('available_rooms'))
+        Ticket.objects.count()
+        Message.objects.count()
+        Email.objects.count()
+
+    def measure(self, call, repeat):
+        call()
+        start = time.perf_counter()
+        with CaptureQueriesContext(connection) as context:
+            for _ in range(repeat):
+                call()
+        elapsed = (time.perf_counter() - start) * 1000 / repeat
+        return len(context.captured_queries) // repeat, elapsed
@@ -0,0 +1,99 @@
+import base64
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Subquery
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from blobs.models import BlobData
+from blobs.storage import store_bytes
+from hotels.models import Hotel
+from hotels.serializers import HotelSerializer, HotelListSerializer
+
+
+class LegacyHotelSerializer(HotelSerializer):
+    """Représentation d'avant le stockage de blobs : data URL base64 lue dans chaque ligne"""
+    image_base64 = serializers.SerializerMethodField()
+
+    class Meta(HotelSerializer.Meta):
+        fields = tuple(name for name in HotelSerializer.Meta.fields if name not in ('image_url', 'thumbnail_url'))
+
+    def get_image_base64(self, obj):
+        return bytes(obj.legacy_image).decode() if obj.legacy_image is not None else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesurer les octets et le temps par page de la liste des hôtels "
+        "(base64 dans la ligne vs représentation complète vs projection de liste). "
+        "Les données de test sont créées dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hotels', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=100)
+        parser.add_argument('--description-kb', type=int, default=2)
+        parser.add_argument('--image-kb', type=int, default=500)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        page_size = options['page_size']
+        # Backend base de données : rien ne reste sur disque après l'annulation
+        data = os.urandom(options['image_kb'] * 1024)
+        image = store_bytes(data, 'image/jpeg', backend='database')
+        # Ancienne colonne TEXT image_base64 : la data URL, relue par la base pour chaque ligne
+        legacy = store_bytes(
+            f"data:image/jpeg;base64,{base64.b64encode(data).decode()}".encode(), 'text/plain', backend='database'
+        )
+        description = 'x' * (options['description_kb'] * 1024)
+        Hotel.objects.bulk_create(
+            [
+                Hotel(
+                    name=f'Hotel {i}', description=description, city='Dakar',
+                    address='Adresse', phone='+221 00 000 00 00', email=f'h{i}@bench.sn',
+                    price_per_night=100, image_blob=image, image_type='jpeg', image_size=image.size,
+                )
+                for i in range(options['hotels'])
+            ],
+            batch_size=1000,
+        )
+        request = APIRequestFactory().get('/api/hotels/', HTTP_HOST=settings.ALLOWED_HOSTS[0])
+
+        def legacy_page():
+            column = BlobData.objects.filter(sha256=legacy.sha256).values('data')[:1]
+            hotels = Hotel.objects.annotate(legacy_image=Subquery(column))
+            return LegacyHotelSerializer(hotels[:page_size], many=True, context={'request': request}).data
+
+        def full_page():
+            hotels = Hotel.objects.all()[:page_size]
+            return HotelSerializer(hotels, many=True, context={'request': request}).data
+
+        def list_page():
+            hotels = Hotel.objects.only(*HotelListSerializer.columns())[:page_size]
+            return HotelListSerializer(hotels, many=True, context={'request': request}).data
+
+        legacy_bytes, legacy_ms = self.measure(legacy_page, options['repeat'])
+        full_bytes, full_ms = self.measure(full_page, options['repeat'])
+        list_bytes, list_ms = self.measure(list_page, options['repeat'])
+
+        self.stdout.write(f"{options['hotels']} hôtels, pages de {page_size}")
+        self.stdout.write(f"{'représentation':<32}{'octets/page':>14}{'ms/page':>10}")
+        self.stdout.write(f"{'base64 dans la ligne (avant)':<32}{legacy_bytes:>14}{legacy_ms:>10.2f}")
+        self.stdout.write(f"{'HotelSerializer':<32}{full_bytes:>14}{full_ms:>10.2f}")
+        self.stdout.write(f"{'HotelListSerializer':<32}{list_bytes:>14}{list_ms:>10.2f}")
+
+    def measure(self, build_page, repeat):
+        renderer = JSONRenderer()
+        size = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            size = len(renderer.render(build_page()))
+        return size, (time.perf_counter() - start) * 1000 / repeat
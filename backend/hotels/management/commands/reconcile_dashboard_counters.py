@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from hotels.models import DashboardCounters
+
+
+class Command(BaseCommand):
+    help = "Comparer les compteurs du dashboard aux valeurs réelles et corriger les écarts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Afficher les écarts sans les corriger",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            counters = DashboardCounters.load()
+            # Verrouiller la ligne : les signaux attendent la fin de la correction
+            counters = DashboardCounters.objects.select_for_update().get(pk=counters.pk)
+            actual = DashboardCounters.compute()
+
+            drift = {
+                field: (getattr(counters, field), value)
+                for field, value in actual.items()
+                if getattr(counters, field) != value
+            }
+            if not drift:
+                self.stdout.write(self.style.SUCCESS("Compteurs à jour, aucun écart"))
+                return
+
+            for field, (stored, value) in drift.items():
+                self.stdout.write(f"{field}: {stored} -> {value}")
+
+            if options['dry_run']:
+                self.stdout.write(self.style.WARNING(f"{len(drift)} écart(s) détecté(s), non corrigé(s)"))
+                return
+
+            DashboardCounters.objects.filter(pk=counters.pk).update(**actual)
+            self.stdout.write(self.style.SUCCESS(f"{len(drift)} compteur(s) corrigé(s)"))
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+def move_images_to_blobs(apps, schema_editor):
+    """Décoder chaque image_base64 et la déplacer dans le stockage de blobs"""
+    from blobs.storage import decode_data_url, store_bytes
+
+    Hotel = apps.get_model('hotels', 'Hotel')
+    Blob = apps.get_model('blobs', 'Blob')
+
+    hotels = (
+        Hotel.objects.filter(image_base64__isnull=False)
+        .exclude(image_base64='')
+        .only('id', 'image_base64')
+    )
+    for hotel in hotels.iterator(chunk_size=50):
+        try:
+            mime_type, content = decode_data_url(hotel.image_base64)
+        except (ValueError, IndexError):
+            # Données illisibles : on laisse l'hôtel sans image
+            continue
+        blob = store_bytes(content, mime_type, blob_model=Blob)
+        Hotel.objects.filter(pk=hotel.pk).update(
+            image_blob=blob,
+            image_type=mime_type.split('/')[1][:50],
+            image_size=len(content),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0006_hotel_image_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_images_to_blobs, migrations.RunPython.noop),
+    ]
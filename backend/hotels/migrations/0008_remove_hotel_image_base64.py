@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:09
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0007_move_image_base64_to_blobs'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='hotel',
+            name='image_base64',
+        ),
+    ]
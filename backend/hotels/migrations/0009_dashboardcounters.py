@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotels', '0008_remove_hotel_image_base64'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_hotels', models.BigIntegerField(default=0)),
+                ('total_users', models.BigIntegerField(default=0)),
+                ('total_tickets', models.BigIntegerField(default=0)),
+                ('total_messages', models.BigIntegerField(default=0)),
+                ('total_emails', models.BigIntegerField(default=0)),
+                ('total_price', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_available_rooms', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Compteurs du dashboard',
+                'verbose_name_plural': 'Compteurs du dashboard',
+            },
+        ),
+    ]
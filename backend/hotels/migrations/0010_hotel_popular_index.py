@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blobs', '0002_blobvariant'),
+        ('hotels', '0009_dashboardcounters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['-rating', '-price_per_night'], name='hotels_hote_rating_fa3811_idx'),
+        ),
+    ]
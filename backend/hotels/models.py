@@ -9,11 +9,13 @@ class Hotel(models.Model):
     email = models.EmailField()
     price_per_night = models.DecimalField(max_digits=10, decimal_places=2, db_index=True)
     rating = models.FloatField(default=0)
-    # Image stockée en base64 (pas de fichier sur disque)
-    image_base64 = models.TextField(
+    # Référence vers le contenu de l'image (les octets vivent dans le stockage de blobs)
+    image_blob = models.ForeignKey(
+        'blobs.Blob',
+        on_delete=models.SET_NULL,
         blank=True,
         null=True,
-        help_text="Image encodée en base64 (data:image/jpeg;base64,...)"
+        related_name='+'
     )
     image_type = models.CharField(
         max_length=50,
@@ -41,7 +43,79 @@ class Hotel(models.Model):
             models.Index(fields=['city', 'is_active']),
             models.Index(fields=['price_per_night']),
             models.Index(fields=['-created_at']),
+            # Hôtels populaires du dashboard
+            models.Index(fields=['-rating', '-price_per_night']),
         ]
 
     def __str__(self):
         return self.name
+
+
+class DashboardCounters(models.Model):
+    """
+    Compteurs du dashboard maintenus par signaux (ligne unique, pk=1)
+    Évite les COUNT(*) / SUM sur toutes les tables à chaque appel.
+    La commande reconcile_dashboard_counters corrige les dérives.
+    """
+
+    total_hotels = models.BigIntegerField(default=0)
+    total_users = models.BigIntegerField(default=0)
+    total_tickets = models.BigIntegerField(default=0)
+    total_messages = models.BigIntegerField(default=0)
+    total_emails = models.BigIntegerField(default=0)
+    # Somme des prix par nuit et des chambres disponibles de tous les hôtels
+    total_price = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_available_rooms = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNTED_FIELDS = (
+        'total_hotels', 'total_users', 'total_tickets', 'total_messages',
+        'total_emails', 'total_price', 'total_available_rooms',
+    )
+
+    class Meta:
+        verbose_name = 'Compteurs du dashboard'
+        verbose_name_plural = 'Compteurs du dashboard'
+
+    def __str__(self):
+        return f"Compteurs du dashboard ({self.updated_at:%Y-%m-%d %H:%M})"
+
+    @classmethod
+    def compute(cls):
+        """Recalculer les valeurs réelles à partir des tables"""
+        from django.contrib.auth import get_user_model
+        from django.db.models import Sum
+        from tickets.models import Ticket
+        from messaging.models import Message
+        from emails.models import Email
+
+        hotel_totals = Hotel.objects.aggregate(
+            total_price=Sum('price_per_night'),
+            total_available_rooms=Sum('available_rooms'),
+        )
+        return {
+            'total_hotels': Hotel.objects.count(),
+            'total_users': get_user_model().objects.count(),
+            'total_tickets': Ticket.objects.count(),
+            'total_messages': Message.objects.count(),
+            'total_emails': Email.objects.count(),
+            'total_price': hotel_totals['total_price'] or 0,
+            'total_available_rooms': hotel_totals['total_available_rooms'] or 0,
+        }
+
+    @classmethod
+    def load(cls):
+        """Lire la ligne des compteurs, en l'initialisant au premier appel"""
+        counters = cls.objects.filter(pk=1).first()
+        if counters is None:
+            counters, _ = cls.objects.get_or_create(pk=1, defaults=cls.compute())
+        return counters
+
+    @classmethod
+    def increment(cls, **deltas):
+        """Appliquer des deltas de façon atomique (UPDATE ... SET x = x + n)"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if deltas:
+            cls.objects.filter(pk=1).update(
+                **{field: models.F(field) + delta for field, delta in deltas.items()}
+            )
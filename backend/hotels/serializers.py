@@ -1,10 +1,29 @@
+from django.urls import reverse
 from rest_framework import serializers
+from blobs.imaging import process_image
+from blobs.storage import decode_data_url, store_bytes
 from .models import Hotel
-import base64
+
+
+def absolute_url(serializer, url):
+    """Construire une URL absolue si la requête est disponible"""
+    request = serializer.context.get('request')
+    return request.build_absolute_uri(url) if request else url
+
+
+def thumbnail_url(serializer, hotel):
+    """URL de la miniature d'un hôtel, sans requête supplémentaire"""
+    if not hotel.image_blob_id:
+        return None
+    return absolute_url(serializer, reverse('hotel-image', args=[hotel.pk]) + '?variant=thumbnail')
+
 
 class HotelSerializer(serializers.ModelSerializer):
     price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
-    image_base64 = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    # L'image est reçue en base64 mais n'est jamais renvoyée : on expose une URL
+    image_base64 = serializers.CharField(write_only=True, required=False, allow_blank=True, allow_null=True)
+    image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
     image_size_mb = serializers.SerializerMethodField()
     name = serializers.CharField(required=False)
     city = serializers.CharField(required=False)
@@ -21,10 +40,10 @@ class HotelSerializer(serializers.ModelSerializer):
         model = Hotel
         fields = (
             'id', 'name', 'description', 'city', 'address', 'phone', 'email',
-            'price_per_night', 'rating', 'image_base64', 'image_type', 'image_size', 'image_size_mb',
+            'price_per_night', 'rating', 'image_base64', 'image_url', 'thumbnail_url', 'image_type', 'image_size', 'image_size_mb',
             'rooms_count', 'available_rooms', 'is_active', 'created_at', 'updated_at'
         )
-        read_only_fields = ('id', 'image_size', 'image_size_mb', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'image_url', 'thumbnail_url', 'image_size', 'image_size_mb', 'created_at', 'updated_at')
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -50,38 +69,39 @@ class HotelSerializer(serializers.ModelSerializer):
             return round(obj.image_size / (1024 * 1024), 2)
         return 0
     
+    def get_image_url(self, obj):
+        """Retourner l'URL du contenu de l'image"""
+        if not obj.image_blob_id:
+            return None
+        return absolute_url(self, reverse('blob-content', args=[obj.image_blob_id]))
+    
+    def get_thumbnail_url(self, obj):
+        """Retourner l'URL de la miniature de l'image (pour les listes)"""
+        return thumbnail_url(self, obj)
+    
     def validate_image_base64(self, value):
-        """Valider et traiter l'image base64"""
+        """Valider l'image base64 et la décoder"""
         if not value:
-            return value
+            return None
         
         # Vérifier si c'est un data URL
-        if value.startswith('data:'):
-            try:
-                # Extraire le type et les données
-                header, data = value.split(',', 1)
-                # Extraire le type MIME (ex: data:image/jpeg;base64)
-                mime_type = header.split(':')[1].split(';')[0]
-                
-                # Valider le type MIME
-                if not mime_type.startswith('image/'):
-                    raise serializers.ValidationError("Le fichier doit être une image")
-                
-                # Décoder et valider
-                try:
-                    image_data = base64.b64decode(data)
-                except Exception:
-                    raise serializers.ValidationError("Le base64 est invalide")
-                
-                # Vérifier la taille (max 10 MB)
-                if len(image_data) > 10 * 1024 * 1024:
-                    raise serializers.ValidationError("L'image ne doit pas dépasser 10 MB")
-                
-                return value
-            except ValueError:
-                raise serializers.ValidationError("Format base64 invalide")
-        else:
+        if not value.startswith('data:'):
             raise serializers.ValidationError("L'image doit être au format base64 (data:image/...;base64,...)")
+        
+        try:
+            mime_type, image_data = decode_data_url(value)
+        except (ValueError, IndexError):
+            raise serializers.ValidationError("Le base64 est invalide")
+        
+        # Valider le type MIME
+        if not mime_type.startswith('image/'):
+            raise serializers.ValidationError("Le fichier doit être une image")
+        
+        # Vérifier la taille (max 10 MB)
+        if len(image_data) > 10 * 1024 * 1024:
+            raise serializers.ValidationError("L'image ne doit pas dépasser 10 MB")
+        
+        return mime_type, image_data
     
     def validate(self, data):
         """Validate required fields for create operations"""
@@ -94,42 +114,97 @@ class HotelSerializer(serializers.ModelSerializer):
         
         return data
     
-    def create(self, validated_data):
-        """Créer un hôtel et extraire les métadonnées de l'image"""
-        if 'image_base64' in validated_data and validated_data['image_base64']:
-            image_base64 = validated_data['image_base64']
-            
-            # Extraire les métadonnées
-            header, image_data_str = image_base64.split(',', 1)
-            mime_type = header.split(':')[1].split(';')[0]
-            image_type = mime_type.split('/')[1]
-            
-            # Décoder pour obtenir la taille
-            image_data = base64.b64decode(image_data_str)
-            image_size = len(image_data)
-            
-            # Mettre à jour les métadonnées
-            validated_data['image_type'] = image_type
-            validated_data['image_size'] = image_size
+    def _store_image(self, validated_data):
+        """Enregistrer l'image décodée dans le stockage de blobs"""
+        if 'image_base64' not in validated_data:
+            return
+        image = validated_data.pop('image_base64')
+        if image is None:
+            # Image vide : supprimer l'image existante
+            validated_data['image_blob'] = None
+            validated_data['image_size'] = 0
+            return
         
+        mime_type, image_data = image
+        blob = store_bytes(image_data, mime_type)
+        # Produire les variantes redimensionnées dès l'envoi
+        process_image(blob, image_data)
+        validated_data['image_blob'] = blob
+        validated_data['image_type'] = mime_type.split('/')[1]
+        validated_data['image_size'] = len(image_data)
+    
+    def create(self, validated_data):
+        """Créer un hôtel et stocker son image"""
+        self._store_image(validated_data)
         return super().create(validated_data)
     
     def update(self, instance, validated_data):
-        """Mettre à jour un hôtel et extraire les métadonnées de l'image"""
-        if 'image_base64' in validated_data and validated_data['image_base64']:
-            image_base64 = validated_data['image_base64']
-            
-            # Extraire les métadonnées
-            header, image_data_str = image_base64.split(',', 1)
-            mime_type = header.split(':')[1].split(';')[0]
-            image_type = mime_type.split('/')[1]
-            
-            # Décoder pour obtenir la taille
-            image_data = base64.b64decode(image_data_str)
-            image_size = len(image_data)
-            
-            # Mettre à jour les métadonnées
-            validated_data['image_type'] = image_type
-            validated_data['image_size'] = image_size
-        
+        """Mettre à jour un hôtel et stocker sa nouvelle image"""
+        self._store_image(validated_data)
         return super().update(instance, validated_data)
+
+
+class HotelListSerializer(serializers.ModelSerializer):
+    """
+    Projection légère pour la liste des hôtels
+    - Pas de description par défaut (disponible via ?fields=)
+    - Pas d'URL vers l'original : seulement has_image et la miniature
+    """
+    
+    price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2)
+    has_image = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    
+    # Colonnes nécessaires à chaque champ exposé (pour QuerySet.only())
+    COLUMNS = {
+        'has_image': ('image_blob',),
+        'thumbnail_url': ('image_blob',),
+    }
+    # Champs disponibles uniquement sur demande explicite
+    OPTIONAL_FIELDS = ('description',)
+    
+    class Meta:
+        model = Hotel
+        fields = (
+            'id', 'name', 'description', 'city', 'address', 'phone', 'email',
+            'price_per_night', 'rating', 'has_image', 'thumbnail_url', 'image_type', 'image_size',
+            'rooms_count', 'available_rooms', 'is_active', 'created_at', 'updated_at'
+        )
+        read_only_fields = fields
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.select_fields(fields)
+        for field_name in list(self.fields):
+            if field_name not in selected:
+                self.fields.pop(field_name)
+    
+    @classmethod
+    def select_fields(cls, fields=None):
+        """
+        Résoudre le paramètre ?fields= en liste de champs
+        Lève ValidationError pour les champs inconnus.
+        """
+        if not fields:
+            return [name for name in cls.Meta.fields if name not in cls.OPTIONAL_FIELDS]
+        requested = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in requested if name not in cls.Meta.fields]
+        if unknown:
+            raise serializers.ValidationError({'fields': f"Champs inconnus: {', '.join(unknown)}"})
+        return ['id'] + [name for name in requested if name != 'id']
+    
+    @classmethod
+    def columns(cls, fields=None):
+        """Colonnes à charger pour les champs sélectionnés"""
+        columns = []
+        for name in cls.select_fields(fields):
+            for column in cls.COLUMNS.get(name, (name,)):
+                if column not in columns:
+                    columns.append(column)
+        return columns
+    
+    def get_has_image(self, obj):
+        return obj.image_blob_id is not None
+    
+    def get_thumbnail_url(self, obj):
+        return thumbnail_url(self, obj)
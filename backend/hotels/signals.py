@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from config.bulk import in_bulk_operation
+from emails.models import Email
+from messaging.models import Message
+from tickets.models import Ticket
+from .cache import bump_version
+from .models import DashboardCounters, Hotel
+
+# Champs de Hotel agrégés dans les compteurs du dashboard
+HOTEL_TOTALS = {
+    'price_per_night': 'total_price',
+    'available_rooms': 'total_available_rooms',
+}
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def invalidate_hotel_list_cache(sender, **kwargs):
+    # Invalider tout de suite, puis après le commit pour écarter les pages
+    # recalculées par d'autres requêtes pendant la transaction
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def hotel_totals(instance):
+    # to_python : les valeurs assignées peuvent être des float ou des chaînes
+    return {
+        field: Hotel._meta.get_field(field).to_python(getattr(instance, field))
+        for field in HOTEL_TOTALS
+    }
+
+
+@receiver(post_init, sender=Hotel)
+def remember_hotel_totals(sender, instance, **kwargs):
+    # Valeurs chargées depuis la base, pour calculer les deltas à l'enregistrement
+    # (__dict__ évite de charger les champs différés par .only())
+    instance._dashboard_totals = {
+        field: instance.__dict__.get(field) for field in HOTEL_TOTALS
+    } if instance.pk else None
+
+
+@receiver(pre_save, sender=Hotel)
+def load_hotel_totals(sender, instance, **kwargs):
+    if instance._state.adding:
+        return
+    previous = getattr(instance, '_dashboard_totals', None)
+    if previous is None or None in previous.values():
+        previous = Hotel.objects.filter(pk=instance.pk).values(*HOTEL_TOTALS).first() or {}
+    instance._dashboard_totals = previous
+
+
+@receiver(post_save, sender=Hotel)
+def count_saved_hotel(sender, instance, created, **kwargs):
+    previous = {} if created else (instance._dashboard_totals or {})
+    current = hotel_totals(instance)
+    DashboardCounters.increment(
+        total_hotels=1 if created else 0,
+        **{
+            counter: current[field] - (previous.get(field) or 0)
+            for field, counter in HOTEL_TOTALS.items()
+        }
+    )
+    instance._dashboard_totals = current
+
+
+@receiver(post_delete, sender=Hotel)
+def count_deleted_hotel(sender, instance, **kwargs):
+    DashboardCounters.increment(
+        total_hotels=-1,
+        **{counter: -value for counter, value in zip(HOTEL_TOTALS.values(), hotel_totals(instance).values())}
+    )
+
+
+# Modèles simplement comptés (création / suppression)
+COUNTED_MODELS = {
+    get_user_model(): 'total_users',
+    Ticket: 'total_tickets',
+    Message: 'total_messages',
+    Email: 'total_emails',
+}
+
+
+def count_created(sender, created, **kwargs):
+    if created and not in_bulk_operation(sender):
+        DashboardCounters.increment(**{COUNTED_MODELS[sender]: 1})
+
+
+def count_deleted(sender, **kwargs):
+    if not in_bulk_operation(sender):
+        DashboardCounters.increment(**{COUNTED_MODELS[sender]: -1})
+
+
+for model in COUNTED_MODELS:
+    post_save.connect(count_created, sender=model, dispatch_uid=f'dashboard_count_created_{model._meta.label}')
+    post_delete.connect(count_deleted, sender=model, dispatch_uid=f'dashboard_count_deleted_{model._meta.label}')
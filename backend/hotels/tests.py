@@ -1,11 +1,33 @@
-from django.test import TestCase
+import base64
+import hashlib
+import io
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
-from .models import Hotel
+from PIL import Image as PILImage
+from blobs.backends import FileSystemBlobBackend
+from blobs.imaging import VARIANTS, variant_spec
+from blobs.models import Blob, BlobVariant
+from blobs.storage import store_bytes
+from django.core.management import call_command
+from emails.models import Email
+from messaging.models import Message
+from tickets.models import Ticket
+from .models import DashboardCounters, Hotel
 
 User = get_user_model()
 
+# Image PNG 1x1
+IMAGE_BASE64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+IMAGE_BYTES = base64.b64decode(IMAGE_BASE64.split(',', 1)[1])
+
 class HotelListTestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
@@ -135,3 +157,433 @@ class HotelCreateTestCase(TestCase):
         }
         response = self.client.post('/api/hotels/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+@override_settings(BLOB_DEFAULT_BACKEND='database')
+class HotelImageBlobTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.data = {
+            'name': 'Hotel Image',
+            'city': 'Dakar',
+            'address': 'Test Address',
+            'phone': '+221 33 869 00 00',
+            'email': 'image@hotel.sn',
+            'price_per_night': 100.00,
+            'image_base64': IMAGE_BASE64,
+        }
+
+    def test_create_stores_blob_and_returns_url(self):
+        response = self.client.post('/api/hotels/', self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('image_base64', response.data)
+        self.assertEqual(response.data['image_type'], 'png')
+        self.assertEqual(response.data['image_size'], len(IMAGE_BYTES))
+
+        hotel = Hotel.objects.get(pk=response.data['id'])
+        self.assertEqual(hotel.image_blob_id, hashlib.sha256(IMAGE_BYTES).hexdigest())
+
+        content = self.client.get(response.data['image_url'])
+        self.assertEqual(content.status_code, status.HTTP_200_OK)
+        self.assertEqual(content['Content-Type'], 'image/png')
+        self.assertEqual(b''.join(content), IMAGE_BYTES)
+
+    def test_identical_images_are_stored_once(self):
+        self.client.post('/api/hotels/', self.data, format='json')
+        self.client.post('/api/hotels/', dict(self.data, name='Hotel Copie'), format='json')
+        self.assertEqual(Hotel.objects.filter(image_blob__isnull=False).count(), 2)
+        self.assertEqual(Blob.objects.filter(content_type='image/png').count(), 1)
+        self.assertEqual(BlobVariant.objects.count(), len(VARIANTS))
+
+    def test_blank_image_removes_reference(self):
+        response = self.client.post('/api/hotels/', self.data, format='json')
+        response = self.client.patch(
+            f"/api/hotels/{response.data['id']}/", {'image_base64': ''}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['image_url'])
+        self.assertEqual(response.data['image_size'], 0)
+
+    def test_filesystem_backend_roundtrip(self):
+        with tempfile.TemporaryDirectory() as root:
+            backend = FileSystemBlobBackend(root=root)
+            key = hashlib.sha256(IMAGE_BYTES).hexdigest()
+            backend.save(key, IMAGE_BYTES)
+            backend.save(key, IMAGE_BYTES)
+            self.assertTrue(backend.exists(key))
+            self.assertEqual(backend.read(key), IMAGE_BYTES)
+
+@override_settings(BLOB_DEFAULT_BACKEND='database')
+class HotelImageEndpointTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.blob = store_bytes(IMAGE_BYTES, 'image/png')
+        self.hotel = Hotel.objects.create(
+            name='Test Hotel',
+            city='Dakar',
+            address='Test Address',
+            phone='+221 33 869 00 00',
+            email='test@hotel.sn',
+            price_per_night=100.00,
+            image_blob=self.blob,
+        )
+        self.url = f'/api/hotels/{self.hotel.id}/image/'
+
+    def test_image_is_streamed_with_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response['ETag'], f'"{self.blob.sha256}"')
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(b''.join(response.streaming_content), IMAGE_BYTES)
+
+    def test_if_none_match_returns_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.blob.sha256}"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Range'], f'bytes 0-9/{len(IMAGE_BYTES)}')
+        self.assertEqual(b''.join(response.streaming_content), IMAGE_BYTES[:10])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(b''.join(response.streaming_content), IMAGE_BYTES[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=1000-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+    def test_hotel_without_image(self):
+        self.hotel.image_blob = None
+        self.hotel.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+@override_settings(BLOB_DEFAULT_BACKEND='database')
+class HotelImageVariantTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        buffer = io.BytesIO()
+        PILImage.new('RGB', (1600, 1200), color=(200, 30, 30)).save(buffer, format='PNG')
+        self.image_bytes = buffer.getvalue()
+        self.data = {
+            'name': 'Hotel Variantes',
+            'city': 'Dakar',
+            'address': 'Test Address',
+            'phone': '+221 33 869 00 00',
+            'email': 'variants@hotel.sn',
+            'price_per_night': 100.00,
+            'image_base64': 'data:image/png;base64,' + base64.b64encode(self.image_bytes).decode(),
+        }
+
+    def test_upload_produces_variants(self):
+        response = self.client.post('/api/hotels/', self.data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        hotel = Hotel.objects.get(pk=response.data['id'])
+        specs = set(BlobVariant.objects.filter(source=hotel.image_blob).values_list('spec', flat=True))
+        self.assertEqual(specs, {variant_spec(name) for name in VARIANTS})
+
+        thumbnail = BlobVariant.objects.get(source=hotel.image_blob, spec=variant_spec('thumbnail'))
+        self.assertEqual((thumbnail.width, thumbnail.height), (400, 300))
+
+    def test_thumbnail_url_serves_webp(self):
+        response = self.client.post('/api/hotels/', self.data, format='json')
+        self.assertIn('variant=thumbnail', response.data['thumbnail_url'])
+        thumbnail = self.client.get(response.data['thumbnail_url'])
+        self.assertEqual(thumbnail.status_code, status.HTTP_200_OK)
+        self.assertEqual(thumbnail['Content-Type'], 'image/webp')
+        content = b''.join(thumbnail.streaming_content)
+        self.assertLess(len(content), len(self.image_bytes))
+        self.assertEqual(PILImage.open(io.BytesIO(content)).size, (400, 300))
+
+    def test_variants_are_generated_on_demand(self):
+        blob = store_bytes(self.image_bytes, 'image/png')
+        hotel = Hotel.objects.create(
+            name='Hotel Migré', city='Dakar', address='x', phone='1',
+            email='m@hotel.sn', price_per_night=10, image_blob=blob,
+        )
+        response = self.client.get(f'/api/hotels/{hotel.id}/image/?variant=card')
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertTrue(BlobVariant.objects.filter(source=blob, spec=variant_spec('card')).exists())
+
+    def test_unknown_variant(self):
+        response = self.client.post('/api/hotels/', self.data, format='json')
+        response = self.client.get(f"/api/hotels/{response.data['id']}/image/?variant=huge")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class HotelListProjectionTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(
+            name='Hotel Projection',
+            description='Une longue description',
+            city='Dakar',
+            address='Test Address',
+            phone='+221 33 869 00 00',
+            email='projection@hotel.sn',
+            price_per_night=100.00,
+        )
+
+    def test_list_uses_lean_projection(self):
+        response = self.client.get('/api/hotels/?city=Dakar')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        hotel = response.data['results'][0]
+        self.assertNotIn('description', hotel)
+        self.assertNotIn('image_url', hotel)
+        self.assertFalse(hotel['has_image'])
+        self.assertIsNone(hotel['thumbnail_url'])
+
+    def test_sparse_fieldset(self):
+        response = self.client.get('/api/hotels/?fields=name,description')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.hotel.id, 'name': 'Hotel Projection', 'description': 'Une longue description'},
+        )
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/hotels/?fields=name,image_base64')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_detail_keeps_full_representation(self):
+        response = self.client.get(f'/api/hotels/{self.hotel.id}/')
+        self.assertEqual(response.data['description'], 'Une longue description')
+        self.assertIn('image_url', response.data)
+
+class HotelCursorPaginationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        for i in range(5):
+            Hotel.objects.create(
+                name=f'Hotel {i}',
+                city='Saly',
+                address='Test Address',
+                phone='+221 33 869 00 00',
+                email=f'hotel{i}@hotel.sn',
+                price_per_night=100.00,
+            )
+
+    def test_cursor_pages_cover_all_rows(self):
+        url = '/api/hotels/?city=Saly&pagination=cursor&page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen += [hotel['id'] for hotel in response.data['results']]
+            url = response.data['next']
+        expected = list(Hotel.objects.order_by('-created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_page_number_remains_default(self):
+        response = self.client.get('/api/hotels/?city=Saly&page_size=2')
+        self.assertEqual(response.data['count'], 5)
+
+    def test_cursor_is_full_keyset_without_offset(self):
+        # Toutes les lignes partagent le même created_at : seul id les départage
+        Hotel.objects.update(created_at=timezone.now())
+        response = self.client.get('/api/hotels/?city=Saly&pagination=cursor&page_size=2')
+        first_page = [hotel['id'] for hotel in response.data['results']]
+        # Insertion concurrente en tête de liste : ni répétée, ni décalée
+        Hotel.objects.create(
+            name='Hotel Nouveau', city='Saly', address='Test Address', phone='+221 33 869 00 00',
+            email='nouveau@hotel.sn', price_per_night=100.00,
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(response.data['next'])
+        self.assertFalse(any('OFFSET' in query['sql'] for query in queries))
+        second_page = [hotel['id'] for hotel in response.data['results']]
+        expected = sorted(Hotel.objects.exclude(name='Hotel Nouveau').values_list('id', flat=True))
+        self.assertEqual(first_page + second_page, expected[:4])
+
+        # Lien précédent : retour à la première page
+        response = self.client.get(response.data['previous'])
+        self.assertEqual([hotel['id'] for hotel in response.data['results']], first_page)
+
+    def test_cursor_follows_ordering_filter(self):
+        url = '/api/hotels/?city=Saly&pagination=cursor&page_size=2&ordering=-price_per_night'
+        Hotel.objects.filter(name='Hotel 3').update(price_per_night=300)
+        seen = []
+        while url:
+            response = self.client.get(url)
+            seen += [hotel['id'] for hotel in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, list(Hotel.objects.order_by('-price_per_night', '-id').values_list('id', flat=True)))
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/hotels/?cursor=invalide')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class HotelListCacheTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(
+            name='Hotel Cache',
+            city='Thiès',
+            address='Test Address',
+            phone='+221 33 869 00 00',
+            email='cache@hotel.sn',
+            price_per_night=100.00,
+        )
+        self.url = '/api/hotels/?city=Thiès'
+
+    def test_list_is_served_from_cache(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_cache_is_shared_between_users(self):
+        self.client.get(self.url)
+        other = User.objects.create_user(username='other@example.com', email='other@example.com', password='x')
+        self.client.force_authenticate(user=other)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_writes_invalidate_cache(self):
+        self.client.get(self.url)
+        self.client.patch(f'/api/hotels/{self.hotel.id}/', {'name': 'Hotel Renommé'}, format='json')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'][0]['name'], 'Hotel Renommé')
+
+        self.client.delete(f'/api/hotels/{self.hotel.id}/')
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['results'], [])
+
+
+class DashboardCountersTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.hotel = Hotel.objects.create(
+            name='Hotel Compteurs',
+            city='Dakar',
+            address='Test Address',
+            phone='+221 33 869 00 00',
+            email='compteurs@hotel.sn',
+            price_per_night=100.00,
+            available_rooms=10,
+        )
+        # Première lecture : initialisation à partir des tables
+        DashboardCounters.load()
+
+    def create_hotel(self, **kwargs):
+        data = dict(
+            name='Hotel Test', city='Dakar', address='Test Address',
+            phone='+221 33 869 00 00', email='test@hotel.sn', price_per_night=50.00,
+        )
+        data.update(kwargs)
+        return Hotel.objects.create(**data)
+
+    def test_counters_follow_writes(self):
+        hotel = self.create_hotel(available_rooms=5)
+        Ticket.objects.create(title='Ticket', description='Test', user=self.user)
+        Message.objects.create(sender=self.user, recipient=self.user, content='Salut')
+        Email.objects.create(recipient='a@example.com', subject='Sujet', body='Corps')
+
+        counters = DashboardCounters.load()
+        self.assertEqual(counters.total_hotels, 2)
+        self.assertEqual(counters.total_users, 1)
+        self.assertEqual(counters.total_tickets, 1)
+        self.assertEqual(counters.total_messages, 1)
+        self.assertEqual(counters.total_emails, 1)
+        self.assertEqual(counters.total_price, Decimal('150.00'))
+        self.assertEqual(counters.total_available_rooms, 15)
+
+        hotel.price_per_night = Decimal('80.00')
+        hotel.available_rooms = 2
+        hotel.save()
+        counters.refresh_from_db()
+        self.assertEqual(counters.total_price, Decimal('180.00'))
+        self.assertEqual(counters.total_available_rooms, 12)
+
+        hotel.delete()
+        counters.refresh_from_db()
+        self.assertEqual(counters.total_hotels, 1)
+        self.assertEqual(counters.total_price, Decimal('100.00'))
+        self.assertEqual(counters.total_available_rooms, 10)
+
+    def test_update_of_deferred_instance(self):
+        hotel = Hotel.objects.only('id', 'name').get(pk=self.hotel.pk)
+        hotel.available_rooms = 4
+        hotel.save()
+        counters = DashboardCounters.load()
+        self.assertEqual(counters.total_available_rooms, 4)
+        self.assertEqual(counters.total_price, Decimal('100.00'))
+
+    def test_stats_endpoint_reads_counters(self):
+        self.client.get('/api/hotels/dashboard/stats/')
+        # Ligne des compteurs seulement, les hôtels mis en avant sont en cache
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/hotels/dashboard/stats/')
+        self.assertEqual(response.data['totalHotels'], 1)
+        self.assertEqual(response.data['totalReservations'], 10)
+        self.assertEqual(response.data['totalRevenue'], 0.1)
+        self.assertEqual(response.data['popularHotels'][0]['name'], 'Hotel Compteurs')
+
+        self.create_hotel(name='Hotel Récent')
+        response = self.client.get('/api/hotels/dashboard/stats/')
+        self.assertEqual(response.data['totalHotels'], 2)
+        self.assertEqual(response.data['recentActivities'][0]['description'], 'Hôtel "Hotel Récent" créé')
+
+    def test_stats_cold_path_query_count(self):
+        for rating in (3.0, 4.5, 4.9, 1.0, 2.0, 5.0):
+            self.create_hotel(name=f'Hotel {rating}', rating=rating, available_rooms=int(rating))
+        # Les écritures ont invalidé les hôtels mis en avant
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/hotels/dashboard/stats/')
+        self.assertEqual(
+            [hotel['name'] for hotel in response.data['popularHotels']],
+            ['Hotel 5.0', 'Hotel 4.9', 'Hotel 4.5', 'Hotel 3.0', 'Hotel 2.0'],
+        )
+        self.assertEqual(
+            [activity['description'] for activity in response.data['recentActivities'][:3]],
+            ['Hôtel "Hotel 5.0" créé', 'Hôtel "Hotel 2.0" créé', 'Hôtel "Hotel 1.0" créé'],
+        )
+
+    def test_reconcile_fixes_drift(self):
+        DashboardCounters.objects.filter(pk=1).update(total_hotels=42, total_emails=-3)
+        out = StringIO()
+        call_command('reconcile_dashboard_counters', '--dry-run', stdout=out)
+        self.assertIn('total_hotels: 42 -> 1', out.getvalue())
+        self.assertEqual(DashboardCounters.load().total_hotels, 42)
+
+        call_command('reconcile_dashboard_counters', stdout=StringIO())
+        counters = DashboardCounters.load()
+        self.assertEqual(counters.total_hotels, 1)
+        self.assertEqual(counters.total_emails, 0)
@@ -1,17 +1,21 @@
 from rest_framework import viewsets, filters, status
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
-from django.views.decorators.cache import cache_page
-from django.utils.decorators import method_decorator
+from django.http import Http404
 import logging
+from config.cache import get_or_compute
+from config.pagination import DefaultPagination
+from blobs.http import blob_response
+from blobs.imaging import VARIANTS, get_variant
+from .cache import LIST_TIMEOUT, list_cache_key
 from .models import Hotel
-from .serializers import HotelSerializer
+from .serializers import HotelSerializer, HotelListSerializer
 
 logger = logging.getLogger(__name__)
 
-class HotelPagination(PageNumberPagination):
+class HotelPagination(DefaultPagination):
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 100
@@ -25,11 +29,36 @@ class HotelViewSet(viewsets.ModelViewSet):
     filterset_fields = ['city', 'is_active']
     search_fields = ['name', 'city', 'address']
     ordering_fields = ['price_per_night', 'rating', 'created_at']
-    ordering = ['-created_at']
+    ordering = ['-created_at', 'id']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # Ne charger que les colonnes de la projection demandée
+            queryset = queryset.only(*HotelListSerializer.columns(self.request.query_params.get('fields')))
+        elif self.action == 'image':
+            queryset = queryset.select_related('image_blob')
+        return queryset
+    
+    def get_serializer_class(self):
+        # Projection légère pour la liste, représentation complète ailleurs
+        if self.action == 'list':
+            return HotelListSerializer
+        return HotelSerializer
+    
+    def get_serializer(self, *args, **kwargs):
+        if self.action == 'list':
+            kwargs['fields'] = self.request.query_params.get('fields')
+        return super().get_serializer(*args, **kwargs)
     
-    @method_decorator(cache_page(60 * 5))  # Cache 5 minutes
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Cache partagé entre utilisateurs, invalidé à chaque écriture (voir signals)
+        data = get_or_compute(
+            list_cache_key(request),
+            lambda: super(HotelViewSet, self).list(request, *args, **kwargs).data,
+            LIST_TIMEOUT,
+        )
+        return Response(data)
     
     def create(self, request, *args, **kwargs):
         logger.debug(f"Create hotel request data: {request.data}")
@@ -49,3 +78,25 @@ class HotelViewSet(viewsets.ModelViewSet):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         self.perform_update(serializer)
         return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], permission_classes=[AllowAny])
+    def image(self, request, pk=None):
+        """
+        Servir les octets de l'image de l'hôtel
+        GET /api/hotels/{id}/image/?variant=thumbnail
+        Public pour pouvoir être utilisé directement dans une balise <img>.
+        """
+        hotel = self.get_object()
+        if not hotel.image_blob_id:
+            raise Http404("Cet hôtel n'a pas d'image")
+        blob = hotel.image_blob
+        variant = request.query_params.get('variant')
+        if variant:
+            if variant not in VARIANTS:
+                raise Http404("Variante inconnue")
+            blob = get_variant(blob, variant)
+        return blob_response(
+            request,
+            blob,
+            cache_control={'public': True, 'max_age': 60 * 5},
+        )
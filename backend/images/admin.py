@@ -9,14 +9,14 @@ class ImageAdmin(admin.ModelAdmin):
     list_display = ('title', 'image_type', 'get_size_mb', 'user', 'is_active', 'created_at')
     list_filter = ('image_type', 'is_active', 'created_at')
     search_fields = ('title', 'description', 'user__email')
-    readonly_fields = ('image_size', 'image_type', 'image_width', 'image_height', 'created_at', 'updated_at')
+    readonly_fields = ('image_blob', 'image_size', 'image_type', 'image_width', 'image_height', 'created_at', 'updated_at')
     
     fieldsets = (
         ('Informations', {
             'fields': ('title', 'description', 'user')
         }),
         ('Image', {
-            'fields': ('image_base64', 'image_type', 'image_size', 'image_width', 'image_height')
+            'fields': ('image_blob', 'image_type', 'image_size', 'image_width', 'image_height')
         }),
         ('Statut', {
             'fields': ('is_active',)
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('blobs', '0001_initial'),
+        ('hotels', '0008_remove_hotel_image_base64'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Image',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(db_index=True, max_length=255)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('image_type', models.CharField(choices=[('jpeg', 'JPEG'), ('png', 'PNG'), ('gif', 'GIF'), ('webp', 'WebP'), ('svg', 'SVG')], db_index=True, default='jpeg', max_length=50)),
+                ('image_size', models.IntegerField(default=0)),
+                ('image_width', models.IntegerField(blank=True, null=True)),
+                ('image_height', models.IntegerField(blank=True, null=True)),
+                ('is_active', models.BooleanField(db_index=True, default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('image_blob', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='blobs.blob')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Image',
+                'verbose_name_plural': 'Images',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HotelImage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order', models.IntegerField(default=0)),
+                ('is_primary', models.BooleanField(db_index=True, default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='images', to='hotels.hotel')),
+                ('image', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='images.image')),
+            ],
+            options={
+                'verbose_name': 'Image Hôtel',
+                'verbose_name_plural': 'Images Hôtels',
+                'ordering': ['order'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['user', 'is_active'], name='images_imag_user_id_526d40_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['image_type'], name='images_imag_image_t_eb6fe4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='image',
+            index=models.Index(fields=['-created_at'], name='images_imag_created_62db75_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='hotelimage',
+            unique_together={('hotel', 'image')},
+        ),
+    ]
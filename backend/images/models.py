@@ -5,18 +5,20 @@ User = get_user_model()
 
 class Image(models.Model):
     """
-    Modèle pour stocker les images en base64
-    - Pas de stockage de fichiers
-    - Tout en base de données
+    Modèle pour les images envoyées en base64
+    - Les octets décodés vivent dans le stockage de blobs
+    - La ligne ne contient que les métadonnées
     """
     
     # Champs de base
     title = models.CharField(max_length=255, db_index=True)
     description = models.TextField(blank=True, null=True)
     
-    # Image en base64 (TextField pour stocker de grandes données)
-    image_base64 = models.TextField(
-        help_text="Image encodée en base64 (data:image/jpeg;base64,...)"
+    # Contenu de l'image (octets décodés, adressés par SHA-256)
+    image_blob = models.ForeignKey(
+        'blobs.Blob',
+        on_delete=models.PROTECT,
+        related_name='+'
     )
     
     # Métadonnées
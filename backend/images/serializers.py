@@ -1,16 +1,45 @@
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core import signing
+from django.urls import reverse
 from rest_framework import serializers
+from blobs.imaging import process_image
+from blobs.storage import decode_data_url, store_bytes
 from .models import Image, HotelImage
-import base64
-import imghdr
-from django.core.files.base import ContentFile
+
+
+IMAGE_URL_SALT = 'images.raw'
+
+
+def sign_image(image):
+    """Signature de l'URL d'une image : chargeable par <img src> (sans en-tête Authorization)"""
+    return signing.dumps([image.pk, image.image_blob_id], salt=IMAGE_URL_SALT)
+
+
+def check_image_signature(token, image_id):
+    """Identifiant du blob signé pour cette image, ou None (signature invalide ou expirée)"""
+    try:
+        signed_id, blob_id = signing.loads(token, salt=IMAGE_URL_SALT, max_age=settings.IMAGE_URL_MAX_AGE)
+    except (signing.BadSignature, ValueError, TypeError):
+        return None
+    return blob_id if str(signed_id) == str(image_id) else None
+
+
+def raw_image_url(serializer, obj):
+    """URL absolue et signée du contenu binaire d'une image"""
+    url = f"{reverse('image-raw', args=[obj.pk])}?{urlencode({'sig': sign_image(obj)})}"
+    request = serializer.context.get('request')
+    return request.build_absolute_uri(url) if request else url
+
 
 class ImageSerializer(serializers.ModelSerializer):
     """
-    Serializer pour les images en base64
+    Serializer pour les images
     - Accepte base64 en entrée
-    - Retourne base64 en sortie
+    - Retourne l'URL du contenu binaire en sortie
     """
     
+    image_base64 = serializers.CharField(write_only=True)
     image_size_mb = serializers.SerializerMethodField()
     image_url = serializers.SerializerMethodField()
     
@@ -28,95 +57,62 @@ class ImageSerializer(serializers.ModelSerializer):
         return obj.get_image_size_mb()
     
     def get_image_url(self, obj):
-        """Retourner l'URL de l'image (data URL)"""
-        if obj.image_base64:
-            return obj.image_base64
-        return None
+        """Retourner l'URL du contenu binaire de l'image"""
+        return raw_image_url(self, obj)
     
     def validate_image_base64(self, value):
         """
-        Valider et traiter l'image base64
+        Valider et décoder l'image base64
         - Extraire le type d'image
-        - Calculer la taille
-        - Valider le format
+        - Valider le format et la taille
         """
         if not value:
             raise serializers.ValidationError("L'image ne peut pas être vide")
         
         # Vérifier si c'est un data URL
-        if value.startswith('data:'):
-            try:
-                # Extraire le type et les données
-                header, data = value.split(',', 1)
-                # Extraire le type MIME (ex: data:image/jpeg;base64)
-                mime_type = header.split(':')[1].split(';')[0]
-                
-                # Valider le type MIME
-                if not mime_type.startswith('image/'):
-                    raise serializers.ValidationError("Le fichier doit être une image")
-                
-                # Décoder et valider
-                try:
-                    image_data = base64.b64decode(data)
-                except Exception:
-                    raise serializers.ValidationError("Le base64 est invalide")
-                
-                # Vérifier la taille (max 10 MB)
-                if len(image_data) > 10 * 1024 * 1024:
-                    raise serializers.ValidationError("L'image ne doit pas dépasser 10 MB")
-                
-                return value
-            except ValueError:
-                raise serializers.ValidationError("Format base64 invalide")
-        else:
+        if not value.startswith('data:'):
             # Si ce n'est pas un data URL, le rejeter
             raise serializers.ValidationError("L'image doit être au format base64 (data:image/...;base64,...)")
-    
-    def create(self, validated_data):
-        """Créer une image et extraire les métadonnées"""
-        image_base64 = validated_data['image_base64']
         
-        # Extraire les métadonnées
-        header, data = image_base64.split(',', 1)
-        mime_type = header.split(':')[1].split(';')[0]
-        image_type = mime_type.split('/')[1]
+        try:
+            mime_type, image_data = decode_data_url(value)
+        except (ValueError, IndexError):
+            raise serializers.ValidationError("Le base64 est invalide")
         
-        # Décoder pour obtenir la taille
-        image_data = base64.b64decode(data)
-        image_size = len(image_data)
+        # Valider le type MIME
+        if not mime_type.startswith('image/'):
+            raise serializers.ValidationError("Le fichier doit être une image")
         
-        # Créer un fichier temporaire pour obtenir les dimensions
-        temp_file = ContentFile(image_data)
+        # Vérifier la taille (max 10 MB)
+        if len(image_data) > 10 * 1024 * 1024:
+            raise serializers.ValidationError("L'image ne doit pas dépasser 10 MB")
         
-        # Ajouter les métadonnées
-        validated_data['image_type'] = image_type
-        validated_data['image_size'] = image_size
+        return mime_type, image_data
+    
+    def _store_image(self, validated_data):
+        """Enregistrer l'image décodée dans le stockage de blobs"""
+        mime_type, image_data = validated_data.pop('image_base64')
+        blob = store_bytes(image_data, mime_type)
+        # Décoder une seule fois : dimensions + variantes redimensionnées
+        width, height = process_image(blob, image_data)
+        validated_data['image_blob'] = blob
+        validated_data['image_width'] = width
+        validated_data['image_height'] = height
+        validated_data['image_type'] = mime_type.split('/')[1]
+        validated_data['image_size'] = len(image_data)
+    
+    def create(self, validated_data):
+        """Créer une image et extraire les métadonnées"""
+        self._store_image(validated_data)
         validated_data['user'] = self.context['request'].user
-        
-        # Créer l'image
-        image = Image.objects.create(**validated_data)
-        
-        return image
+        return Image.objects.create(**validated_data)
     
     def update(self, instance, validated_data):
         """Mettre à jour une image"""
         if 'image_base64' in validated_data:
-            image_base64 = validated_data['image_base64']
-            
-            # Extraire les métadonnées
-            header, data = image_base64.split(',', 1)
-            mime_type = header.split(':')[1].split(';')[0]
-            image_type = mime_type.split('/')[1]
-            
-            # Décoder pour obtenir la taille
-            image_data = base64.b64decode(data)
-            image_size = len(image_data)
-            
-            # Mettre à jour les métadonnées
-            instance.image_type = image_type
-            instance.image_size = image_size
+            self._store_image(validated_data)
         
-        # Mettre à jour les autres champs
+        # Mettre à jour les champs
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
@@ -139,13 +135,17 @@ class ImageListSerializer(serializers.ModelSerializer):
     """Serializer simplifié pour la liste des images"""
     
     image_size_mb = serializers.SerializerMethodField()
+    image_url = serializers.SerializerMethodField()
     
     class Meta:
         model = Image
         fields = (
-            'id', 'title', 'image_base64', 'image_type',
+            'id', 'title', 'image_url', 'image_type',
             'image_size_mb', 'is_active', 'created_at'
         )
     
     def get_image_size_mb(self, obj):
         return obj.get_image_size_mb()
+    
+    def get_image_url(self, obj):
+        return raw_image_url(self, obj)
@@ -0,0 +1,66 @@
+from urllib.parse import urlsplit
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+
+User = get_user_model()
+
+# Image PNG 1x1
+IMAGE_BASE64 = "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+
+
+@override_settings(BLOB_DEFAULT_BACKEND='database')
+class ImageRawUrlTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='owner@example.com',
+            email='owner@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            '/api/images/', {'title': 'Photo', 'image_base64': IMAGE_BASE64}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.image_id = response.data['id']
+        self.image_url = response.data['image_url']
+        self.client.force_authenticate(user=None)
+
+    def test_signed_url_loads_without_credentials(self):
+        # <img src> n'envoie pas d'en-tête Authorization
+        response = self.client.get(self.image_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age', response['Cache-Control'])
+
+    def test_unsigned_or_tampered_url_is_refused(self):
+        path = urlsplit(self.image_url).path
+        self.assertEqual(self.client.get(path).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(path, {'sig': 'invalide'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_signature_is_bound_to_image(self):
+        other = User.objects.create_user(
+            username='other@example.com', email='other@example.com', password='testpass123'
+        )
+        self.client.force_authenticate(user=other)
+        response = self.client.post(
+            '/api/images/', {'title': 'Autre', 'image_base64': IMAGE_BASE64}, format='json'
+        )
+        self.client.force_authenticate(user=None)
+        query = urlsplit(self.image_url).query
+        response = self.client.get(f"/api/images/{response.data['id']}/raw/?{query}")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_owner_can_load_without_signature(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(urlsplit(self.image_url).path)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(IMAGE_URL_MAX_AGE=-1)
+    def test_expired_signature_is_refused(self):
+        response = self.client.get(self.image_url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
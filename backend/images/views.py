@@ -1,10 +1,15 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from blobs.http import blob_response
+from blobs.imaging import VARIANTS, get_variant
 from .models import Image, HotelImage
-from .serializers import ImageSerializer, HotelImageSerializer, ImageListSerializer
+from .serializers import ImageSerializer, HotelImageSerializer, ImageListSerializer, check_image_signature
 
 
 class ImageViewSet(viewsets.ModelViewSet):
@@ -17,13 +22,17 @@ class ImageViewSet(viewsets.ModelViewSet):
     - GET /api/images/{id}/ - Récupérer une image
     - PATCH /api/images/{id}/ - Mettre à jour une image
     - DELETE /api/images/{id}/ - Supprimer une image
+    - GET /api/images/{id}/raw/?sig=... - Contenu binaire de l'image (URL signée de image_url)
     """
     
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
         """Retourner les images de l'utilisateur connecté"""
-        return Image.objects.filter(user=self.request.user)
+        queryset = Image.objects.filter(user=self.request.user)
+        if self.action in ('raw', 'download'):
+            queryset = queryset.select_related('image_blob')
+        return queryset
     
     def get_serializer_class(self):
         """Utiliser un serializer différent pour la liste"""
@@ -85,19 +94,49 @@ class ImageViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
     
+    @action(detail=True, methods=['get'], permission_classes=[AllowAny])
+    def raw(self, request, pk=None):
+        """
+        Contenu binaire de l'image (ETag, 304, Range)
+        GET /api/images/{id}/raw/?sig=...&variant=card
+        - ?sig= : URL signée renvoyée dans image_url, utilisable dans <img src>
+          (IMAGE_URL_MAX_AGE secondes, liée au contenu courant de l'image)
+        - sinon : propriétaire authentifié
+        """
+        token = request.query_params.get('sig')
+        if token:
+            blob_id = check_image_signature(token, pk)
+            image = get_object_or_404(Image.objects.select_related('image_blob'), pk=pk, image_blob_id=blob_id)
+        elif request.user and request.user.is_authenticated:
+            image = self.get_object()
+        else:
+            raise NotAuthenticated()
+        blob = image.image_blob
+        variant = request.query_params.get('variant')
+        if variant:
+            if variant not in VARIANTS:
+                raise Http404("Variante inconnue")
+            blob = get_variant(blob, variant)
+        # URL signée : le contenu ne change pas pour une même signature
+        if token:
+            cache_control = {'private': True, 'max_age': settings.IMAGE_URL_MAX_AGE}
+        else:
+            cache_control = {'private': True, 'no_cache': True}
+        return blob_response(request, blob, cache_control=cache_control)
+    
     @action(detail=True, methods=['get'])
     def download(self, request, pk=None):
         """
-        Télécharger l'image en base64
+        Télécharger l'image (fichier binaire en pièce jointe)
         GET /api/images/{id}/download/
         """
         image = self.get_object()
-        return Response({
-            'title': image.title,
-            'image_base64': image.image_base64,
-            'image_type': image.image_type,
-            'image_size_mb': image.get_image_size_mb()
-        })
+        return blob_response(
+            request,
+            image.image_blob,
+            cache_control={'private': True, 'no_cache': True},
+            filename=f"{image.title}.{image.image_type}",
+        )
     
     @action(detail=False, methods=['post'])
     def bulk_delete(self, request):
@@ -1,9 +1,15 @@
 from django.contrib import admin
-from .models import Message
+from .models import Conversation, Message
 
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     list_display = ('sender', 'recipient', 'is_read', 'created_at')
     list_filter = ('is_read', 'created_at')
     search_fields = ('sender__email', 'recipient__email', 'content')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('conversation', 'created_at', 'updated_at')
+
+@admin.register(Conversation)
+class ConversationAdmin(admin.ModelAdmin):
+    list_display = ('user_a', 'user_b', 'last_message_at', 'unread_a', 'unread_b')
+    search_fields = ('user_a__email', 'user_b__email')
+    readonly_fields = ('last_message', 'last_message_at', 'last_message_preview', 'unread_a', 'unread_b', 'created_at')
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from messaging.models import MessageTombstone
+from messaging.sync import TOMBSTONE_RETENTION
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprimer les traces de messages supprimés plus anciennes que la rétention "
+        "(MESSAGE_TOMBSTONE_RETENTION_DAYS). Les jetons de synchronisation plus "
+        "anciens repartent d'une synchronisation complète."
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = MessageTombstone.objects.filter(
+            deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} trace(s) supprimée(s)"))
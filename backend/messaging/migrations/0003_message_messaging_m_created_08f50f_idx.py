@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['-created_at', 'id'], name='messaging_m_created_08f50f_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+from django.db.models import Count, F, Q
+
+
+def create_conversations(apps, schema_editor):
+    """Regrouper les messages existants par paire d'utilisateurs"""
+    Conversation = apps.get_model('messaging', 'Conversation')
+    Message = apps.get_model('messaging', 'Message')
+
+    pairs = set()
+    for sender_id, recipient_id in Message.objects.order_by().values_list('sender_id', 'recipient_id').distinct():
+        pairs.add((min(sender_id, recipient_id), max(sender_id, recipient_id)))
+
+    for user_a_id, user_b_id in sorted(pairs):
+        conversation, _ = Conversation.objects.get_or_create(user_a_id=user_a_id, user_b_id=user_b_id)
+        messages = Message.objects.filter(
+            Q(sender_id=user_a_id, recipient_id=user_b_id) | Q(sender_id=user_b_id, recipient_id=user_a_id)
+        )
+        messages.update(conversation=conversation)
+
+        last = messages.order_by('-created_at', '-id').first()
+        unread = dict(
+            messages.filter(is_read=False)
+            .exclude(sender=F('recipient'))
+            .order_by()
+            .values_list('recipient_id')
+            .annotate(count=Count('id'))
+        )
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message=last,
+            last_message_at=last.created_at,
+            last_message_preview=last.content[:100],
+            unread_a=unread.get(user_a_id, 0),
+            unread_b=unread.get(user_b_id, 0),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0005_conversation'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_conversations, migrations.RunPython.noop),
+    ]
@@ -3,7 +3,52 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+class Conversation(models.Model):
+    """
+    Fil de discussion entre deux utilisateurs
+    - user_a a toujours l'id le plus petit (paire non ordonnée unique)
+    - Dernier message et compteurs de non-lus dénormalisés,
+      tenus à jour par messaging.services
+    """
+    PREVIEW_LENGTH = 100
+
+    user_a = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    user_b = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    last_message = models.ForeignKey('Message', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_message_preview = models.CharField(max_length=PREVIEW_LENGTH, blank=True)
+    # Messages non lus reçus par user_a / user_b
+    unread_a = models.PositiveIntegerField(default=0)
+    unread_b = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-last_message_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user_a', 'user_b'], name='unique_conversation_pair'),
+            models.CheckConstraint(condition=models.Q(user_a__lte=models.F('user_b')), name='conversation_pair_ordered'),
+        ]
+        indexes = [
+            # Liste des fils d'un utilisateur, du plus récent au plus ancien
+            models.Index(fields=['user_a', '-last_message_at']),
+            models.Index(fields=['user_b', '-last_message_at']),
+        ]
+
+    def __str__(self):
+        return f"Conversation between {self.user_a} and {self.user_b}"
+
+    def unread_for(self, user_id):
+        """Nombre de messages non lus d'un participant"""
+        return self.unread_a if user_id == self.user_a_id else self.unread_b
+
+    def other_user(self, user):
+        return self.user_b if user.pk == self.user_a_id else self.user_a
+
+
 class Message(models.Model):
+    conversation = models.ForeignKey(
+        Conversation, on_delete=models.CASCADE, null=True, blank=True, related_name='messages'
+    )
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     content = models.TextField()
@@ -13,6 +58,37 @@ class Message(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Pagination par curseur (keyset)
+            models.Index(fields=['-created_at', 'id']),
+            # Branches envoyés / reçus de la liste des messages
+            models.Index(fields=['sender', '-created_at']),
+            models.Index(fields=['recipient', '-created_at']),
+            # Synchronisation incrémentale (?sync_token=)
+            models.Index(fields=['recipient', 'updated_at', 'id']),
+            models.Index(fields=['sender', 'updated_at', 'id']),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender} to {self.recipient}"
+
+
+class MessageTombstone(models.Model):
+    """
+    Trace d'un message supprimé, pour la synchronisation incrémentale
+    Identifiants simples (pas de clés étrangères) : la trace survit
+    à la suppression des utilisateurs et de la conversation.
+    """
+    message_id = models.BigIntegerField()
+    sender_id = models.BigIntegerField()
+    recipient_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['recipient_id', 'id']),
+            models.Index(fields=['sender_id', 'id']),
+        ]
+
+    def __str__(self):
+        return f"Deleted message {self.message_id}"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Message
+from .models import Conversation, Message
+from .services import BULK_LIMIT
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -16,8 +17,8 @@ class MessageSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Message
-        fields = ('id', 'sender', 'recipient', 'recipient_id', 'content', 'is_read', 'created_at', 'updated_at')
-        read_only_fields = ('id', 'sender', 'created_at', 'updated_at')
+        fields = ('id', 'conversation', 'sender', 'recipient', 'recipient_id', 'content', 'is_read', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'conversation', 'sender', 'created_at', 'updated_at')
 
     def create(self, validated_data):
         recipient_id = validated_data.pop('recipient_id', None)
@@ -33,3 +34,53 @@ class MessageSerializer(serializers.ModelSerializer):
             except User.DoesNotExist:
                 raise serializers.ValidationError("Le destinataire n'existe pas")
         return value
+
+
+class ConversationSerializer(serializers.ModelSerializer):
+    """Fil de discussion vu par l'utilisateur courant"""
+    participant = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Conversation
+        fields = ('id', 'participant', 'last_message_id', 'last_message_at', 'last_message_preview', 'unread_count')
+        read_only_fields = fields
+
+    def get_participant(self, obj):
+        return UserSerializer(obj.other_user(self.context['request'].user)).data
+
+    def get_unread_count(self, obj):
+        return obj.unread_for(self.context['request'].user.pk)
+
+
+class MarkReadSerializer(serializers.Serializer):
+    """Liste d'ids, ou tous les messages d'un fil jusqu'à up_to (inclus)"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False, max_length=BULK_LIMIT)
+    conversation = serializers.IntegerField(required=False)
+    up_to = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if ('ids' in attrs) == ('conversation' in attrs):
+            raise serializers.ValidationError("Indiquer soit ids, soit conversation")
+        if 'up_to' in attrs and 'conversation' not in attrs:
+            raise serializers.ValidationError({'up_to': "up_to nécessite conversation"})
+        return attrs
+
+
+class BulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=BULK_LIMIT)
+
+
+class BulkSendSerializer(serializers.Serializer):
+    """Un même contenu envoyé à plusieurs destinataires"""
+    recipient_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=BULK_LIMIT)
+    content = serializers.CharField()
+
+    def validate_recipient_ids(self, value):
+        """Vérifier que les destinataires existent (une seule requête)"""
+        recipient_ids = list(dict.fromkeys(value))
+        existing = set(User.objects.filter(id__in=recipient_ids).values_list('id', flat=True))
+        missing = [recipient_id for recipient_id in recipient_ids if recipient_id not in existing]
+        if missing:
+            raise serializers.ValidationError(f"Destinataires inexistants : {missing}")
+        return recipient_ids
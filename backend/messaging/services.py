@@ -0,0 +1,214 @@
+"""
+Maintenance des fils de discussion (Conversation)
+
+Appelé par les signaux de Message et par les opérations en masse :
+le dernier message et les compteurs de non-lus restent cohérents
+sans jamais parcourir tous les messages d'un utilisateur.
+
+Les opérations en masse (mark_read, delete_messages, send_to_many) font
+la même maintenance une seule fois par lot, en quelques requêtes.
+"""
+from collections import Counter, defaultdict
+from django.db import transaction
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from config.bulk import bulk_operation
+from hotels.models import DashboardCounters
+from realtime.hub import publish
+from .models import Conversation, Message, MessageTombstone
+
+# Nombre maximum de messages / destinataires par opération en masse
+BULK_LIMIT = 500
+
+
+def participants(sender_id, recipient_id):
+    """Paire ordonnée (user_a, user_b) d'une conversation"""
+    return min(sender_id, recipient_id), max(sender_id, recipient_id)
+
+
+def unread_field(message):
+    """Compteur de non-lus du destinataire d'un message"""
+    user_a_id, _ = participants(message.sender_id, message.recipient_id)
+    return 'unread_a' if message.recipient_id == user_a_id else 'unread_b'
+
+
+def counts_as_unread(message):
+    # Les notes envoyées à soi-même ne sont jamais « non lues »
+    return not message.is_read and message.sender_id != message.recipient_id
+
+
+def preview(content):
+    return content[:Conversation.PREVIEW_LENGTH]
+
+
+def get_conversation(sender_id, recipient_id):
+    """Conversation entre deux utilisateurs, créée au besoin"""
+    user_a_id, user_b_id = participants(sender_id, recipient_id)
+    conversation, _ = Conversation.objects.get_or_create(user_a_id=user_a_id, user_b_id=user_b_id)
+    return conversation
+
+
+def record_message(message):
+    """Nouveau message : dernier message du fil et non-lus du destinataire"""
+    updates = {
+        'last_message': message,
+        'last_message_at': message.created_at,
+        'last_message_preview': preview(message.content),
+    }
+    if counts_as_unread(message):
+        field = unread_field(message)
+        updates[field] = F(field) + 1
+    Conversation.objects.filter(pk=message.conversation_id).update(**updates)
+
+
+def adjust_unread(message, delta):
+    """Ajuster le compteur de non-lus après un changement de is_read"""
+    if message.conversation_id is None or message.sender_id == message.recipient_id:
+        return
+    field = unread_field(message)
+    Conversation.objects.filter(pk=message.conversation_id).update(
+        **{field: Greatest(F(field) + delta, Value(0))}
+    )
+
+
+def refresh_conversations(conversation_ids):
+    """
+    Recalculer dernier message et non-lus à partir des messages
+    (suppressions, opérations en masse, réparation)
+    """
+    conversations = Conversation.objects.filter(pk__in=set(conversation_ids)).only('id', 'user_a_id', 'user_b_id')
+    for conversation in conversations:
+        messages = Message.objects.filter(conversation=conversation)
+        last = messages.order_by('-created_at', '-id').only('id', 'content', 'created_at').first()
+        unread = dict(
+            messages.filter(is_read=False)
+            .exclude(sender=F('recipient'))
+            .order_by()
+            .values_list('recipient_id')
+            .annotate(count=Count('id'))
+        )
+        Conversation.objects.filter(pk=conversation.pk).update(
+            last_message=last,
+            last_message_at=last.created_at if last else None,
+            last_message_preview=preview(last.content) if last else '',
+            unread_a=unread.get(conversation.user_a_id, 0),
+            unread_b=unread.get(conversation.user_b_id, 0),
+        )
+
+
+def get_conversations(sender_id, recipient_ids):
+    """Conversations de sender avec chaque destinataire, créées au besoin (par lot)"""
+    pairs = {recipient_id: participants(sender_id, recipient_id) for recipient_id in recipient_ids}
+    Conversation.objects.bulk_create(
+        [Conversation(user_a_id=user_a_id, user_b_id=user_b_id) for user_a_id, user_b_id in set(pairs.values())],
+        ignore_conflicts=True,
+    )
+    conversations = Conversation.objects.filter(
+        Q(user_a_id=sender_id, user_b_id__in=pairs) | Q(user_b_id=sender_id, user_a_id__in=pairs)
+    )
+    by_pair = {(conversation.user_a_id, conversation.user_b_id): conversation for conversation in conversations}
+    return {recipient_id: by_pair[pair] for recipient_id, pair in pairs.items()}
+
+
+def send_to_many(sender, recipient_ids, content):
+    """Envoyer un même message à plusieurs destinataires (bulk_create)"""
+    with transaction.atomic():
+        conversations = get_conversations(sender.pk, recipient_ids)
+        messages = Message.objects.bulk_create([
+            Message(conversation=conversations[recipient_id], sender=sender, recipient_id=recipient_id, content=content)
+            for recipient_id in recipient_ids
+        ])
+        for message in messages:
+            conversation = message.conversation
+            conversation.last_message = message
+            conversation.last_message_at = message.created_at
+            conversation.last_message_preview = preview(content)
+            if counts_as_unread(message):
+                field = unread_field(message)
+                setattr(conversation, field, F(field) + 1)
+        Conversation.objects.bulk_update(
+            [message.conversation for message in messages],
+            ['last_message', 'last_message_at', 'last_message_preview', 'unread_a', 'unread_b'],
+        )
+        DashboardCounters.increment(total_messages=len(messages))
+
+    for message in messages:
+        publish(
+            'message.created',
+            {'id': message.pk, 'conversation': message.conversation_id, 'sender': sender.pk, 'recipient': message.recipient_id},
+            users={sender.pk, message.recipient_id},
+        )
+    publish('dashboard.changed', {'model': Message._meta.label_lower})
+    return messages
+
+
+def mark_read(user, queryset):
+    """
+    Marquer lus les messages reçus par user parmi queryset
+    Un seul UPDATE ... WHERE recipient = user, puis un décrément par fil.
+    Retourne les identifiants effectivement modifiés.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.filter(recipient=user, is_read=False)
+            .select_for_update()
+            .order_by()
+            .values_list('id', 'conversation_id', 'sender_id')
+        )
+        ids = [message_id for message_id, _, _ in rows]
+        if not ids:
+            return []
+        # update() ne touche pas auto_now : updated_at explicite pour la synchronisation
+        Message.objects.filter(id__in=ids).update(is_read=True, updated_at=timezone.now())
+
+        read_per_conversation = Counter(
+            (conversation_id, sender_id)
+            for _, conversation_id, sender_id in rows
+            if conversation_id is not None and sender_id != user.pk
+        )
+        for (conversation_id, sender_id), count in read_per_conversation.items():
+            field = 'unread_a' if user.pk == participants(sender_id, user.pk)[0] else 'unread_b'
+            Conversation.objects.filter(pk=conversation_id).update(
+                **{field: Greatest(F(field) - count, Value(0))}
+            )
+
+    ids_by_sender = defaultdict(list)
+    for message_id, _, sender_id in rows:
+        ids_by_sender[sender_id].append(message_id)
+    publish('messages.read', {'ids': ids}, users={user.pk})
+    for sender_id, sender_ids in ids_by_sender.items():
+        if sender_id != user.pk:
+            publish('messages.read', {'ids': sender_ids}, users={sender_id})
+    return ids
+
+
+def delete_messages(queryset):
+    """
+    Supprimer un lot de messages
+    Traces de suppression, fils et compteurs mis à jour une fois pour tout le lot.
+    Retourne les identifiants supprimés.
+    """
+    with transaction.atomic():
+        rows = list(queryset.order_by().values_list('id', 'conversation_id', 'sender_id', 'recipient_id'))
+        ids = [message_id for message_id, _, _, _ in rows]
+        if not ids:
+            return []
+        with bulk_operation(Message):
+            Message.objects.filter(id__in=ids).delete()
+        MessageTombstone.objects.bulk_create([
+            MessageTombstone(message_id=message_id, sender_id=sender_id, recipient_id=recipient_id)
+            for message_id, _, sender_id, recipient_id in rows
+        ])
+        refresh_conversations(conversation_id for _, conversation_id, _, _ in rows if conversation_id is not None)
+        DashboardCounters.increment(total_messages=-len(ids))
+
+    # Chaque participant ne reçoit que les ids de ses propres messages
+    ids_by_user = defaultdict(list)
+    for message_id, _, sender_id, recipient_id in rows:
+        for user_id in {sender_id, recipient_id}:
+            ids_by_user[user_id].append(message_id)
+    for user_id, user_ids in ids_by_user.items():
+        publish('messages.deleted', {'ids': user_ids}, users={user_id})
+    publish('dashboard.changed', {'model': Message._meta.label_lower})
+    return ids
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from config.bulk import in_bulk_operation
+from . import services
+from .models import Message, MessageTombstone
+
+
+@receiver(post_init, sender=Message)
+def remember_read_state(sender, instance, **kwargs):
+    # État chargé depuis la base, pour détecter les passages lu / non lu
+    instance._was_read = instance.__dict__.get('is_read')
+
+
+@receiver(pre_save, sender=Message)
+def attach_conversation(sender, instance, **kwargs):
+    if instance.conversation_id is None:
+        instance.conversation = services.get_conversation(instance.sender_id, instance.recipient_id)
+
+
+@receiver(post_save, sender=Message)
+def update_conversation(sender, instance, created, **kwargs):
+    if in_bulk_operation(sender):
+        return
+    if created:
+        services.record_message(instance)
+    elif instance._was_read is not None and instance._was_read != instance.is_read:
+        services.adjust_unread(instance, -1 if instance.is_read else 1)
+    instance._was_read = instance.is_read
+
+
+@receiver(post_delete, sender=Message)
+def record_tombstone(sender, instance, **kwargs):
+    # Suppression visible par la synchronisation incrémentale
+    if in_bulk_operation(sender):
+        return
+    MessageTombstone.objects.create(
+        message_id=instance.pk,
+        sender_id=instance.sender_id,
+        recipient_id=instance.recipient_id,
+    )
+
+
+@receiver(post_delete, sender=Message)
+def refresh_conversation(sender, instance, **kwargs):
+    if instance.conversation_id is not None and not in_bulk_operation(sender):
+        services.refresh_conversations([instance.conversation_id])
@@ -0,0 +1,119 @@
+"""
+Synchronisation incrémentale des messages
+
+Le client conserve un jeton opaque (sync_token) et ne reçoit ensuite que
+les messages créés, modifiés ou lus depuis, plus les identifiants des
+messages supprimés (MessageTombstone). Le coût d'un appel est donc
+proportionnel au nombre de changements, pas au nombre de messages.
+
+Contenu du jeton :
+- t, i : dernier (updated_at, id) transmis (keyset, pas d'OFFSET)
+- d : dernier identifiant de MessageTombstone transmis
+- at : date d'émission, pour détecter les jetons plus vieux que la
+  rétention des traces de suppression
+
+updated_at et les identifiants sont attribués avant le commit : une
+transaction validée après un appel peut porter une valeur inférieure au
+dernier point transmis. Le jeton ne dépasse donc jamais les changements
+plus récents que MESSAGE_SYNC_SAFETY_LAG_SECONDS : ceux-ci sont envoyés,
+puis renvoyés à l'appel suivant (le client les applique par identifiant).
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+from itertools import takewhile
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from .models import Message, MessageTombstone
+
+SYNC_LIMIT = 500
+# Durée de conservation des traces de suppression (prune_message_tombstones)
+TOMBSTONE_RETENTION = timedelta(days=settings.MESSAGE_TOMBSTONE_RETENTION_DAYS)
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_token(updated_at, message_id, tombstone_id):
+    payload = {
+        't': updated_at.isoformat() if updated_at else None,
+        'i': message_id,
+        'd': tombstone_id,
+        'at': timezone.now().isoformat(),
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode()
+
+
+def decode_token(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return (
+            datetime.fromisoformat(payload['t']) if payload['t'] else None,
+            int(payload['i']),
+            int(payload['d']),
+            datetime.fromisoformat(payload['at']),
+        )
+    except (ValueError, TypeError, KeyError):
+        raise InvalidSyncToken("Jeton de synchronisation invalide")
+
+
+def changes_since(user, token=None, limit=SYNC_LIMIT):
+    """
+    Changements visibles par un utilisateur depuis un jeton
+    Sans jeton (ou jeton trop ancien) : synchronisation complète, par lots,
+    avec reset=True pour que le client oublie son état local.
+    Retourne un dict : messages, deleted, sync_token, has_more, reset.
+    """
+    reset = token is None
+    # Au-delà, une transaction encore ouverte peut valider un changement plus ancien
+    cutoff = timezone.now() - timedelta(seconds=settings.MESSAGE_SYNC_SAFETY_LAG_SECONDS)
+    if token is not None:
+        updated_at, message_id, tombstone_id, issued_at = decode_token(token)
+        if issued_at < timezone.now() - TOMBSTONE_RETENTION:
+            # Des traces de suppression ont pu être purgées depuis
+            reset = True
+    if reset:
+        updated_at, message_id = None, 0
+        tombstone_id = (
+            MessageTombstone.objects.filter(deleted_at__lte=cutoff).aggregate(last=Max('id'))['last'] or 0
+        )
+
+    # Une branche indexée par rôle, (sender|recipient, updated_at, id)
+    after = Q()
+    if updated_at is not None:
+        after = Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=message_id)
+    base = Message.objects.select_related('sender', 'recipient').filter(after)
+    sent = base.filter(sender=user).order_by()
+    received = base.filter(recipient=user).exclude(sender=user).order_by()
+    messages = list(sent.union(received, all=True).order_by('updated_at', 'id')[:limit + 1])
+    has_more = len(messages) > limit
+    messages = messages[:limit]
+    # Le jeton n'avance que jusqu'au dernier changement antérieur à la marge
+    settled = list(takewhile(lambda message: message.updated_at <= cutoff, messages))
+    if settled:
+        updated_at, message_id = settled[-1].updated_at, settled[-1].id
+    # Lot entièrement récent : attendre la marge plutôt que relire le même lot
+    has_more = has_more and len(settled) == len(messages)
+
+    tombstones = list(
+        MessageTombstone.objects
+        .filter(Q(recipient_id=user.pk) | Q(sender_id=user.pk), id__gt=tombstone_id)
+        .order_by('id')
+        .values_list('id', 'message_id', 'deleted_at')[:limit + 1]
+    )
+    more_tombstones = len(tombstones) > limit
+    tombstones = tombstones[:limit]
+    settled = list(takewhile(lambda tombstone: tombstone[2] <= cutoff, tombstones))
+    if settled:
+        tombstone_id = settled[-1][0]
+    has_more = has_more or (more_tombstones and len(settled) == len(tombstones))
+
+    return {
+        'messages': messages,
+        'deleted': [deleted_id for _, deleted_id, _ in tombstones],
+        'sync_token': encode_token(updated_at, message_id, tombstone_id),
+        'has_more': has_more,
+        'reset': reset,
+    }
@@ -0,0 +1,275 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from hotels.models import DashboardCounters
+from .models import Conversation, Message, MessageTombstone
+
+User = get_user_model()
+
+
+class MessageListTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+        self.other = User.objects.create_user(username='autre@example.com', email='autre@example.com', password='x')
+        self.third = User.objects.create_user(username='tiers@example.com', email='tiers@example.com', password='x')
+        self.client.force_authenticate(user=self.user)
+
+        self.sent = Message.objects.create(sender=self.user, recipient=self.other, content='Envoyé')
+        self.received = Message.objects.create(sender=self.other, recipient=self.user, content='Reçu')
+        self.to_self = Message.objects.create(sender=self.user, recipient=self.user, content='Note')
+        Message.objects.create(sender=self.other, recipient=self.third, content='Privé')
+
+    def test_list_contains_sent_and_received_once(self):
+        response = self.client.get('/api/messages/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(
+            [message['id'] for message in response.data['results']],
+            [self.to_self.id, self.received.id, self.sent.id],
+        )
+
+    def test_list_query_count_does_not_grow_with_messages(self):
+        for i in range(10):
+            Message.objects.create(sender=self.other, recipient=self.user, content=f'Message {i}')
+        # COUNT de la pagination + page avec expéditeurs et destinataires joints
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/messages/')
+        self.assertEqual(response.data['results'][0]['sender']['email'], 'autre@example.com')
+
+    def test_cursor_pagination(self):
+        response = self.client.get('/api/messages/?pagination=cursor')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(
+            [message['id'] for message in response.data['results']],
+            [self.to_self.id, self.received.id, self.sent.id],
+        )
+
+    def test_detail_and_update(self):
+        response = self.client.patch(f'/api/messages/{self.received.id}/', {'is_read': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_read'])
+
+        other_message = Message.objects.get(content='Privé')
+        response = self.client.get(f'/api/messages/{other_message.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConversationTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+        self.other = User.objects.create_user(username='autre@example.com', email='autre@example.com', password='x')
+        self.third = User.objects.create_user(username='tiers@example.com', email='tiers@example.com', password='x')
+        self.client.force_authenticate(user=self.user)
+
+    def test_messages_are_grouped_by_pair(self):
+        first = Message.objects.create(sender=self.user, recipient=self.other, content='Bonjour')
+        reply = Message.objects.create(sender=self.other, recipient=self.user, content='Salut')
+        Message.objects.create(sender=self.third, recipient=self.user, content='Hello')
+
+        self.assertEqual(first.conversation_id, reply.conversation_id)
+        self.assertEqual(Conversation.objects.count(), 2)
+        conversation = Conversation.objects.get(pk=first.conversation_id)
+        self.assertEqual(conversation.last_message_id, reply.id)
+        self.assertEqual(conversation.last_message_preview, 'Salut')
+        self.assertEqual(conversation.unread_for(self.user.pk), 1)
+        self.assertEqual(conversation.unread_for(self.other.pk), 1)
+
+    def test_unread_counters_follow_reads_and_deletes(self):
+        message = Message.objects.create(sender=self.other, recipient=self.user, content='Un')
+        latest = Message.objects.create(sender=self.other, recipient=self.user, content='Deux')
+        conversation = Conversation.objects.get(pk=message.conversation_id)
+        self.assertEqual(conversation.unread_for(self.user.pk), 2)
+
+        self.client.patch(f'/api/messages/{message.id}/', {'is_read': True}, format='json')
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.unread_for(self.user.pk), 1)
+
+        self.client.delete(f'/api/messages/{latest.id}/')
+        conversation.refresh_from_db()
+        self.assertEqual(conversation.unread_for(self.user.pk), 0)
+        self.assertEqual(conversation.last_message_id, message.id)
+
+    def test_conversations_endpoint(self):
+        for i in range(5):
+            Message.objects.create(sender=self.other, recipient=self.user, content=f'Message {i}')
+        Message.objects.create(sender=self.user, recipient=self.third, content='Dernier')
+
+        # COUNT de la pagination + fils avec participants joints
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/messages/conversations/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual([c['participant']['email'] for c in results], ['tiers@example.com', 'autre@example.com'])
+        self.assertEqual(results[0]['unread_count'], 0)
+        self.assertEqual(results[1]['unread_count'], 5)
+        self.assertEqual(results[1]['last_message_preview'], 'Message 4')
+
+        response = self.client.get(f"/api/messages/?conversation={results[1]['id']}")
+        self.assertEqual(response.data['count'], 5)
+
+        response = self.client.get('/api/messages/conversations/?pagination=cursor')
+        self.assertEqual(len(response.data['results']), 2)
+
+
+@override_settings(MESSAGE_SYNC_SAFETY_LAG_SECONDS=0)
+class MessageSyncTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+        self.other = User.objects.create_user(username='autre@example.com', email='autre@example.com', password='x')
+        self.third = User.objects.create_user(username='tiers@example.com', email='tiers@example.com', password='x')
+        self.client.force_authenticate(user=self.user)
+        self.first = Message.objects.create(sender=self.other, recipient=self.user, content='Un')
+        self.second = Message.objects.create(sender=self.user, recipient=self.other, content='Deux')
+        Message.objects.create(sender=self.other, recipient=self.third, content='Privé')
+
+    def sync(self, token=None):
+        url = '/api/messages/sync/'
+        if token:
+            url += f'?sync_token={token}'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_full_then_incremental_sync(self):
+        data = self.sync()
+        self.assertTrue(data['reset'])
+        self.assertEqual([m['id'] for m in data['messages']], [self.first.id, self.second.id])
+
+        # Aucun changement : réponse vide
+        data = self.sync(data['sync_token'])
+        self.assertFalse(data['reset'])
+        self.assertEqual(data['messages'], [])
+        self.assertEqual(data['deleted'], [])
+
+        self.client.patch(f'/api/messages/{self.first.id}/', {'is_read': True}, format='json')
+        new = Message.objects.create(sender=self.other, recipient=self.user, content='Trois')
+        self.client.delete(f'/api/messages/{self.second.id}/')
+
+        data = self.sync(data['sync_token'])
+        self.assertEqual([m['id'] for m in data['messages']], [self.first.id, new.id])
+        self.assertTrue(data['messages'][0]['is_read'])
+        self.assertEqual(data['deleted'], [self.second.id])
+
+        data = self.sync(data['sync_token'])
+        self.assertEqual(data['messages'], [])
+        self.assertEqual(data['deleted'], [])
+
+    def test_sync_is_batched(self):
+        from . import sync
+        changes = sync.changes_since(self.user, limit=1)
+        self.assertTrue(changes['has_more'])
+        self.assertEqual([m.id for m in changes['messages']], [self.first.id])
+        changes = sync.changes_since(self.user, changes['sync_token'], limit=1)
+        self.assertEqual([m.id for m in changes['messages']], [self.second.id])
+
+    @override_settings(MESSAGE_SYNC_SAFETY_LAG_SECONDS=5)
+    def test_late_commit_with_older_timestamp_is_not_skipped(self):
+        Message.objects.update(updated_at=timezone.now() - timedelta(minutes=1))
+        recent = Message.objects.create(sender=self.other, recipient=self.user, content='Récent')
+        MessageTombstone.objects.create(id=100, message_id=1000, sender_id=self.other.pk, recipient_id=self.user.pk)
+        data = self.sync()
+        self.assertEqual([m['id'] for m in data['messages']], [self.first.id, self.second.id, recent.id])
+
+        # Transactions validées après l'appel, avec une date (ou un id) inférieure au dernier point transmis
+        late = Message.objects.create(sender=self.other, recipient=self.user, content='Tardif')
+        Message.objects.filter(pk=late.pk).update(updated_at=recent.updated_at - timedelta(seconds=1))
+        MessageTombstone.objects.create(id=50, message_id=500, sender_id=self.user.pk, recipient_id=self.other.pk)
+
+        data = self.sync(data['sync_token'])
+        # Les changements récents sont renvoyés : le client les applique par identifiant
+        self.assertEqual([m['id'] for m in data['messages']], [late.id, recent.id])
+        self.assertEqual(data['deleted'], [500, 1000])
+
+        # Une fois la marge écoulée, le jeton avance
+        with override_settings(MESSAGE_SYNC_SAFETY_LAG_SECONDS=-60):
+            data = self.sync(data['sync_token'])
+        data = self.sync(data['sync_token'])
+        self.assertEqual(data['messages'], [])
+        self.assertEqual(data['deleted'], [])
+
+    def test_invalid_token(self):
+        response = self.client.get('/api/messages/sync/?sync_token=invalide')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class MessageBulkOperationsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+        self.other = User.objects.create_user(username='autre@example.com', email='autre@example.com', password='x')
+        self.third = User.objects.create_user(username='tiers@example.com', email='tiers@example.com', password='x')
+        self.client.force_authenticate(user=self.user)
+        self.received = [
+            Message.objects.create(sender=self.other, recipient=self.user, content=f'Message {i}')
+            for i in range(4)
+        ]
+        self.conversation = Conversation.objects.get(pk=self.received[0].conversation_id)
+        DashboardCounters.load()
+
+    def test_mark_read_by_ids(self):
+        foreign = Message.objects.create(sender=self.other, recipient=self.third, content='Privé')
+        ids = [self.received[0].id, self.received[1].id, foreign.id]
+        response = self.client.post('/api/messages/mark_read/', {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['ids']), ids[:2])
+        self.assertEqual(response.data['count'], 2)
+        self.assertFalse(Message.objects.get(pk=foreign.id).is_read)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.unread_for(self.user.pk), 2)
+
+        # Déjà lus : rien à faire
+        response = self.client.post('/api/messages/mark_read/', {'ids': ids}, format='json')
+        self.assertEqual(response.data['count'], 0)
+
+    def test_mark_read_up_to_in_conversation(self):
+        response = self.client.post(
+            '/api/messages/mark_read/',
+            {'conversation': self.conversation.id, 'up_to': self.received[2].id},
+            format='json',
+        )
+        self.assertEqual(response.data['count'], 3)
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.unread_for(self.user.pk), 1)
+
+        response = self.client.post('/api/messages/mark_read/', {'ids': [1], 'conversation': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete(self):
+        foreign = Message.objects.create(sender=self.other, recipient=self.third, content='Privé')
+        ids = [self.received[2].id, self.received[3].id, foreign.id]
+        response = self.client.post('/api/messages/bulk_delete/', {'ids': ids}, format='json')
+        self.assertEqual(sorted(response.data['ids']), ids[:2])
+        self.assertTrue(Message.objects.filter(pk=foreign.id).exists())
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message_id, self.received[1].id)
+        self.assertEqual(self.conversation.unread_for(self.user.pk), 2)
+        self.assertEqual(MessageTombstone.objects.filter(message_id__in=ids).count(), 2)
+        # 4 reçus + 1 privé, moins 2 supprimés
+        self.assertEqual(DashboardCounters.load().total_messages, 3)
+
+    def test_bulk_send(self):
+        response = self.client.post(
+            '/api/messages/bulk_send/',
+            {'recipient_ids': [self.other.id, self.third.id, self.other.id], 'content': 'Annonce'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 2)
+
+        self.conversation.refresh_from_db()
+        self.assertEqual(self.conversation.last_message_preview, 'Annonce')
+        self.assertEqual(self.conversation.unread_for(self.other.pk), 1)
+        new_conversation = Conversation.objects.get(user_a=self.user, user_b=self.third)
+        self.assertEqual(new_conversation.unread_for(self.third.pk), 1)
+        self.assertEqual(DashboardCounters.load().total_messages, 6)
+
+        response = self.client.post('/api/messages/bulk_send/', {'recipient_ids': [9999], 'content': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,24 +1,139 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django.db.models import Q
-from .models import Message
-from .serializers import MessageSerializer
+from config.pagination import DefaultPagination, KeysetPagination
+from .models import Conversation, Message
+from . import services
+from .serializers import (
+    BulkDeleteSerializer, BulkSendSerializer, ConversationSerializer, MarkReadSerializer, MessageSerializer
+)
+from .sync import InvalidSyncToken, changes_since
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+class ConversationKeysetPagination(KeysetPagination):
+    ordering = ('-last_message_at', 'id')
+
+
+class ConversationPagination(DefaultPagination):
+    cursor_pagination_class = ConversationKeysetPagination
+
+
 class MessageViewSet(viewsets.ModelViewSet):
     serializer_class = MessageSerializer
     permission_classes = [IsAuthenticated]
+    ordering = ('-created_at', 'id')
 
     def get_queryset(self):
         # Retourner tous les messages envoyés et reçus par l'utilisateur
-        queryset = Message.objects.filter(
-            Q(sender=self.request.user) | Q(recipient=self.request.user)
-        ).order_by('-created_at')
-        logger.info(f"Messages for user {self.request.user.id}: {queryset.count()}")
-        return queryset
+        # select_related : expéditeur et destinataire sérialisés sans requête par message
+        user = self.request.user
+        queryset = Message.objects.select_related('sender', 'recipient')
+        
+        # Messages d'un seul fil : ?conversation=<id>
+        conversation = self.request.query_params.get('conversation')
+        if conversation and conversation.isdigit():
+            queryset = queryset.filter(conversation_id=conversation)
+        
+        if self.action == 'list' and not self.paginator.use_cursor(self.request):
+            # UNION ALL de deux branches servies chacune par leur index
+            # (sender, -created_at) et (recipient, -created_at), au lieu d'un OR.
+            # Les messages envoyés à soi-même ne sont gardés que dans la première branche.
+            sent = queryset.filter(sender=user).order_by()
+            received = queryset.filter(recipient=user).exclude(sender=user).order_by()
+            return sent.union(received, all=True).order_by(*self.ordering)
+        
+        # Détail, modification et mode curseur filtrent encore le queryset,
+        # ce qu'une UNION ne permet pas
+        return queryset.filter(Q(sender=user) | Q(recipient=user)).order_by(*self.ordering)
 
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
         logger.info(f"Message created by {self.request.user.id}")
+
+    @action(detail=False, pagination_class=ConversationPagination)
+    def conversations(self, request):
+        """
+        Fils de discussion de l'utilisateur, du plus récent au plus ancien
+        Lit la table Conversation (un fil = une ligne), jamais les messages.
+        """
+        user = request.user
+        queryset = (
+            Conversation.objects
+            .filter(Q(user_a=user) | Q(user_b=user), last_message_at__isnull=False)
+            .select_related('user_a', 'user_b')
+            .order_by('-last_message_at', 'id')
+        )
+        page = self.paginate_queryset(queryset)
+        serializer = ConversationSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=False)
+    def sync(self, request):
+        """
+        Synchronisation incrémentale : ?sync_token=<jeton du dernier appel>
+        Retourne les messages créés / modifiés / lus et les ids supprimés depuis,
+        à rappeler tant que has_more est vrai.
+        """
+        try:
+            changes = changes_since(request.user, request.query_params.get('sync_token') or None)
+        except InvalidSyncToken as exc:
+            raise ValidationError({'sync_token': str(exc)})
+        changes['messages'] = MessageSerializer(
+            changes['messages'], many=True, context=self.get_serializer_context()
+        ).data
+        return Response(changes)
+
+    def user_messages(self):
+        """Messages envoyés ou reçus par l'utilisateur, sans jointure"""
+        user = self.request.user
+        return Message.objects.filter(Q(sender=user) | Q(recipient=user))
+
+    @action(detail=False, methods=['post'])
+    def mark_read(self, request):
+        """
+        Marquer des messages reçus comme lus, en une seule mise à jour
+        {"ids": [1, 2]} ou {"conversation": 3, "up_to": 42}
+        """
+        serializer = MarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        
+        queryset = Message.objects.all()
+        if 'ids' in data:
+            queryset = queryset.filter(id__in=data['ids'])
+        else:
+            queryset = queryset.filter(conversation_id=data['conversation'])
+            if 'up_to' in data:
+                queryset = queryset.filter(id__lte=data['up_to'])
+        
+        ids = services.mark_read(request.user, queryset)
+        return Response({'ids': ids, 'count': len(ids)})
+
+    @action(detail=False, methods=['post'])
+    def bulk_delete(self, request):
+        """Supprimer plusieurs messages envoyés ou reçus : {"ids": [1, 2]}"""
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        ids = services.delete_messages(self.user_messages().filter(id__in=serializer.validated_data['ids']))
+        return Response({'ids': ids, 'count': len(ids)})
+
+    @action(detail=False, methods=['post'])
+    def bulk_send(self, request):
+        """Envoyer un même message à plusieurs destinataires : {"recipient_ids": [...], "content": "..."}"""
+        serializer = BulkSendSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        messages = services.send_to_many(
+            request.user,
+            serializer.validated_data['recipient_ids'],
+            serializer.validated_data['content'],
+        )
+        ids = [message.pk for message in messages]
+        return Response({'ids': ids, 'count': len(ids)}, status=status.HTTP_201_CREATED)
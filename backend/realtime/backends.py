@@ -0,0 +1,68 @@
+import logging
+import threading
+import time
+from django.core.exceptions import ImproperlyConfigured
+from .hub import Event
+
+logger = logging.getLogger(__name__)
+
+
+class BaseBackend:
+    """Transport des événements entre les processus qui publient et ceux qui diffusent"""
+
+    def __init__(self, hub, location, options):
+        self.hub = hub
+        self.location = location
+        self.options = options
+
+    def start(self):
+        """Commencer à recevoir les événements publiés ailleurs"""
+
+    def publish(self, event):
+        raise NotImplementedError
+
+
+class LocalBackend(BaseBackend):
+    """Un seul processus (développement, worker ASGI unique)"""
+
+    def publish(self, event):
+        self.hub.dispatch(event)
+
+
+class RedisBackend(BaseBackend):
+    """
+    Pub/sub Redis : chaque processus publie sur le canal et
+    un thread par processus relaie les messages reçus vers son hub
+    """
+
+    def __init__(self, hub, location, options):
+        super().__init__(hub, location, options)
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("REALTIME_BACKEND=redis nécessite le paquet redis")
+        self.client = redis.Redis.from_url(location)
+        self.channel = options.get('CHANNEL', 'red:events')
+
+    def start(self):
+        thread = threading.Thread(target=self._listen, name='realtime-redis', daemon=True)
+        thread.start()
+
+    def _listen(self):
+        import redis
+
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    try:
+                        self.hub.dispatch(Event.from_json(message['data']))
+                    except (ValueError, KeyError):
+                        logger.warning("Événement temps réel illisible ignoré")
+            except redis.RedisError:
+                logger.exception("Connexion Redis temps réel perdue, nouvelle tentative")
+                time.sleep(1)
+
+    def publish(self, event):
+        self.client.publish(self.channel, event.to_json())
@@ -0,0 +1,125 @@
+"""
+Diffusion d'événements en temps réel (Server-Sent Events)
+
+- Event : type, données et destinataires (None = tout le monde)
+- Hub : fan-out en mémoire vers les connexions SSE du processus ;
+  un événement est remis à N abonnés sans aucune requête en base
+- Le backend (REALTIME_BACKEND) transporte les événements entre
+  processus : local (un seul worker) ou redis (pub/sub)
+- publish() : envoi après le commit de la transaction courante
+"""
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class Event:
+    type: str
+    data: dict = field(default_factory=dict)
+    # Identifiants des utilisateurs destinataires, None = diffusion
+    users: frozenset = None
+
+    def visible_to(self, user_id):
+        return self.users is None or user_id in self.users
+
+    def to_sse(self):
+        return f"event: {self.type}\ndata: {json.dumps(self.data, separators=(',', ':'))}\n\n"
+
+    def to_json(self):
+        return json.dumps({'type': self.type, 'data': self.data, 'users': sorted(self.users) if self.users is not None else None})
+
+    @classmethod
+    def from_json(cls, payload):
+        payload = json.loads(payload)
+        users = payload.get('users')
+        return cls(payload['type'], payload.get('data') or {}, frozenset(users) if users is not None else None)
+
+
+class Subscriber:
+    """Connexion SSE : file d'attente bornée dans la boucle asyncio de la requête"""
+
+    # Remis à la place des événements quand la file déborde : le client se reconnecte
+    OVERFLOW = object()
+
+    def __init__(self, user_id, max_queue=100):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=max_queue)
+
+    def put(self, event):
+        # Exécuté dans la boucle de l'abonné
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(self.OVERFLOW)
+
+
+class Hub:
+    """Fan-out en mémoire des événements vers les abonnés du processus"""
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscriber = Subscriber(user_id, self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def dispatch(self, event):
+        """Remettre un événement aux abonnés concernés (sûr depuis n'importe quel thread)"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if event.visible_to(subscriber.user_id):
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+                except RuntimeError:
+                    # Boucle fermée : connexion terminée
+                    self.unsubscribe(subscriber)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+
+_hub = None
+_backend = None
+_hub_lock = threading.Lock()
+
+
+def get_hub():
+    """Hub et backend du processus, créés au premier usage"""
+    global _hub, _backend
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                options = settings.REALTIME.get('OPTIONS', {})
+                hub = Hub(options.get('MAX_QUEUE', 100))
+                backend = import_string(settings.REALTIME['BACKEND'])(hub, settings.REALTIME.get('LOCATION', ''), options)
+                backend.start()
+                _hub, _backend = hub, backend
+    return _hub
+
+
+def get_backend():
+    get_hub()
+    return _backend
+
+
+def publish(event_type, data=None, users=None):
+    """Publier un événement une fois la transaction courante validée"""
+    event = Event(event_type, data or {}, frozenset(users) if users is not None else None)
+    transaction.on_commit(lambda: get_backend().publish(event))
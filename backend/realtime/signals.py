@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from config.bulk import in_bulk_operation
+from hotels.models import Hotel
+from hotels.signals import COUNTED_MODELS
+from messaging.models import Message
+from .hub import publish
+
+
+@receiver(post_save, sender=Message)
+def message_created(sender, instance, created, **kwargs):
+    if created and not in_bulk_operation(sender):
+        publish(
+            'message.created',
+            {
+                'id': instance.pk,
+                'conversation': instance.conversation_id,
+                'sender': instance.sender_id,
+                'recipient': instance.recipient_id,
+            },
+            users={instance.sender_id, instance.recipient_id},
+        )
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def hotel_changed(sender, instance, **kwargs):
+    if 'created' not in kwargs:
+        action = 'deleted'
+    else:
+        action = 'created' if kwargs['created'] else 'updated'
+    publish('hotel.changed', {'id': instance.pk, 'action': action})
+
+
+def counters_changed(sender, **kwargs):
+    # Les compteurs du dashboard ont bougé (voir hotels.signals) :
+    # créations, suppressions et toute modification d'hôtel (prix, chambres)
+    if in_bulk_operation(sender):
+        return
+    if kwargs.get('created', True) or sender is Hotel:
+        publish('dashboard.changed', {'model': sender._meta.label_lower})
+
+
+for model in (Hotel, *COUNTED_MODELS):
+    post_save.connect(counters_changed, sender=model, dispatch_uid=f'realtime_counters_saved_{model._meta.label}')
+    post_delete.connect(counters_changed, sender=model, dispatch_uid=f'realtime_counters_deleted_{model._meta.label}')
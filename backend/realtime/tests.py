@@ -0,0 +1,136 @@
+import asyncio
+from unittest import mock
+from django.db import transaction
+from asgiref.sync import sync_to_async
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+from hotels.models import Hotel
+from messaging.models import Message
+from users import revocation
+from users.tokens import ClaimsRefreshToken
+from .hub import Event, Hub, Subscriber, get_hub
+from .views import event_stream
+
+User = get_user_model()
+
+
+class HubTestCase(SimpleTestCase):
+    def test_dispatch_to_matching_subscribers(self):
+        async def scenario():
+            hub = Hub()
+            mine = hub.subscribe(1)
+            other = hub.subscribe(2)
+            hub.dispatch(Event('message.created', {'id': 7}, frozenset({1})))
+            hub.dispatch(Event('hotel.changed', {'id': 3}))
+            await asyncio.sleep(0)
+            return [mine.queue.get_nowait().type for _ in range(mine.queue.qsize())], other.queue.qsize()
+
+        received, other_count = asyncio.run(scenario())
+        self.assertEqual(received, ['message.created', 'hotel.changed'])
+        self.assertEqual(other_count, 1)
+
+    def test_slow_subscriber_is_disconnected(self):
+        async def scenario():
+            hub = Hub(max_queue=2)
+            subscriber = hub.subscribe(1)
+            for i in range(3):
+                hub.dispatch(Event('hotel.changed', {'id': i}))
+            await asyncio.sleep(0)
+            chunks = [chunk async for chunk in event_stream(subscriber, hub)]
+            return chunks, len(hub)
+
+        chunks, remaining = asyncio.run(scenario())
+        # Seulement le délai de reconnexion, puis fin du flux
+        self.assertEqual(chunks, ['retry: 5000\n\n'])
+        self.assertEqual(remaining, 0)
+
+    def test_event_serialization(self):
+        event = Event('message.created', {'id': 1}, frozenset({4, 2}))
+        self.assertEqual(Event.from_json(event.to_json()), event)
+        self.assertEqual(event.to_sse(), 'event: message.created\ndata: {"id":1}\n\n')
+
+
+class RealtimeSignalsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+        self.other = User.objects.create_user(username='autre@example.com', email='autre@example.com', password='x')
+
+    def published(self, action):
+        with mock.patch.object(get_hub().__class__, 'dispatch') as dispatch:
+            with self.captureOnCommitCallbacks(execute=True):
+                action()
+        return [call.args[0] for call in dispatch.call_args_list]
+
+    def test_message_created_targets_participants(self):
+        events = self.published(
+            lambda: Message.objects.create(sender=self.user, recipient=self.other, content='Salut')
+        )
+        message_event = next(event for event in events if event.type == 'message.created')
+        self.assertEqual(message_event.users, {self.user.pk, self.other.pk})
+        self.assertIn('dashboard.changed', [event.type for event in events])
+
+    def test_hotel_changes_are_broadcast(self):
+        events = self.published(lambda: Hotel.objects.create(
+            name='Hotel SSE', city='Dakar', address='Adresse', phone='+221 00 000 00 00',
+            email='sse@hotel.sn', price_per_night=100,
+        ))
+        self.assertEqual(
+            [(event.type, event.users) for event in events],
+            [('hotel.changed', None), ('dashboard.changed', None)],
+        )
+
+    def test_nothing_is_published_on_rollback(self):
+        def rolled_back():
+            with transaction.atomic():
+                Message.objects.create(sender=self.user, recipient=self.other, content='Annulé')
+                transaction.set_rollback(True)
+
+        self.assertEqual(self.published(rolled_back), [])
+
+
+@override_settings(REALTIME_ENABLED=True)
+class EventsViewTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='moi@example.com', email='moi@example.com', password='x')
+
+    async def test_requires_token(self):
+        response = await self.async_client.get('/api/events/')
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get('/api/events/?token=invalide')
+        self.assertEqual(response.status_code, 401)
+
+    async def test_stream_opens_with_valid_token(self):
+        token = str(AccessToken.for_user(self.user))
+        response = await self.async_client.get(f'/api/events/?token={token}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        await stream.aclose()
+
+    async def test_revoked_or_inactive_user_is_refused(self):
+        token = str((await sync_to_async(ClaimsRefreshToken.for_user)(self.user)).access_token)
+        await sync_to_async(revocation.revoke_all)(self.user.pk)
+        response = await self.async_client.get(f'/api/events/?token={token}')
+        self.assertEqual(response.status_code, 401)
+
+        # Jeton sans génération : l'état du compte est vérifié
+        legacy = AccessToken.for_user(self.user)
+        self.user.is_active = False
+        await self.user.asave()
+        response = await self.async_client.get(f'/api/events/?token={legacy}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_unavailable_under_wsgi(self):
+        # Sous WSGI le flux ne serait jamais envoyé : le frontend reste en polling
+        response = self.client.get(f'/api/events/?token={AccessToken.for_user(self.user)}')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.client.get('/api/events/config/').json(), {'enabled': False})
+
+    @override_settings(REALTIME_ENABLED=False)
+    async def test_disabled_by_default(self):
+        response = await self.async_client.get('/api/events/config/')
+        self.assertEqual(response.json(), {'enabled': False})
+        response = await self.async_client.get(f'/api/events/?token={AccessToken.for_user(self.user)}')
+        self.assertEqual(response.status_code, 503)
@@ -0,0 +1,7 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('', views.events, name='events'),
+    path('config/', views.realtime_config, name='events-config'),
+]
@@ -0,0 +1,104 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_safe
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from users import revocation
+from users.user_cache import user_cache
+from .hub import Subscriber, get_hub
+
+HEARTBEAT_SECONDS = 15
+RETRY_MILLISECONDS = 5000
+
+
+def is_active_user(user_id):
+    values = user_cache.get(user_id)
+    if values is not None:
+        return values['is_active']
+    return get_user_model().objects.filter(pk=user_id, is_active=True).exists()
+
+
+def token_user_id(request):
+    """
+    Identifiant de l'utilisateur du jeton d'accès, vérifié comme par l'API REST
+    (users.authentication) : génération non révoquée, utilisateur actif
+    EventSource ne permet pas d'en-têtes : jeton en ?token= ou en Authorization
+    """
+    token = request.GET.get('token')
+    if not token:
+        header = request.headers.get('Authorization', '')
+        if header.startswith('Bearer '):
+            token = header[len('Bearer '):]
+    if not token:
+        return None
+    try:
+        token = AccessToken(token)
+        user_id = token[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+    if revocation.GENERATION_CLAIM in token and revocation.is_generation_revoked(token):
+        return None
+    return user_id if is_active_user(user_id) else None
+
+
+async def subscribe_stream(hub, user_id):
+    """
+    Abonnement créé à la première itération : le Subscriber retient la
+    boucle asyncio qui lit le flux, pas celle qui a exécuté la vue
+    """
+    async for chunk in event_stream(hub.subscribe(user_id), hub):
+        yield chunk
+
+
+async def event_stream(subscriber, hub):
+    try:
+        yield f"retry: {RETRY_MILLISECONDS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Commentaire SSE : garde la connexion ouverte à travers les proxys
+                yield ": ping\n\n"
+                continue
+            if event is Subscriber.OVERFLOW:
+                # Client trop lent : il se reconnecte et recharge ses données
+                break
+            yield event.to_sse()
+    finally:
+        hub.unsubscribe(subscriber)
+
+
+def realtime_available(request):
+    return settings.REALTIME_ENABLED and isinstance(request, ASGIRequest)
+
+
+@require_safe
+def realtime_config(request):
+    """Indique au frontend s'il peut utiliser /api/events/ (sinon : polling)"""
+    return JsonResponse({'enabled': realtime_available(request)})
+
+
+@require_safe
+async def events(request):
+    """
+    Flux Server-Sent Events de l'utilisateur
+    (message.created, hotel.changed, dashboard.changed)
+    Nécessite REALTIME_ENABLED et un serveur ASGI (config.asgi) : sous WSGI,
+    le flux infini occuperait un worker sans jamais être envoyé.
+    """
+    if not realtime_available(request):
+        return JsonResponse({'detail': "Temps réel indisponible, utiliser le polling"}, status=503)
+    user_id = await sync_to_async(token_user_id)(request)
+    if user_id is None:
+        return JsonResponse({'detail': "Jeton d'accès manquant ou invalide"}, status=401)
+    
+    response = StreamingHttpResponse(subscribe_stream(get_hub(), user_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Désactiver la mise en tampon des proxys (nginx)
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -7,6 +7,7 @@ Exécuter: python manage.py shell < test_hotels_crud.py
 import os
 import django
 import json
+import base64
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -81,12 +82,12 @@ def test_crud():
     print(f"✓ Nom: {hotel['name']}")
     print(f"✓ Image type: {hotel['image_type']}")
     print(f"✓ Image size: {hotel['image_size']} bytes ({hotel['image_size_mb']} MB)")
-    print(f"✓ Image présente: {len(hotel['image_base64']) > 0}")
+    print(f"✓ Image URL: {hotel['image_url']}")
     
     assert hotel['name'] == 'Hotel Deluxe', "Nom incorrect"
     assert hotel['image_type'] == 'png', "Type d'image incorrect"
     assert hotel['image_size'] > 0, "Taille d'image non calculée"
-    assert hotel['image_base64'] == IMAGE_BASE64, "Image non stockée"
+    assert hotel['image_url'], "Image non stockée"
     
     print("✅ TEST 1 RÉUSSI")
     
@@ -109,7 +110,7 @@ def test_crud():
     
     assert hotel['name'] == 'Hotel Deluxe', "Nom incorrect"
     assert hotel['city'] == 'Dakar', "Ville incorrecte"
-    assert hotel['image_base64'] == IMAGE_BASE64, "Image non récupérée"
+    assert hotel['image_url'], "Image non récupérée"
     
     print("✅ TEST 2 RÉUSSI")
     
@@ -162,10 +163,10 @@ def test_crud():
     
     print(f"✓ Image type changé: {hotel['image_type']}")
     print(f"✓ Image size changée: {hotel['image_size']} bytes")
-    print(f"✓ Image mise à jour: {hotel['image_base64'][:50]}...")
+    print(f"✓ Image mise à jour: {hotel['image_url']}")
     
     assert hotel['image_type'] == 'jpeg', "Type d'image non changé"
-    assert hotel['image_base64'] == image_jpeg, "Image non mise à jour"
+    assert hotel['image_size'] == len(base64.b64decode(image_jpeg.split(',', 1)[1])), "Image non mise à jour"
     
     print("✅ TEST 4 RÉUSSI")
     
@@ -178,14 +179,17 @@ def test_crud():
     print(f"Status Code: {response.status_code}")
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
     
-    hotels = response.json()
+    # Liste paginée, projection légère : has_image et miniature au lieu de l'image
+    hotels = response.json()['results']
     
     print(f"✓ Nombre d'hôtels: {len(hotels)}")
     print(f"✓ Premier hôtel: {hotels[0]['name']}")
-    print(f"✓ Image présente: {len(hotels[0]['image_base64']) > 0}")
+    print(f"✓ Image présente: {hotels[0]['has_image']}")
+    print(f"✓ Miniature: {hotels[0]['thumbnail_url']}")
     
     assert len(hotels) > 0, "Aucun hôtel trouvé"
     assert hotels[0]['id'] == hotel_id, "Hôtel incorrect"
+    assert hotels[0]['has_image'], "Image absente de la liste"
     
     print("✅ TEST 5 RÉUSSI")
     
@@ -3,7 +3,7 @@ from .models import Ticket
 
 @admin.register(Ticket)
 class TicketAdmin(admin.ModelAdmin):
-    list_display = ('title', 'status', 'user', 'created_at')
-    list_filter = ('status', 'created_at')
+    list_display = ('title', 'status', 'priority', 'user', 'created_at')
+    list_filter = ('status', 'priority', 'created_at')
     search_fields = ('title', 'description')
     readonly_fields = ('created_at', 'updated_at')
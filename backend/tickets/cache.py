@@ -0,0 +1,15 @@
+from config.cache import bump_version as bump_namespace_version
+from config.cache import get_version, namespaced_key
+
+NAMESPACE = 'tickets'
+STATS_TIMEOUT = 60 * 5  # 5 minutes
+
+
+def bump_version():
+    """Invalider toutes les statistiques de tickets en cache"""
+    bump_namespace_version(NAMESPACE)
+
+
+def stats_cache_key(scope):
+    """Clé des statistiques d'un périmètre ('all' ou id de l'utilisateur)"""
+    return namespaced_key(NAMESPACE, 'stats', get_version(NAMESPACE), scope)
@@ -0,0 +1,19 @@
+import django_filters
+from .models import Ticket
+
+
+class TicketFilter(django_filters.FilterSet):
+    """
+    Filtres de la liste des tickets
+    - status / priority : répétables (?status=open&status=in_progress)
+    - user : tickets d'un utilisateur (administrateurs, les autres ne voient que les leurs)
+    """
+    status = django_filters.MultipleChoiceFilter(choices=Ticket.STATUS_CHOICES)
+    priority = django_filters.MultipleChoiceFilter(choices=Ticket.PRIORITY_CHOICES)
+    user = django_filters.NumberFilter(field_name='user_id')
+    created_after = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='gte')
+    created_before = django_filters.IsoDateTimeFilter(field_name='created_at', lookup_expr='lt')
+
+    class Meta:
+        model = Ticket
+        fields = ('status', 'priority', 'user', 'created_after', 'created_before')
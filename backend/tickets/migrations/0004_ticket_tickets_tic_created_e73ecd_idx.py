@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ticket_priority'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['-created_at', 'id'], name='tickets_tic_created_e73ecd_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 19:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_tickets_tic_created_e73ecd_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['status', 'priority', '-created_at'], name='tickets_tic_status_dc2200_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['user', 'status'], name='tickets_tic_user_id_ee01b8_idx'),
+        ),
+    ]
@@ -26,6 +26,14 @@ class Ticket(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Pagination par curseur (keyset)
+            models.Index(fields=['-created_at', 'id']),
+            # Filtres du workflow (statut, puis priorité), du plus récent au plus ancien
+            models.Index(fields=['status', 'priority', '-created_at']),
+            # Tickets d'un utilisateur par statut
+            models.Index(fields=['user', 'status']),
+        ]
 
     def __str__(self):
         return self.title
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import bump_version
+from .models import Ticket
+
+
+@receiver(post_save, sender=Ticket)
+@receiver(post_delete, sender=Ticket)
+def invalidate_ticket_stats(sender, **kwargs):
+    # Comme pour les hôtels : tout de suite, puis après le commit
+    bump_version()
+    transaction.on_commit(bump_version)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+from .models import Ticket
+
+User = get_user_model()
+
+
+class TicketWorkflowTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='awa@example.com', email='awa@example.com', password='testpass123')
+        self.other = User.objects.create_user(username='fatou@example.com', email='fatou@example.com', password='testpass123')
+        self.admin = User.objects.create_user(
+            username='admin@example.com', email='admin@example.com', password='testpass123', is_admin=True
+        )
+        for status_, priority in (('open', 'high'), ('open', 'low'), ('closed', 'high')):
+            Ticket.objects.create(title='Panne', description='...', status=status_, priority=priority, user=self.user)
+        Ticket.objects.create(title='Autre', description='...', status='open', priority='high', user=self.other)
+        self.client = APIClient()
+
+    def results(self, response):
+        return response.data['results'] if isinstance(response.data, dict) else response.data
+
+    def test_users_only_see_their_tickets(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/tickets/')
+        self.assertEqual(len(self.results(response)), 3)
+
+        ticket = Ticket.objects.get(user=self.other)
+        self.assertEqual(self.client.get(f'/api/tickets/{ticket.pk}/').status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(len(self.results(self.client.get('/api/tickets/'))), 4)
+        response = self.client.get('/api/tickets/', {'user': self.other.pk})
+        self.assertEqual(len(self.results(response)), 1)
+
+    def test_filters(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.get('/api/tickets/', {'status': 'open', 'priority': 'high'})
+        self.assertEqual(len(self.results(response)), 1)
+        response = self.client.get('/api/tickets/?status=open&status=closed')
+        self.assertEqual(len(self.results(response)), 3)
+        self.assertEqual(self.client.get('/api/tickets/', {'status': 'inconnu'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_stats_single_group_by_and_invalidation(self):
+        self.client.force_authenticate(self.user)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/tickets/stats/')
+        self.assertEqual(response.data['total'], 3)
+        self.assertEqual(response.data['by_status'], {'open': 2, 'in_progress': 0, 'closed': 1})
+        self.assertEqual(response.data['matrix']['open']['high'], 1)
+        # Servi par le cache
+        with self.assertNumQueries(0):
+            self.client.get('/api/tickets/stats/')
+
+        self.client.post('/api/tickets/', {'title': 'Wifi', 'description': '...', 'priority': 'low'}, format='json')
+        response = self.client.get('/api/tickets/stats/')
+        self.assertEqual(response.data['by_priority'], {'low': 2, 'medium': 0, 'high': 2})
+
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(self.client.get('/api/tickets/stats/').data['total'], 5)
@@ -1,12 +1,66 @@
+from django.db.models import Count
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from config.cache import get_or_compute
+from .cache import STATS_TIMEOUT, stats_cache_key
+from .filters import TicketFilter
 from .models import Ticket
 from .serializers import TicketSerializer
 
+
+def can_see_all_tickets(user):
+    # is_admin et is_staff sont dans les claims du jeton : pas de requête
+    return user.is_admin or user.is_staff
+
+
+def ticket_stats(queryset):
+    """Nombre de tickets par statut et par priorité, en un seul GROUP BY"""
+    matrix = {
+        status: dict.fromkeys((priority for priority, _ in Ticket.PRIORITY_CHOICES), 0)
+        for status, _ in Ticket.STATUS_CHOICES
+    }
+    rows = queryset.order_by().values_list('status', 'priority').annotate(count=Count('id'))
+    for status, priority, count in rows:
+        matrix.setdefault(status, {})[priority] = count
+    return {
+        'total': sum(sum(counts.values()) for counts in matrix.values()),
+        'by_status': {status: sum(counts.values()) for status, counts in matrix.items()},
+        'by_priority': {
+            priority: sum(counts.get(priority, 0) for counts in matrix.values())
+            for priority, _ in Ticket.PRIORITY_CHOICES
+        },
+        'matrix': matrix,
+    }
+
+
 class TicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
     permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TicketFilter
+    ordering = ('-created_at', 'id')
+
+    def get_queryset(self):
+        # Chaque utilisateur ne voit que ses tickets, les administrateurs tous
+        queryset = Ticket.objects.order_by(*self.ordering)
+        if not can_see_all_tickets(self.request.user):
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Comptes par statut × priorité, en cache jusqu'à la prochaine écriture de ticket"""
+        user = request.user
+        scope = 'all' if can_see_all_tickets(user) else user.pk
+        data = get_or_compute(
+            stats_cache_key(scope),
+            lambda: ticket_stats(self.get_queryset()),
+            STATS_TIMEOUT,
+        )
+        return Response(data)
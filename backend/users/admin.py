@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import CustomUser
+from .models import CustomUser, RevokedToken
 
 @admin.register(CustomUser)
 class CustomUserAdmin(BaseUserAdmin):
@@ -10,3 +10,10 @@ class CustomUserAdmin(BaseUserAdmin):
     list_display = ('email', 'first_name', 'last_name', 'is_admin', 'created_at')
     search_fields = ('email', 'first_name', 'last_name')
     ordering = ('-created_at',)
+
+
+@admin.register(RevokedToken)
+class RevokedTokenAdmin(admin.ModelAdmin):
+    list_display = ('jti', 'user', 'revoked_at', 'expires_at')
+    search_fields = ('jti', 'user__email')
+    raw_id_fields = ('user',)
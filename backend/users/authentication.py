@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db.models import DEFERRED
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from . import revocation
+from .models import ClaimsUser
+from .tokens import USER_CLAIMS
+from .user_cache import user_cache
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT sans lecture de l'utilisateur à chaque requête
+    - Jeton avec claims (ClaimsRefreshToken) : request.user est reconstruit
+      depuis le jeton, les autres champs sont chargés seulement si la vue y
+      accède (ClaimsUser), via le cache local des utilisateurs
+    - Ancien jeton sans claims, ou AUTH_STATELESS_USER désactivé :
+      comportement standard de simplejwt (une requête)
+    - Jeton d'une génération révoquée (déconnexion de tous les appareils,
+      compte désactivé) : refusé, génération lue dans le cache
+    """
+
+    def get_user(self, validated_token):
+        if revocation.GENERATION_CLAIM in validated_token and revocation.is_generation_revoked(validated_token):
+            raise AuthenticationFailed("Le jeton a été révoqué", code='token_not_valid')
+        
+        if not settings.AUTH_STATELESS_USER or any(claim not in validated_token for claim in USER_CLAIMS):
+            user = super().get_user(validated_token)
+            user_cache.remember(user)
+            return user
+        
+        try:
+            user_id = int(validated_token[api_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise AuthenticationFailed("Le jeton ne contient pas d'identifiant utilisateur", code='token_not_valid')
+        
+        values = user_cache.get(user_id)
+        if values is not None:
+            user = ClaimsUser.from_db(None, list(values), list(values.values()))
+            if not user.is_active:
+                raise AuthenticationFailed("Utilisateur inactif", code='user_inactive')
+            return user
+        
+        claims = {
+            ClaimsUser._meta.pk.attname: user_id,
+            **{claim: validated_token[claim] for claim in USER_CLAIMS},
+        }
+        field_names = [field.attname for field in ClaimsUser._meta.concrete_fields]
+        return ClaimsUser.from_db(None, field_names, [claims.get(name, DEFERRED) for name in field_names])
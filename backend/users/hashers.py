@@ -0,0 +1,41 @@
+"""
+Hachage des mots de passe à coût réglable
+
+Le coût de chaque algorithme est lu dans les settings (PASSWORD_SCRYPT_*,
+PASSWORD_ARGON2_*). Quand il change, must_update() renvoie vrai et Django
+ré-hache le mot de passe à la connexion suivante (check_password + setter).
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt (bibliothèque standard) : coût CPU et mémoire réglables"""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_PARALLELISM
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2id (nécessite argon2-cffi) : temps, mémoire (KiB) et parallélisme réglables"""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
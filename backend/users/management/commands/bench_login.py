@@ -0,0 +1,48 @@
+import time
+from django.conf import settings
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesurer le nombre de connexions par seconde et par cœur pour chaque "
+        "algorithme de hachage disponible (authenticate() complet, un seul thread). "
+        "Les utilisateurs de test sont créés dans une transaction annulée."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+        parser.add_argument(
+            '--hashers', nargs='+', default=list(settings.PASSWORD_HASHER_CLASSES),
+            help="Algorithmes à comparer (noms de PASSWORD_HASHER_CLASSES)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'algorithme':<12}{'ms/connexion':>14}{'connexions/s/cœur':>20}")
+        for name in options['hashers']:
+            path = settings.PASSWORD_HASHER_CLASSES[name]
+            hashers = [path, *(p for p in settings.PASSWORD_HASHERS if p != path)]
+            with override_settings(PASSWORD_HASHERS=hashers):
+                try:
+                    ms = self.measure(options['logins'])
+                except (ImportError, ValueError) as exc:
+                    self.stdout.write(f"{name:<12}{'indisponible':>14}  ({exc})")
+                    continue
+            self.stdout.write(f"{name:<12}{ms:>14.1f}{1000 / ms:>20.1f}")
+
+    def measure(self, logins):
+        User = get_user_model()
+        with transaction.atomic():
+            User.objects.create_user(username='bench-login', email='bench-login@bench.sn', password='bench-password')
+            # Première connexion : conversion éventuelle du hachage
+            authenticate(email='bench-login@bench.sn', password='bench-password')
+            start = time.perf_counter()
+            for _ in range(logins):
+                if authenticate(email='bench-login@bench.sn', password='bench-password') is None:
+                    raise ValueError("échec de l'authentification")
+            elapsed = (time.perf_counter() - start) * 1000 / logins
+            transaction.set_rollback(True)
+        return elapsed
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from users.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        "Supprimer les jetons révoqués déjà expirés. Un jeton expiré est refusé "
+        "par sa date d'expiration, sa révocation n'a plus besoin d'être conservée."
+    )
+
+    def handle(self, *args, **options):
+        deleted, _ = RevokedToken.objects.filter(expires_at__lt=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f"{deleted} jeton(s) révoqué(s) supprimé(s)"))
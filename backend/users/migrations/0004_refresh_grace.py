@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 20:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_token_revocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='revokedtoken',
+            name='successor_jti',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
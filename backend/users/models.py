@@ -5,6 +5,8 @@ class CustomUser(AbstractUser):
     email = models.EmailField(unique=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
     is_admin = models.BooleanField(default=False)
+    # Incrémenté pour révoquer tous les jetons de l'utilisateur (users.revocation)
+    token_generation = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -16,3 +18,48 @@ class CustomUser(AbstractUser):
 
     def __str__(self):
         return self.email
+
+
+class RevokedToken(models.Model):
+    """
+    Refresh token révoqué (rotation ou déconnexion)
+    Trace durable des révocations, écrite par lots ; les vérifications passent
+    par le cache partagé (users.revocation). Purge : prune_revoked_tokens.
+    """
+    jti = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='revoked_tokens')
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True)
+    # JTI du jeton émis à la rotation (vide : déconnexion), pour le délai de grâce
+    successor_jti = models.CharField(max_length=255, blank=True, default='')
+
+    def __str__(self):
+        return self.jti
+
+
+class ClaimsUser(CustomUser):
+    """
+    Utilisateur reconstruit à partir des claims du jeton d'accès
+    (voir users.authentication) : id, email, is_admin et is_staff sont
+    connus sans requête, les autres champs sont différés. Au premier accès
+    à un champ différé, tous les champs manquants sont chargés d'un coup,
+    depuis le cache local des utilisateurs ou sinon par une seule requête.
+    """
+
+    class Meta:
+        proxy = True
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        from .user_cache import user_cache
+
+        deferred = self.get_deferred_fields()
+        if fields is None or not deferred or not set(fields) <= deferred:
+            return super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+        values = user_cache.get(self.pk)
+        if values is None:
+            super().refresh_from_db(using=using, fields=list(deferred), from_queryset=from_queryset)
+            user_cache.remember(self)
+            return
+        for attname in deferred:
+            setattr(self, attname, values[attname])
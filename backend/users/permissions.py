@@ -0,0 +1,10 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAppAdmin(BasePermission):
+    """Administrateur de l'application (is_admin) ou du site d'administration (is_staff)"""
+
+    def has_permission(self, request, view):
+        user = request.user
+        # is_admin et is_staff sont dans les claims du jeton : pas de requête
+        return bool(user and user.is_authenticated and (user.is_admin or user.is_staff))
@@ -0,0 +1,247 @@
+"""
+Révocation des jetons JWT
+
+Deux mécanismes, vérifiés sans requête en base dans le cas courant :
+- génération par utilisateur (CustomUser.token_generation, claim 'gen') :
+  l'incrémenter révoque d'un coup tous les jetons émis auparavant
+  (déconnexion de tous les appareils, compte désactivé, réutilisation
+  d'un refresh token déjà consommé). Mise en cache, lue en base au plus
+  une fois par utilisateur et par durée de vie du cache.
+- JTI révoqués (rotation à chaque rafraîchissement, déconnexion) :
+  - une clé par JTI dans le cache partagé, posée par add() : un jeton ne
+    peut être échangé qu'une fois, même entre workers ; elle garde le
+    successeur et l'heure de rotation (délai de grâce)
+  - un filtre de Bloom par utilisateur dans le cache partagé : un JTI
+    absent du filtre n'est pas révoqué, sans requête ; seul un JTI présent
+    dans le filtre mais dont la clé a été évincée est vérifié en base.
+    Un filtre évincé est reconstruit à partir de la table (une requête).
+  - la table RevokedToken garde la trace durable, écrite par lots hors du
+    rafraîchissement (flush_revoked : fin de requête, au plus
+    REVOKED_TOKEN_FLUSH_SIZE jetons ou REVOKED_TOKEN_FLUSH_SECONDS secondes)
+- Délai de grâce (REFRESH_REUSE_GRACE_SECONDS) : deux onglets qui
+  rafraîchissent le même jeton en même temps reçoivent le même successeur
+  au lieu de déclencher la révocation de tous les jetons.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from config.cache import namespaced_key, shared_cache
+from .models import RevokedToken
+
+GENERATION_CLAIM = 'gen'
+NAMESPACE = 'auth'
+# Filtre de Bloom : 8192 bits, 4 positions par JTI (~1 % de faux positifs pour 800 JTI)
+FILTER_BITS = 8192
+FILTER_HASHES = 4
+
+
+def lifetime():
+    return int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds())
+
+
+def generation_key(user_id):
+    return namespaced_key(NAMESPACE, 'generation', user_id)
+
+
+def revoked_key(jti):
+    return namespaced_key(NAMESPACE, 'revoked', jti)
+
+
+def get_generation(user_id):
+    """Génération courante des jetons d'un utilisateur (None s'il n'existe plus)"""
+    key = generation_key(user_id)
+    generation = cache.get(key)
+    if generation is None:
+        generation = (
+            get_user_model().objects.filter(pk=user_id)
+            .values_list('token_generation', flat=True).first()
+        )
+        if generation is None:
+            return None
+        cache.set(key, generation, lifetime())
+    return generation
+
+
+def remember_generation(user_id, generation):
+    cache.set(generation_key(user_id), generation, lifetime())
+
+
+def forget_generation(user_id):
+    cache.delete(generation_key(user_id))
+
+
+def revoke_all(user_id):
+    """Révoquer tous les jetons déjà émis pour un utilisateur"""
+    get_user_model().objects.filter(pk=user_id).update(token_generation=F('token_generation') + 1)
+    forget_generation(user_id)
+    transaction.on_commit(lambda: forget_generation(user_id))
+
+
+def is_generation_revoked(token):
+    generation = get_generation(token[api_settings.USER_ID_CLAIM])
+    return generation is None or token.get(GENERATION_CLAIM, 0) < generation
+
+
+def filter_key(user_id):
+    return namespaced_key(NAMESPACE, 'revoked-filter', user_id)
+
+
+def _positions(jti):
+    digest = hashlib.sha256(jti.encode()).digest()
+    return [int.from_bytes(digest[i * 4:i * 4 + 4], 'big') % FILTER_BITS for i in range(FILTER_HASHES)]
+
+
+def _filter_of(jtis):
+    bits = 0
+    for jti in jtis:
+        for position in _positions(jti):
+            bits |= 1 << position
+    return bits
+
+
+def load_filter(user_id):
+    """Filtre des JTI révoqués d'un utilisateur, reconstruit depuis la table s'il a été évincé"""
+    bits = shared_cache().get(filter_key(user_id))
+    if bits is None:
+        jtis = RevokedToken.objects.filter(user_id=user_id, expires_at__gt=timezone.now()).values_list('jti', flat=True)
+        bits = _filter_of([*jtis, *(row.jti for row in _pending_for(user_id))])
+        shared_cache().set(filter_key(user_id), bits, lifetime())
+    return bits
+
+
+def reset_filter(user_id):
+    """Nouvel utilisateur : aucun JTI révoqué (et identifiant éventuellement réutilisé)"""
+    shared_cache().set(filter_key(user_id), 0, lifetime())
+
+
+def _add_to_filter(user_id, jti):
+    # Lecture-écriture non atomique : un bit perdu entre deux rotations
+    # simultanées reste couvert par la clé du JTI, puis par la table
+    bits = load_filter(user_id) | _filter_of([jti])
+    shared_cache().set(filter_key(user_id), bits, lifetime())
+
+
+def _in_filter(user_id, jti):
+    bits = load_filter(user_id)
+    return all(bits >> position & 1 for position in _positions(jti))
+
+
+# Révocations en attente d'écriture dans la table (par processus)
+_pending = []
+_pending_since = None
+_pending_lock = threading.Lock()
+
+
+def _pending_for(user_id):
+    with _pending_lock:
+        return [row for row in _pending if row.user_id == user_id]
+
+
+def _queue(row):
+    global _pending_since
+    with _pending_lock:
+        if not _pending:
+            _pending_since = time.monotonic()
+        _pending.append(row)
+
+
+def flush_revoked(force=True):
+    """Écrire les révocations en attente (un INSERT groupé) ; sans force, seulement si le lot est dû"""
+    global _pending_since
+    with _pending_lock:
+        due = _pending and (
+            force
+            or len(_pending) >= settings.REVOKED_TOKEN_FLUSH_SIZE
+            or time.monotonic() - _pending_since >= settings.REVOKED_TOKEN_FLUSH_SECONDS
+        )
+        if not due:
+            return 0
+        rows, _pending[:] = list(_pending), []
+        _pending_since = None
+    RevokedToken.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def _revoked_in_database(jti):
+    """(successeur, heure de rotation) d'un JTI révoqué, None sinon"""
+    with _pending_lock:
+        pending = [row for row in _pending if row.jti == jti]
+    for row in pending:
+        return row.successor_jti, row.revoked_at.timestamp()
+    row = RevokedToken.objects.filter(jti=jti).values_list('successor_jti', 'revoked_at', 'expires_at').first()
+    if row is None:
+        return None
+    successor_jti, revoked_at, expires_at = row
+    previous = (successor_jti, revoked_at.timestamp())
+    shared_cache().set(revoked_key(jti), previous, _ttl(expires_at))
+    return previous
+
+
+def _ttl(expires_at):
+    return max(1, int((expires_at - timezone.now()).total_seconds()))
+
+
+def is_jti_revoked(jti, user_id):
+    """Clé du JTI, puis filtre de l'utilisateur ; la table seulement si le filtre contient le JTI"""
+    if shared_cache().get(revoked_key(jti)) is not None:
+        return True
+    if not _in_filter(user_id, jti):
+        return False
+    return _revoked_in_database(jti) is not None
+
+
+def _revoke(token, successor_jti=''):
+    """
+    Révoquer un jeton ; (successeur, heure) de la révocation précédente
+    si le JTI l'était déjà, None sinon
+    """
+    jti = token[api_settings.JTI_CLAIM]
+    user_id = token[api_settings.USER_ID_CLAIM]
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    now = timezone.now()
+    previous = (successor_jti, now.timestamp())
+    if not shared_cache().add(revoked_key(jti), previous, _ttl(expires_at)):
+        return shared_cache().get(revoked_key(jti)) or previous
+    # Clé posée : le JTI peut encore avoir été révoqué avant une éviction
+    if _in_filter(user_id, jti):
+        earlier = _revoked_in_database(jti)
+        if earlier is not None:
+            return earlier
+    _add_to_filter(user_id, jti)
+    _queue(RevokedToken(
+        jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=now, successor_jti=successor_jti,
+    ))
+    return None
+
+
+def revoke_token(token):
+    """Révoquer un refresh token (déconnexion), False s'il l'était déjà"""
+    return _revoke(token) is None
+
+
+def rotate_token(token, successor_jti):
+    """
+    Révoquer un refresh token échangé contre un successeur
+    Retourne le JTI à donner au nouveau jeton, ou None si le jeton avait
+    déjà été échangé hors délai de grâce (réutilisation : vol probable).
+    Dans le délai de grâce, le successeur déjà émis est réutilisé : la
+    chaîne de rotation reste unique.
+    """
+    previous = _revoke(token, successor_jti)
+    if previous is None:
+        return successor_jti
+    successor_jti, revoked_at = previous
+    if not successor_jti or time.time() - revoked_at > settings.REFRESH_REUSE_GRACE_SECONDS:
+        return None
+    # Seulement le prédécesseur immédiat : le successeur ne doit pas avoir été échangé à son tour
+    if is_jti_revoked(successor_jti, token[api_settings.USER_ID_CLAIM]):
+        return None
+    return successor_jti
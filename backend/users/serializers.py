@@ -1,6 +1,14 @@
+from uuid import uuid4
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from . import revocation
+from .tokens import ClaimsRefreshToken
 
 User = get_user_model()
 
@@ -44,6 +52,26 @@ class LoginSerializer(serializers.Serializer):
         data['user'] = user
         return data
 
+class PasswordResetConfirmSerializer(serializers.Serializer):
+    """Lien reçu par email (uid, token) et nouveau mot de passe"""
+    uid = serializers.CharField()
+    token = serializers.CharField()
+    password = serializers.CharField(write_only=True, min_length=6)
+    password2 = serializers.CharField(write_only=True, min_length=6)
+
+    def validate(self, data):
+        if data['password'] != data['password2']:
+            raise serializers.ValidationError({'password': 'Les mots de passe ne correspondent pas'})
+        try:
+            user = User.objects.get(pk=force_str(urlsafe_base64_decode(data['uid'])))
+        except (ValueError, OverflowError, User.DoesNotExist):
+            user = None
+        # Le jeton devient invalide dès que le mot de passe change
+        if user is None or not default_token_generator.check_token(user, data['token']):
+            raise serializers.ValidationError({'token': 'Lien de réinitialisation invalide ou expiré'})
+        data['user'] = user
+        return data
+
 class TokenSerializer(serializers.Serializer):
     access = serializers.CharField()
     refresh = serializers.CharField()
@@ -51,9 +79,51 @@ class TokenSerializer(serializers.Serializer):
 
     def create(self, validated_data):
         user = validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return {
             'access': str(refresh.access_token),
             'refresh': str(refresh),
             'user': UserSerializer(user).data
         }
+
+
+class RotatingTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rafraîchissement avec rotation
+    - Chaque appel révoque le refresh token reçu et en renvoie un nouveau
+    - Un refresh token déjà utilisé signale un vol probable : tous les
+      jetons de l'utilisateur sont révoqués, sauf s'il vient d'être échangé
+      (REFRESH_REUSE_GRACE_SECONDS, deux onglets qui rafraîchissent ensemble)
+    - Aucune lecture de l'utilisateur : la désactivation d'un compte et la
+      modification d'un claim (email, is_admin, is_staff) passent par la
+      génération des jetons (users.revocation)
+    """
+    token_class = ClaimsRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        user_id = refresh[api_settings.USER_ID_CLAIM]
+        
+        if revocation.is_generation_revoked(refresh):
+            raise TokenError("Le jeton a été révoqué")
+        successor_jti = revocation.rotate_token(refresh, uuid4().hex)
+        if successor_jti is None:
+            revocation.revoke_all(user_id)
+            raise TokenError("Le jeton a déjà été utilisé")
+        
+        data = {'access': str(refresh.access_token)}
+        refresh[api_settings.JTI_CLAIM] = successor_jti
+        refresh.set_exp()
+        refresh.set_iat()
+        data['refresh'] = str(refresh)
+        return data
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField()
+
+    def validate_refresh(self, value):
+        try:
+            return ClaimsRefreshToken(value)
+        except TokenError as exc:
+            raise serializers.ValidationError(str(exc))
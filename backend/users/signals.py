@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models.signals import post_delete, post_init, post_save
+from . import revocation
+from .models import ClaimsUser
+from .tokens import USER_CLAIMS
+from .user_cache import user_cache
+
+
+def token_fields(instance):
+    # Champs chargés seulement (un champ différé n'a pas pu changer)
+    return {name: instance.__dict__[name] for name in ('is_active', *USER_CLAIMS) if name in instance.__dict__}
+
+
+def remember_token_fields(sender, instance, **kwargs):
+    instance._token_fields = token_fields(instance)
+
+
+def tokens_outdated(before, after):
+    """Compte désactivé, ou claim recopié dans les jetons (email, is_admin, is_staff) modifié"""
+    if before.get('is_active') and after.get('is_active') is False:
+        return True
+    return any(name in before and name in after and before[name] != after[name] for name in USER_CLAIMS)
+
+
+def invalidate_cached_user(sender, instance, created=False, **kwargs):
+    user_cache.invalidate(instance.pk)
+    if created:
+        # Génération connue d'emblée (et identifiant éventuellement réutilisé)
+        revocation.remember_generation(instance.pk, instance.token_generation)
+        revocation.reset_filter(instance.pk)
+    elif tokens_outdated(getattr(instance, '_token_fields', {}), token_fields(instance)):
+        # Jetons d'un compte désactivé, ou portant des claims périmés (ex: admin rétrogradé) :
+        # la rotation recopie les claims, ils ne doivent plus être acceptés
+        revocation.revoke_all(instance.pk)
+    instance._token_fields = token_fields(instance)
+
+
+def flush_revoked_tokens(sender, **kwargs):
+    # Après l'envoi de la réponse : les révocations sont écrites par lots
+    revocation.flush_revoked(force=False)
+
+
+request_finished.connect(flush_revoked_tokens, dispatch_uid='users_flush_revoked_tokens')
+
+
+# Le modèle proxy envoie ses propres signaux (ex: request.user.save())
+for model in (get_user_model(), ClaimsUser):
+    post_init.connect(remember_token_fields, sender=model, dispatch_uid=f'user_token_fields_{model._meta.label}')
+    post_save.connect(invalidate_cached_user, sender=model, dispatch_uid=f'user_cache_saved_{model._meta.label}')
+    post_delete.connect(invalidate_cached_user, sender=model, dispatch_uid=f'user_cache_deleted_{model._meta.label}')
@@ -1,7 +1,21 @@
-from django.test import TestCase
+from unittest import mock
+from django.conf import settings
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
 from rest_framework.test import APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from hotels.models import DashboardCounters
+from config.cache import shared_cache
+from .models import RevokedToken
+from .revocation import filter_key, flush_revoked, revoked_key
+from .throttling import LoginEmailThrottle, LoginIPThrottle, PasswordResetEmailThrottle, TokenBucket
+from .tokens import ClaimsRefreshToken
+from .user_cache import user_cache
 
 User = get_user_model()
 
@@ -80,3 +94,281 @@ class UserLoginTestCase(TestCase):
         }
         response = self.client.post(self.login_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatelessAuthenticationTestCase(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='test@example.com',
+            email='test@example.com',
+            password='testpass123',
+            first_name='Awa',
+        )
+        DashboardCounters.load()
+        token = ClaimsRefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_claims_user_needs_no_query(self):
+        self.client.get('/api/hotels/dashboard/stats/')
+        # Seulement la ligne des compteurs, pas de SELECT de l'utilisateur
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/hotels/dashboard/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_other_fields_are_loaded_once(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.data['first_name'], 'Awa')
+        # Servi ensuite par le cache local des utilisateurs
+        with self.assertNumQueries(0):
+            self.client.get('/api/auth/profile/')
+
+    def test_cache_is_invalidated_on_save(self):
+        self.client.get('/api/auth/profile/')
+        self.user.first_name = 'Fatou'
+        self.user.save()
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.data['first_name'], 'Fatou')
+
+        self.user.is_active = False
+        self.user.save()
+        self.client.get('/api/auth/profile/')
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claims_user_can_be_used_as_foreign_key(self):
+        response = self.client.post('/api/messages/', {'recipient_id': self.user.id, 'content': 'Note'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['sender']['email'], 'test@example.com')
+
+    def test_token_without_claims(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        response = self.client.get('/api/auth/profile/')
+        self.assertEqual(response.data['email'], 'test@example.com')
+
+
+class LoginHashingTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        LoginIPThrottle().get_bucket('127.0.0.1').reset()
+        LoginEmailThrottle().get_bucket('test@example.com').reset()
+        self.user = User.objects.create_user(username='test@example.com', email='test@example.com', password='testpass123')
+
+    def login(self, password='testpass123'):
+        return self.client.post('/api/auth/login/', {'email': 'test@example.com', 'password': password}, format='json')
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha256')
+        self.user.save()
+        self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('scrypt$'))
+
+    def test_cost_change_triggers_rehash(self):
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password.split('$')[1], str(2 ** 10))
+
+    @override_settings(LOGIN_RATE_EMAIL='2/min')
+    def test_attempts_are_throttled_before_hashing(self):
+        self.assertEqual(self.login('mauvais').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.login('mauvais').status_code, status.HTTP_400_BAD_REQUEST)
+        with mock.patch('django.contrib.auth.authenticate') as authenticate:
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+
+    @override_settings(LOGIN_RATE_IP='2/min', LOGIN_RATE_EMAIL='100/min')
+    def test_spoofed_forwarded_for_does_not_reset_ip_bucket(self):
+        for attempt, forwarded in enumerate(('1.1.1.1', '2.2.2.2', '3.3.3.3')):
+            response = self.client.post(
+                '/api/auth/login/', {'email': f'inconnu{attempt}@example.com', 'password': 'x'},
+                format='json', HTTP_X_FORWARDED_FOR=forwarded,
+            )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @override_settings(LOGIN_RATE_IP='2/min', LOGIN_RATE_EMAIL='100/min')
+    def test_ip_bucket_keyed_on_trusted_proxy_entry(self):
+        LoginIPThrottle().get_bucket('10.0.0.1').reset()
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}):
+            for attempt in range(3):
+                # Le client écrit la première entrée, le proxy ajoute la dernière
+                response = self.client.post(
+                    '/api/auth/login/', {'email': f'inconnu{attempt}@example.com', 'password': 'x'},
+                    format='json', HTTP_X_FORWARDED_FOR=f'9.9.9.{attempt}, 10.0.0.1',
+                )
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_token_bucket_refills(self):
+        bucket = TokenBucket('throttle:test:refill', capacity=2, period=60)
+        bucket.reset()
+        self.assertTrue(bucket.consume(now=1000)[0])
+        self.assertTrue(bucket.consume(now=1000)[0])
+        allowed, wait = bucket.consume(now=1000)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 30)
+        self.assertTrue(bucket.consume(now=1030)[0])
+
+
+class TokenRevocationTestCase(TestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='test@example.com', email='test@example.com', password='testpass123')
+        self.refresh = ClaimsRefreshToken.for_user(self.user)
+
+    def rotate(self, refresh):
+        return self.client.post('/api/auth/refresh/', {'refresh': str(refresh)}, format='json')
+
+    def tearDown(self):
+        flush_revoked()
+
+    def test_refresh_rotates_token(self):
+        # Vérification et révocation dans le cache partagé : aucune requête
+        with self.assertNumQueries(0):
+            response = self.rotate(self.refresh)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.data['refresh'], str(self.refresh))
+        with self.assertNumQueries(0):
+            self.assertEqual(self.rotate(response.data['refresh']).status_code, status.HTTP_200_OK)
+
+        # Trace durable écrite par lots, hors du rafraîchissement
+        self.assertFalse(RevokedToken.objects.filter(jti=self.refresh['jti']).exists())
+        with self.assertNumQueries(1):
+            self.assertEqual(flush_revoked(), 2)
+        self.assertTrue(RevokedToken.objects.filter(jti=self.refresh['jti']).exists())
+
+    @override_settings(REVOKED_TOKEN_FLUSH_SIZE=1)
+    def test_revoked_tokens_flushed_after_request(self):
+        self.rotate(self.refresh)
+        self.assertTrue(RevokedToken.objects.filter(jti=self.refresh['jti']).exists())
+
+    def test_reused_refresh_revokes_all_tokens(self):
+        rotated = self.rotate(self.refresh).data
+        # Hors délai de grâce
+        with self.settings(REFRESH_REUSE_GRACE_SECONDS=-1):
+            self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+        # Les jetons issus de la rotation sont révoqués eux aussi
+        self.assertEqual(self.rotate(rotated['refresh']).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {rotated['access']}")
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout(self):
+        response = self.client.post('/api/auth/logout/', {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_logout_all(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.refresh.access_token}')
+        self.assertEqual(self.client.post('/api/auth/logout-all/').status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Les jetons émis ensuite restent valides
+        self.user.refresh_from_db()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {ClaimsRefreshToken.for_user(self.user).access_token}')
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, status.HTTP_200_OK)
+
+    def test_deactivation_revokes_tokens(self):
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_claim_change_revokes_tokens(self):
+        self.user.is_admin = self.user.is_staff = True
+        self.user.save()
+        self.user.refresh_from_db()
+        admin_refresh = ClaimsRefreshToken.for_user(self.user)
+        rotated = self.rotate(admin_refresh).data
+        self.assertTrue(ClaimsRefreshToken(rotated['refresh'])['is_staff'])
+
+        # Rétrogradé : les jetons qui portent encore is_staff sont refusés
+        user = User.objects.get(pk=self.user.pk)
+        user.is_admin = user.is_staff = False
+        user.save()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {rotated['access']}")
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.rotate(rotated['refresh']).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        # Un champ absent des jetons ne révoque rien
+        user.refresh_from_db()
+        fresh = ClaimsRefreshToken.for_user(user)
+        user.first_name = 'Awa'
+        user.save()
+        self.client.credentials()
+        self.assertEqual(self.rotate(fresh).status_code, status.HTTP_200_OK)
+
+    def test_concurrent_refresh_within_grace(self):
+        # Deux onglets échangent le même jeton : même successeur, pas de révocation
+        first = self.rotate(self.refresh)
+        second = self.rotate(self.refresh)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        successors = {ClaimsRefreshToken(response.data['refresh'])['jti'] for response in (first, second)}
+        self.assertEqual(len(successors), 1)
+        self.assertEqual(self.rotate(second.data['refresh']).status_code, status.HTTP_200_OK)
+        # Le successeur a été échangé à son tour : l'ancien jeton n'est plus le prédécesseur immédiat
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_tokens_checked_in_database_after_cache_loss(self):
+        self.client.post('/api/auth/logout/', {'refresh': str(self.refresh)}, format='json')
+        # Éviction du JTI par le cache (FileBasedCache, MAX_ENTRIES) : le filtre renvoie à la table
+        shared_cache().delete(revoked_key(self.refresh['jti']))
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_filter_rebuilt_after_cache_loss(self):
+        self.client.post('/api/auth/logout/', {'refresh': str(self.refresh)}, format='json')
+        flush_revoked()
+        shared_cache().delete_many([revoked_key(self.refresh['jti']), filter_key(self.user.pk)])
+        self.assertEqual(self.rotate(self.refresh).status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class PasswordResetTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        LoginIPThrottle().get_bucket('127.0.0.1').reset()
+        PasswordResetEmailThrottle().get_bucket('test@example.com').reset()
+        self.user = User.objects.create_user(username='test@example.com', email='test@example.com', password='testpass123')
+
+    def reset(self, **data):
+        payload = {
+            'uid': urlsafe_base64_encode(force_bytes(self.user.pk)),
+            'token': default_token_generator.make_token(self.user),
+            'password': 'nouveau123',
+            'password2': 'nouveau123',
+            **data,
+        }
+        return self.client.post('/api/auth/reset-password/', payload, format='json')
+
+    @override_settings(PASSWORD_RESET_RATE_EMAIL='2/hour')
+    def test_forgot_password_is_throttled_per_address(self):
+        for _ in range(2):
+            response = self.client.post('/api/auth/forgot-password/', {'email': 'test@example.com'}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post('/api/auth/forgot-password/', {'email': 'Test@Example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_reset_link_sets_password_once(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        payload = {
+            'uid': urlsafe_base64_encode(force_bytes(self.user.pk)),
+            'token': default_token_generator.make_token(self.user),
+        }
+        self.assertEqual(self.reset(**payload).status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('nouveau123'))
+        # Sessions existantes révoquées, lien inutilisable une seconde fois
+        response = self.client.post('/api/auth/refresh/', {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.reset(**payload).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_link_is_rejected(self):
+        self.assertEqual(self.reset(token='invalide').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.reset(uid='xx').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.reset(password2='autre123').status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('testpass123'))
@@ -0,0 +1,106 @@
+"""
+Limitation des tentatives de connexion (seau à jetons)
+
+Les seaux sont stockés dans le cache partagé (L2) pour être communs à tous
+les workers. Les throttles DRF s'exécutent avant la vue : une tentative
+refusée ne coûte aucun hachage de mot de passe.
+"""
+import hashlib
+import math
+import time
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+from config.cache import namespaced_key, shared_cache
+
+PERIODS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+
+
+def parse_rate(rate):
+    """'5/min' -> (capacité, période en secondes)"""
+    count, period = rate.split('/')
+    return int(count), PERIODS[period]
+
+
+class TokenBucket:
+    """
+    Seau de `capacity` jetons, rechargé en continu sur `period` secondes
+    Lecture / écriture non atomiques : sous forte concurrence quelques
+    tentatives de plus peuvent passer, ce qui reste acceptable ici.
+    """
+
+    def __init__(self, key, capacity, period):
+        self.key = key
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+        self.period = period
+
+    def consume(self, now=None):
+        """Retourne (autorisé, secondes d'attente avant le prochain jeton)"""
+        cache = shared_cache()
+        now = time.time() if now is None else now
+        tokens, updated_at = cache.get(self.key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - updated_at) * self.refill_rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        cache.set(self.key, (tokens, now), math.ceil(self.period))
+        wait = 0 if allowed else (1 - tokens) / self.refill_rate
+        return allowed, wait
+
+    def reset(self):
+        shared_cache().delete(self.key)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle DRF à seau à jetons ; rate_setting désigne un setting 'N/période'"""
+    scope = None
+    rate_setting = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def get_bucket(self, ident):
+        capacity, period = parse_rate(getattr(settings, self.rate_setting))
+        digest = hashlib.sha256(ident.encode()).hexdigest()[:32]
+        return TokenBucket(namespaced_key('throttle', self.scope, digest), capacity, period)
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        ident = self.get_ident_key(request)
+        if not ident:
+            return True
+        allowed, self.wait_seconds = self.get_bucket(ident).consume()
+        return allowed
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """
+    Tentatives par adresse IP (connexion et inscription)
+    get_ident : REMOTE_ADDR, ou l'entrée de X-Forwarded-For ajoutée par le
+    proxy de confiance (REST_FRAMEWORK['NUM_PROXIES']) ; les entrées écrites
+    par le client sont ignorées, changer d'en-tête ne donne pas un seau neuf.
+    """
+    scope = 'login-ip'
+    rate_setting = 'LOGIN_RATE_IP'
+
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class LoginEmailThrottle(TokenBucketThrottle):
+    """Tentatives par compte, quelle que soit l'adresse IP"""
+    scope = 'login-email'
+    rate_setting = 'LOGIN_RATE_EMAIL'
+
+    def get_ident_key(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        return email.strip().lower() if isinstance(email, str) else None
+
+
+class PasswordResetEmailThrottle(LoginEmailThrottle):
+    """Emails de réinitialisation par adresse : empêche d'inonder une boîte"""
+    scope = 'password-reset-email'
+    rate_setting = 'PASSWORD_RESET_RATE_EMAIL'
@@ -0,0 +1,25 @@
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import revocation
+
+# Champs de l'utilisateur embarqués dans les jetons (voir users.authentication)
+USER_CLAIMS = ('email', 'is_admin', 'is_staff')
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Jeton de rafraîchissement portant les claims de l'utilisateur
+    Les claims sont recopiés dans chaque jeton d'accès qui en dérive, et
+    dans chaque jeton issu d'une rotation : toute modification de ces champs
+    incrémente la génération des jetons (users.signals).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        # Génération des jetons : révocation de tous les jetons de l'utilisateur
+        token['gen'] = user.token_generation
+        # Filtre des JTI révoqués en cache avant le premier rafraîchissement
+        revocation.load_filter(user.pk)
+        return token
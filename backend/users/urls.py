@@ -9,7 +9,10 @@ urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login, name='login'),
     path('refresh/', views.refresh_token, name='refresh'),
+    path('logout/', views.logout, name='logout'),
+    path('logout-all/', views.logout_all, name='logout_all'),
     path('forgot-password/', views.forgot_password, name='forgot_password'),
+    path('reset-password/', views.reset_password, name='reset_password'),
     path('profile/', views.profile, name='profile'),
     path('', include(router.urls)),
 ]
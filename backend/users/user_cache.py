@@ -0,0 +1,37 @@
+"""
+Cache local (par processus) des lignes CustomUser
+
+Évite de relire l'utilisateur à chaque requête authentifiée :
+- entrées de courte durée (USER_CACHE_TIMEOUT secondes), car l'invalidation
+  sur enregistrement (users.signals) ne concerne que le processus courant
+- valeurs brutes des champs (attname -> valeur), jamais d'instance partagée
+"""
+from django.conf import settings
+from config.cache import MISSING, LRUCache
+
+
+class UserCache:
+
+    def __init__(self, max_entries, timeout):
+        self.timeout = timeout
+        self._entries = LRUCache(max_entries)
+
+    def get(self, user_id):
+        values = self._entries.get(user_id)
+        return None if values is MISSING else values
+
+    def remember(self, user):
+        """Mémoriser un utilisateur complètement chargé"""
+        if user.get_deferred_fields():
+            return
+        values = {field.attname: getattr(user, field.attname) for field in user._meta.concrete_fields}
+        self._entries.set(user.pk, values, self.timeout)
+
+    def invalidate(self, user_id):
+        self._entries.delete(user_id)
+
+    def clear(self):
+        self._entries.clear()
+
+
+user_cache = UserCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TIMEOUT)
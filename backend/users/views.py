@@ -1,21 +1,33 @@
 from rest_framework import status, viewsets
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
+from .throttling import LoginEmailThrottle, LoginIPThrottle, PasswordResetEmailThrottle
+from .tokens import ClaimsRefreshToken
+from django.conf import settings
 from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from emails.queue import enqueue_template
 
-from .serializers import RegisterSerializer, LoginSerializer, UserSerializer, TokenSerializer
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from . import revocation
+from .serializers import (
+    RegisterSerializer, LoginSerializer, UserSerializer, TokenSerializer,
+    RotatingTokenRefreshSerializer, LogoutSerializer, PasswordResetConfirmSerializer,
+)
 
 User = get_user_model()
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle])
 def register(request):
     serializer = RegisterSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.save()
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'access': str(refresh.access_token),
             'refresh': str(refresh),
@@ -25,11 +37,12 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login(request):
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
         user = serializer.validated_data['user']
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'access': str(refresh.access_token),
             'refresh': str(refresh),
@@ -40,17 +53,44 @@ def login(request):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def refresh_token(request):
-    from rest_framework_simplejwt.views import TokenRefreshView
-    view = TokenRefreshView.as_view()
-    return view(request)
+    """Échanger un refresh token contre un access token et un nouveau refresh token"""
+    serializer = RotatingTokenRefreshSerializer(data=request.data)
+    try:
+        serializer.is_valid(raise_exception=True)
+    except TokenError as exc:
+        raise InvalidToken(exc.args[0])
+    return Response(serializer.validated_data, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def logout(request):
+    """Révoquer le refresh token de la session courante"""
+    serializer = LogoutSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    revocation.revoke_token(serializer.validated_data['refresh'])
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_all(request):
+    """Révoquer tous les jetons de l'utilisateur (tous les appareils)"""
+    revocation.revoke_all(request.user.pk)
+    return Response(status=status.HTTP_204_NO_CONTENT)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, PasswordResetEmailThrottle])
 def forgot_password(request):
     email = request.data.get('email')
     try:
         user = User.objects.get(email=email)
-        # TODO: Implement email sending logic
+        # Mise en file seulement : l'envoi SMTP est fait par send_queued_emails
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        token = default_token_generator.make_token(user)
+        enqueue_template('password-reset', user.email, {
+            'first_name': user.first_name,
+            'reset_url': f"{settings.FRONTEND_URL}/reset-password/{uid}/{token}",
+        })
         return Response({
             'message': 'Un email de réinitialisation a été envoyé'
         }, status=status.HTTP_200_OK)
@@ -59,6 +99,20 @@ def forgot_password(request):
             'error': 'Utilisateur non trouvé'
         }, status=status.HTTP_404_NOT_FOUND)
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle])
+def reset_password(request):
+    """Définir un nouveau mot de passe depuis le lien reçu par email (forgot_password)"""
+    serializer = PasswordResetConfirmSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    user = serializer.validated_data['user']
+    user.set_password(serializer.validated_data['password'])
+    user.save(update_fields=['password'])
+    # Déconnecter les sessions ouvertes avec l'ancien mot de passe
+    revocation.revoke_all(user.pk)
+    return Response({'message': 'Mot de passe réinitialisé'}, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def profile(request):
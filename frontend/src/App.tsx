@@ -1,5 +1,5 @@
 import { BrowserRouter, Routes, Route, Navigate } from 'react-router-dom';
-import { Login, Signup, ForgotPassword, Dashboard, Hotels, Tickets, Messages, Emails } from './pages';
+import { Login, Signup, ForgotPassword, ResetPassword, Dashboard, Hotels, Tickets, Messages, Emails } from './pages';
 import { ProtectedRoute } from './routes/ProtectedRoute';
 
 function App() {
@@ -9,6 +9,7 @@ function App() {
         <Route path="/login" element={<Login />} />
         <Route path="/signup" element={<Signup />} />
         <Route path="/forgot-password" element={<ForgotPassword />} />
+        <Route path="/reset-password/:uid/:token" element={<ResetPassword />} />
         <Route
           path="/dashboard"
           element={
@@ -44,7 +45,7 @@ function App() {
         <Route
           path="/emails"
           element={
-            <ProtectedRoute>
+            <ProtectedRoute adminOnly>
               <Emails />
             </ProtectedRoute>
           }
@@ -69,9 +69,9 @@ export const HotelModal: React.FC<HotelModalProps> = ({
       setValue('is_active', initialData.is_active);
       
       // Afficher l'image existante
-      if ((initialData as any).image_base64) {
-        // L'image est déjà en base64
-        setImagePreview((initialData as any).image_base64);
+      if (initialData.image_url || initialData.thumbnail_url) {
+        // L'image est servie par le stockage de blobs (miniature depuis la liste)
+        setImagePreview(initialData.image_url || initialData.thumbnail_url || null);
       } else if (initialData.image && typeof initialData.image === 'string') {
         // Fallback pour les anciennes images (chemin fichier)
         let imageUrl = initialData.image;
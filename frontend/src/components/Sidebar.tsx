@@ -1,5 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { Link, useLocation, useNavigate } from 'react-router-dom';
+import { authService } from '../lib/auth';
 import { LayoutDashboard, Hotel, Ticket, MessageSquare, Mail, LogOut, Menu, X } from 'lucide-react';
 
 interface User {
@@ -20,8 +21,8 @@ export const Sidebar: React.FC = () => {
     { path: '/hotels', label: 'Hôtels', icon: Hotel },
     { path: '/tickets', label: 'Tickets', icon: Ticket },
     { path: '/messages', label: 'Messages', icon: MessageSquare },
-    { path: '/emails', label: 'Emails', icon: Mail },
-  ];
+    { path: '/emails', label: 'Emails', icon: Mail, adminOnly: true },
+  ].filter((item) => !item.adminOnly || authService.isAdmin());
 
   useEffect(() => {
     // Récupérer les données utilisateur depuis le localStorage
@@ -2,7 +2,7 @@ import { useState, useCallback } from 'react';
 import { useNavigate } from 'react-router-dom';
 import Swal from 'sweetalert2';
 import { authService } from '../lib/auth';
-import { LoginInput, SignupInput, ResetPasswordInput } from '../schemas/auth';
+import { LoginInput, SignupInput, ResetPasswordInput, NewPasswordInput } from '../schemas/auth';
 
 export const useAuth = () => {
   const [isLoading, setIsLoading] = useState(false);
@@ -103,6 +103,27 @@ export const useAuth = () => {
     }
   }, [navigate]);
 
+  const confirmResetPassword = useCallback(async (uid: string, token: string, data: NewPasswordInput) => {
+    setIsLoading(true);
+    try {
+      await authService.confirmResetPassword(uid, token, data);
+      Swal.fire({
+        icon: 'success',
+        title: 'Mot de passe modifié',
+        text: 'Vous pouvez vous connecter avec votre nouveau mot de passe',
+      });
+      navigate('/login');
+    } catch (error: any) {
+      Swal.fire({
+        icon: 'error',
+        title: 'Erreur',
+        text: error.response?.data?.token?.[0] || error.response?.data?.detail || 'Une erreur est survenue',
+      });
+    } finally {
+      setIsLoading(false);
+    }
+  }, [navigate]);
+
   const logout = useCallback(() => {
     // Nettoyer le cache à la déconnexion
     localStorage.removeItem('hotels_cache');
@@ -126,6 +147,7 @@ export const useAuth = () => {
     login,
     signup,
     resetPassword,
+    confirmResetPassword,
     logout,
     isLoading,
     isAuthenticated: authService.isAuthenticated(),
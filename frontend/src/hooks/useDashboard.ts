@@ -1,5 +1,6 @@
 import { useState, useEffect, useCallback } from 'react';
 import api from '../lib/api';
+import { refreshOnEvent } from '../lib/events';
 
 export interface DashboardStats {
   totalHotels: number;
@@ -45,14 +46,14 @@ export const useDashboard = () => {
   const [isLoading, setIsLoading] = useState(!cachedStats);
   const [error, setError] = useState<string | null>(null);
 
-  const fetchStats = useCallback(async () => {
+  const fetchStats = useCallback(async (skipCache = false) => {
     try {
       const cacheKey = 'dashboard_cache';
       const cacheTime = localStorage.getItem(cacheKey + '_time');
       const now = Date.now();
       
       // Utiliser le cache si disponible et moins de 5 minutes
-      if (cacheTime && (now - parseInt(cacheTime)) < 5 * 60 * 1000) {
+      if (!skipCache && cacheTime && (now - parseInt(cacheTime)) < 5 * 60 * 1000) {
         setIsLoading(false);
         return;
       }
@@ -76,9 +77,9 @@ export const useDashboard = () => {
 
   useEffect(() => {
     fetchStats();
-    // Rafraîchir les stats toutes les 30 secondes
-    const interval = setInterval(fetchStats, 30000);
-    return () => clearInterval(interval);
+
+    // Recharger quand le serveur signale un changement, sinon toutes les 30 secondes
+    return refreshOnEvent('dashboard.changed', () => fetchStats(true), 30000);
   }, []);
 
   return { stats, isLoading, error, refetch: fetchStats };
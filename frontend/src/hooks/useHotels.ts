@@ -13,6 +13,9 @@ export interface Hotel {
   price_per_night: number;
   rating: number;
   image?: string | File;
+  image_url?: string | null;
+  thumbnail_url?: string | null;
+  has_image?: boolean;
   rooms_count: number;
   available_rooms: number;
   is_active: boolean;
@@ -28,6 +31,13 @@ export interface HotelFilters {
   minRating?: number;
 }
 
+// Champs demandés pour la liste (la description n'est pas incluse par défaut)
+const LIST_FIELDS = [
+  'id', 'name', 'description', 'city', 'address', 'phone', 'email',
+  'price_per_night', 'rating', 'has_image', 'thumbnail_url',
+  'rooms_count', 'available_rooms', 'is_active', 'created_at', 'updated_at',
+].join(',');
+
 const CACHE_KEY = 'hotels_cache';
 const CACHE_TIME_KEY = 'hotels_cache_time';
 const CACHE_DURATION = 2 * 60 * 1000; // 2 minutes
@@ -74,6 +84,7 @@ export const useHotels = () => {
 
       // Construire les paramètres de la requête
       const params = new URLSearchParams();
+      params.append('fields', LIST_FIELDS);
       if (filters.search) params.append('search', filters.search);
       if (filters.city) params.append('city', filters.city);
       if (filters.minPrice) params.append('price_per_night__gte', filters.minPrice.toString());
@@ -88,7 +99,7 @@ export const useHotels = () => {
       setHotels(hotelsData);
       setError(null);
       
-      // Mettre en cache les données (avec les images pour une meilleure UX)
+      // Mettre en cache les données (les images ne sont que des URL, mises en cache par le navigateur)
       try {
         localStorage.setItem(CACHE_KEY, JSON.stringify(hotelsData));
         localStorage.setItem(CACHE_TIME_KEY, Date.now().toString());
@@ -72,12 +72,16 @@ api.interceptors.response.use(
         }
 
         const response = await axios.post(
-          `${API_URL}/auth/token/refresh/`,
+          `${API_URL}/auth/refresh/`,
           { refresh: refreshToken }
         );
 
-        const { access } = response.data;
+        // Rotation : chaque rafraîchissement renvoie aussi un nouveau refresh token
+        const { access, refresh } = response.data;
         localStorage.setItem('access_token', access);
+        if (refresh) {
+          localStorage.setItem('refresh_token', refresh);
+        }
         api.defaults.headers.common.Authorization = `Bearer ${access}`;
         originalRequest.headers.Authorization = `Bearer ${access}`;
 
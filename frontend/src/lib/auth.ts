@@ -1,5 +1,5 @@
 import api from './api';
-import { LoginInput, SignupInput, ResetPasswordInput } from '../schemas/auth';
+import { LoginInput, SignupInput, ResetPasswordInput, NewPasswordInput } from '../schemas/auth';
 
 export interface AuthResponse {
   access: string;
@@ -9,6 +9,7 @@ export interface AuthResponse {
     email: string;
     first_name: string;
     last_name: string;
+    is_admin: boolean;
   };
 }
 
@@ -41,16 +42,35 @@ export const authService = {
     await api.post('/auth/forgot-password/', data);
   },
 
+  // Lien reçu par email : /reset-password/:uid/:token
+  async confirmResetPassword(uid: string, token: string, data: NewPasswordInput): Promise<void> {
+    await api.post('/auth/reset-password/', {
+      uid,
+      token,
+      password: data.password,
+      password2: data.confirmPassword,
+    });
+  },
+
   async refreshToken(): Promise<string> {
     const refresh = localStorage.getItem('refresh_token');
     if (!refresh) throw new Error('No refresh token');
     const response = await api.post('/auth/refresh/', { refresh });
-    const access = response.data.access;
+    const { access, refresh: rotated } = response.data;
     localStorage.setItem('access_token', access);
+    // Rotation : l'ancien refresh token est révoqué côté serveur
+    if (rotated) {
+      localStorage.setItem('refresh_token', rotated);
+    }
     return access;
   },
 
   logout(): void {
+    // Révoquer le refresh token côté serveur (sans attendre la réponse)
+    const refresh = localStorage.getItem('refresh_token');
+    if (refresh) {
+      api.post('/auth/logout/', { refresh }).catch(() => undefined);
+    }
     localStorage.removeItem('access_token');
     localStorage.removeItem('refresh_token');
   },
@@ -62,4 +82,13 @@ export const authService = {
   isAuthenticated(): boolean {
     return !!localStorage.getItem('access_token');
   },
+
+  // Pages réservées aux administrateurs (l'API vérifie is_admin / is_staff)
+  isAdmin(): boolean {
+    try {
+      return !!JSON.parse(localStorage.getItem('user') || 'null')?.is_admin;
+    } catch {
+      return false;
+    }
+  },
 };
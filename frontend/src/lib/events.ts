@@ -0,0 +1,109 @@
+// Flux Server-Sent Events (/api/events/) partagé par tous les composants de l'onglet
+// Remplace le polling quand le serveur l'annonce (/api/events/config/, REALTIME_ENABLED + ASGI) :
+// le serveur pousse message.created, hotel.changed, dashboard.changed
+const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
+const RECONNECT_DELAY = 5000;
+
+type Handler = (data: any) => void;
+
+const handlers = new Map<string, Set<Handler>>();
+const listeners = new Map<string, (event: MessageEvent) => void>();
+let source: EventSource | null = null;
+let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
+
+export const realtimeSupported = typeof EventSource !== 'undefined';
+
+let enabledPromise: Promise<boolean> | null = null;
+
+// Le serveur sert-il le flux ? (sous WSGI ou désactivé : non, rester en polling)
+export const realtimeEnabled = (): Promise<boolean> => {
+  if (!realtimeSupported) return Promise.resolve(false);
+  if (!enabledPromise) {
+    enabledPromise = fetch(`${API_URL}/events/config/`)
+      .then(response => (response.ok ? response.json() : { enabled: false }))
+      .then(config => config.enabled === true)
+      .catch(() => false);
+  }
+  return enabledPromise;
+};
+
+const listen = (type: string) => {
+  if (!source || listeners.has(type)) return;
+  const listener = (event: MessageEvent) => {
+    const data = JSON.parse(event.data);
+    handlers.get(type)?.forEach(handler => handler(data));
+  };
+  listeners.set(type, listener);
+  source.addEventListener(type, listener as EventListener);
+};
+
+const connect = () => {
+  const token = localStorage.getItem('access_token');
+  if (!realtimeSupported || !token || source) return;
+
+  source = new EventSource(`${API_URL}/events/?token=${encodeURIComponent(token)}`);
+  listeners.clear();
+  handlers.forEach((_, type) => listen(type));
+
+  source.onerror = () => {
+    // Fermé par le serveur (jeton expiré, client trop lent) : reconnecter avec le jeton courant
+    if (source?.readyState === EventSource.CLOSED) {
+      source = null;
+      if (!reconnectTimer) {
+        reconnectTimer = setTimeout(() => {
+          reconnectTimer = null;
+          if (handlers.size) connect();
+        }, RECONNECT_DELAY);
+      }
+    }
+  };
+};
+
+const disconnect = () => {
+  source?.close();
+  source = null;
+  listeners.clear();
+};
+
+export const subscribeEvents = (type: string, handler: Handler) => {
+  if (!handlers.has(type)) handlers.set(type, new Set());
+  handlers.get(type)!.add(handler);
+  connect();
+  listen(type);
+
+  return () => {
+    const set = handlers.get(type);
+    set?.delete(handler);
+    if (set && !set.size) handlers.delete(type);
+    if (!handlers.size) disconnect();
+  };
+};
+
+// Recharger sur événement (regroupé sur 1 seconde) si le flux est disponible,
+// sinon toutes les pollInterval millisecondes
+export const refreshOnEvent = (type: string, refresh: () => void, pollInterval: number) => {
+  let cancelled = false;
+  let unsubscribe: (() => void) | null = null;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let interval: ReturnType<typeof setInterval> | null = setInterval(refresh, pollInterval);
+
+  realtimeEnabled().then(enabled => {
+    if (!enabled || cancelled) return;
+    if (interval) clearInterval(interval);
+    interval = null;
+    unsubscribe = subscribeEvents(type, () => {
+      if (timer) return;
+      timer = setTimeout(() => {
+        timer = null;
+        refresh();
+      }, 1000);
+    });
+  });
+
+  return () => {
+    cancelled = true;
+    unsubscribe?.();
+    if (timer) clearTimeout(timer);
+    if (interval) clearInterval(interval);
+  };
+};
@@ -3,6 +3,7 @@ import Swal from 'sweetalert2';
 import { Navbar, Sidebar, Card, Button, HotelModal } from '../components';
 import { Search, Plus, MapPin, DollarSign, Star, Edit, Trash2, RefreshCw } from 'lucide-react';
 import { useHotels } from '../hooks/useHotels';
+import { refreshOnEvent } from '../lib/events';
 
 export const Hotels: React.FC = () => {
   const { hotels, isLoading, createHotel, updateHotel, deleteHotel, syncingHotelIds, fetchHotels } = useHotels();
@@ -16,15 +17,8 @@ export const Hotels: React.FC = () => {
     // Charger les données immédiatement
     fetchHotels(true);
 
-    // Configurer l'auto-refresh toutes les 30 secondes
-    const interval = setInterval(() => {
-      fetchHotels(true);
-    }, 30 * 1000); // 30 secondes
-
-    // Cleanup
-    return () => {
-      if (interval) clearInterval(interval);
-    };
+    // Recharger quand un hôtel est créé, modifié ou supprimé, sinon toutes les 30 secondes
+    return refreshOnEvent('hotel.changed', () => fetchHotels(true), 30 * 1000);
   }, [fetchHotels]);
 
   // Afficher/masquer l'alerte de chargement
@@ -160,10 +154,10 @@ export const Hotels: React.FC = () => {
                     </div>
                   )}
                   <div className="w-full h-40 bg-gradient-to-br from-primary to-secondary flex items-center justify-center overflow-hidden relative">
-                    {(hotel as any).image_base64 ? (
+                    {hotel.thumbnail_url ? (
                       <>
                         <img 
-                          src={(hotel as any).image_base64}
+                          src={hotel.thumbnail_url}
                           alt={hotel.name}
                           className="w-full h-full object-cover"
                           loading="lazy"
@@ -0,0 +1,74 @@
+import React from 'react';
+import { useForm } from 'react-hook-form';
+import { zodResolver } from '@hookform/resolvers/zod';
+import { Link, useParams } from 'react-router-dom';
+import { Lock, ArrowLeft } from 'lucide-react';
+import { Input, Button, Card } from '../components';
+import { useAuth } from '../hooks/useAuth';
+import { newPasswordSchema, NewPasswordInput } from '../schemas/auth';
+
+export const ResetPassword: React.FC = () => {
+  const { uid = '', token = '' } = useParams();
+  const { confirmResetPassword, isLoading } = useAuth();
+  const { register, handleSubmit, formState: { errors } } = useForm<NewPasswordInput>({
+    resolver: zodResolver(newPasswordSchema),
+  });
+
+  const onSubmit = async (data: NewPasswordInput) => {
+    await confirmResetPassword(uid, token, data);
+  };
+
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-secondary to-secondary/80 flex items-center justify-center px-4">
+      <Card className="w-full max-w-md">
+        <div className="text-center mb-8">
+          <div className="w-16 h-16 bg-primary rounded-lg flex items-center justify-center mx-auto mb-4">
+            <Lock className="text-white" size={32} />
+          </div>
+          <h1 className="text-3xl font-bold text-gray-900">Nouveau mot de passe</h1>
+          <p className="text-gray-600 mt-2">Choisissez votre nouveau mot de passe</p>
+        </div>
+
+        <form onSubmit={handleSubmit(onSubmit)} className="space-y-4">
+          <Input
+            label="Mot de passe"
+            type="password"
+            placeholder="••••••••"
+            icon={<Lock size={18} />}
+            {...register('password')}
+            error={errors.password}
+          />
+
+          <Input
+            label="Confirmer le mot de passe"
+            type="password"
+            placeholder="••••••••"
+            icon={<Lock size={18} />}
+            {...register('confirmPassword')}
+            error={errors.confirmPassword}
+          />
+
+          <Button
+            type="submit"
+            variant="primary"
+            size="lg"
+            isLoading={isLoading}
+            className="w-full"
+          >
+            Réinitialiser
+          </Button>
+        </form>
+
+        <div className="mt-6 text-center">
+          <Link
+            to="/login"
+            className="inline-flex items-center space-x-2 text-primary hover:underline"
+          >
+            <ArrowLeft size={18} />
+            <span>Retour à la connexion</span>
+          </Link>
+        </div>
+      </Card>
+    </div>
+  );
+};
@@ -1,6 +1,7 @@
 export { Login } from './Login';
 export { Signup } from './Signup';
 export { ForgotPassword } from './ForgotPassword';
+export { ResetPassword } from './ResetPassword';
 export { Dashboard } from './Dashboard';
 export { Hotels } from './Hotels';
 export { Tickets } from './Tickets';
@@ -4,12 +4,17 @@ import { authService } from '../lib/auth';
 
 interface ProtectedRouteProps {
   children: React.ReactNode;
+  adminOnly?: boolean;
 }
 
-export const ProtectedRoute: React.FC<ProtectedRouteProps> = ({ children }) => {
+export const ProtectedRoute: React.FC<ProtectedRouteProps> = ({ children, adminOnly = false }) => {
   if (!authService.isAuthenticated()) {
     return <Navigate to="/login" replace />;
   }
 
+  if (adminOnly && !authService.isAdmin()) {
+    return <Navigate to="/dashboard" replace />;
+  }
+
   return <>{children}</>;
 };
@@ -20,6 +20,15 @@ export const resetPasswordSchema = z.object({
   email: z.string().email('Email invalide'),
 });
 
+export const newPasswordSchema = z.object({
+  password: z.string().min(6, 'Le mot de passe doit contenir au moins 6 caractères'),
+  confirmPassword: z.string(),
+}).refine((data) => data.password === data.confirmPassword, {
+  message: 'Les mots de passe ne correspondent pas',
+  path: ['confirmPassword'],
+});
+
 export type LoginInput = z.infer<typeof loginSchema>;
 export type SignupInput = z.infer<typeof signupSchema>;
 export type ResetPasswordInput = z.infer<typeof resetPasswordSchema>;
+export type NewPasswordInput = z.infer<typeof newPasswordSchema>;